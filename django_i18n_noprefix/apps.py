@@ -2,8 +2,13 @@
 Django app configuration for django-i18n-noprefix.
 """
 
+import functools
+import hashlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
 from django.apps import AppConfig
-from django.core.checks import Error, Warning, register
+from django.core.checks import CheckMessage, Error, Tags, Warning, register
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 
 
@@ -20,13 +25,118 @@ class I18nNoPrefixConfig(AppConfig):
 
         This method is called once Django has loaded all apps.
         We use it to register our system checks.
+
+        Besides "django_i18n_noprefix", checks carry Django's tags, so
+        commands that only request some tags (requires_system_checks) or
+        ``check --tag`` skip the URL checks, which load ROOT_URLCONF.
         """
         # Register system checks
         register(check_middleware_configuration, "django_i18n_noprefix")
-        register(check_language_configuration, "django_i18n_noprefix")
-        register(check_url_configuration, "django_i18n_noprefix")
+        register(check_language_configuration, "django_i18n_noprefix", Tags.translation)
+        register(check_i18n_patterns, "django_i18n_noprefix", Tags.urls)
+        register(check_url_configuration, "django_i18n_noprefix", Tags.urls)
+
+        # Opt-in performance advice: with "check --deploy", or on every
+        # check run with I18N_NOPREFIX_PERFORMANCE_CHECKS = True
+        from django.conf import settings
+
+        deploy = not getattr(settings, "I18N_NOPREFIX_PERFORMANCE_CHECKS", False)
+        for check in PERFORMANCE_CHECKS:
+            register(check, "django_i18n_noprefix", PERFORMANCE_TAG, deploy=deploy)
+
+
+class URLConfInfo(NamedTuple):
+    """What the URL checks need to know about ROOT_URLCONF."""
+
+    has_locale_prefix: bool  # i18n_patterns() used somewhere
+    has_switch_urls: bool  # django_i18n_noprefix.urls included
+
+
+# Settings the check results depend on
+FINGERPRINT_SETTINGS = (
+    "ROOT_URLCONF",
+    "INSTALLED_APPS",
+    "MIDDLEWARE",
+    "USE_I18N",
+    "LANGUAGES",
+    "LANGUAGE_CODE",
+    "SESSION_ENGINE",
+    "TEMPLATES",
+    "I18N_NOPREFIX_PREFERENCE_STORES",
+    "I18N_NOPREFIX_DEFER_COOKIE",
+)
+
+_urlconf_info: Dict[str, Optional[URLConfInfo]] = {}
+_check_results: Dict[Tuple[str, str], List[CheckMessage]] = {}
+
+
+def get_settings_fingerprint() -> str:
+    """Return a digest of the settings the checks depend on."""
+    from django.conf import settings
+
+    values = repr([getattr(settings, name, None) for name in FINGERPRINT_SETTINGS])
+    return hashlib.sha256(values.encode()).hexdigest()
+
 
+def memoize_check(check):
+    """
+    Reuse a check's messages while the settings fingerprint is unchanged,
+    e.g. when several commands run checks in one process.
+    """
+
+    @functools.wraps(check)
+    def wrapper(app_configs, **kwargs):
+        if app_configs is not None:
+            # Checks limited to some apps are not worth caching
+            return check(app_configs, **kwargs)
+        key = (check.__name__, get_settings_fingerprint())
+        if key not in _check_results:
+            _check_results[key] = check(app_configs, **kwargs)
+        return list(_check_results[key])
+
+    return wrapper
 
+
+def inspect_urlconf() -> Optional[URLConfInfo]:
+    """
+    Walk the URL resolver of ROOT_URLCONF once per settings fingerprint.
+
+    Only the already-imported pattern objects are inspected: no source
+    files are read and no reverse() lookups are made. Returns None if
+    ROOT_URLCONF cannot be loaded (Django's own URL checks report that).
+    """
+    fingerprint = get_settings_fingerprint()
+    if fingerprint not in _urlconf_info:
+        from django.urls import get_resolver
+
+        try:
+            info = URLConfInfo(*walk_patterns(get_resolver().url_patterns))
+        except (ImportError, ImproperlyConfigured):
+            info = None
+        _urlconf_info[fingerprint] = info
+    return _urlconf_info[fingerprint]
+
+
+def walk_patterns(patterns) -> Tuple[bool, bool]:
+    """Return (has_locale_prefix, has_switch_urls) for URL ``patterns``."""
+    from django.urls import URLResolver
+    from django.urls.resolvers import LocalePrefixPattern
+
+    has_locale_prefix = has_switch_urls = False
+    stack = list(patterns)
+    while stack and not (has_locale_prefix and has_switch_urls):
+        pattern = stack.pop()
+        if not isinstance(pattern, URLResolver):
+            continue
+        if isinstance(pattern.pattern, LocalePrefixPattern):
+            has_locale_prefix = True
+        if "django_i18n_noprefix" in (pattern.namespace, pattern.app_name):
+            has_switch_urls = True
+        stack.extend(pattern.url_patterns)
+    return has_locale_prefix, has_switch_urls
+
+
+@memoize_check
 def check_middleware_configuration(app_configs, **kwargs):
     """
     Check that the middleware is properly configured.
@@ -98,6 +208,7 @@ def check_middleware_configuration(app_configs, **kwargs):
     return errors
 
 
+@memoize_check
 def check_language_configuration(app_configs, **kwargs):
     """
     Check that language settings are properly configured.
@@ -144,42 +255,31 @@ def check_language_configuration(app_configs, **kwargs):
                 )
             )
 
-    # Check for i18n_patterns in ROOT_URLCONF (would add prefixes)
-    try:
-        # This is a simple check - just warn if i18n_patterns is imported
-        # A more thorough check would require parsing the URL configuration
-        import importlib
-
-        root_urlconf = getattr(settings, "ROOT_URLCONF", None)
-        if root_urlconf:
-            try:
-                url_module = importlib.import_module(root_urlconf)
-                module_source = str(url_module.__file__)
-                if module_source:
-                    import os
-
-                    if os.path.exists(module_source):
-                        with open(module_source) as f:
-                            content = f.read()
-                            if "i18n_patterns" in content:
-                                errors.append(
-                                    Warning(
-                                        "i18n_patterns detected in ROOT_URLCONF",
-                                        hint="Remove i18n_patterns from your URL configuration. "
-                                        "django-i18n-noprefix handles i18n without URL prefixes.",
-                                        id="django_i18n_noprefix.W005",
-                                    )
-                                )
-            except (OSError, ImportError, AttributeError):
-                # Ignore errors in checking - this is just a helpful warning
-                pass
-    except ImportError:
-        # Django URLs not available, skip this check
-        pass
+    return errors
+
+
+@memoize_check
+def check_i18n_patterns(app_configs, **kwargs):
+    """
+    Check that ROOT_URLCONF does not use i18n_patterns (which would add
+    language prefixes back to the URLs).
+    """
+    errors = []
+    result = inspect_urlconf()
+    if result is not None and result.has_locale_prefix:
+        errors.append(
+            Warning(
+                "i18n_patterns detected in ROOT_URLCONF",
+                hint="Remove i18n_patterns from your URL configuration. "
+                "django-i18n-noprefix handles i18n without URL prefixes.",
+                id="django_i18n_noprefix.W005",
+            )
+        )
 
     return errors
 
 
+@memoize_check
 def check_url_configuration(app_configs, **kwargs):
     """
     Check that URLs are properly configured for language switching.
@@ -188,14 +288,11 @@ def check_url_configuration(app_configs, **kwargs):
     but they're needed for the language switching views.
     """
     from django.conf import settings
-    from django.urls import NoReverseMatch, reverse
 
     errors = []
 
-    # Try to reverse our URLs to see if they're included
-    try:
-        reverse("django_i18n_noprefix:change_language", args=["en"])
-    except NoReverseMatch:
+    result = inspect_urlconf()
+    if result is not None and not result.has_switch_urls:
         # Only warn if our app is installed
         if "django_i18n_noprefix" in settings.INSTALLED_APPS:
             errors.append(
@@ -208,3 +305,208 @@ def check_url_configuration(app_configs, **kwargs):
             )
 
     return errors
+
+
+# Performance advisor checks (W101-W105); see I18nNoPrefixConfig.ready()
+PERFORMANCE_TAG = "django_i18n_noprefix_performance"
+
+# Above this many languages, full selectors weigh down every page
+LARGE_LANGUAGE_COUNT = 30
+
+DB_SESSION_ENGINES = ("django.contrib.sessions.backends.db",)
+
+CACHE_MIDDLEWARE = (
+    "django.middleware.cache.UpdateCacheMiddleware",
+    "django.middleware.cache.FetchFromCacheMiddleware",
+    "django.middleware.cache.CacheMiddleware",
+)
+
+CACHED_LOADERS = (
+    "django.template.loaders.cached.Loader",
+    "django_i18n_noprefix.loaders.Loader",
+)
+
+
+def get_store_classes():
+    """Return the configured preference store classes (skipping bad paths)."""
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    from .stores import DEFAULT_PREFERENCE_STORES
+
+    classes = []
+    for path in getattr(
+        settings, "I18N_NOPREFIX_PREFERENCE_STORES", DEFAULT_PREFERENCE_STORES
+    ):
+        try:
+            classes.append(import_string(path))
+        except ImportError:
+            pass
+    return classes
+
+
+@memoize_check
+def check_session_backend(app_configs, **kwargs):
+    """
+    Check that session-first resolution does not hit the database.
+
+    When the session store is read before the cookie store, every request
+    of a visitor with a session loads it; with the database backend that is
+    a query per request.
+    """
+    from django.conf import settings
+
+    from .stores import CookiePreferenceStore, SessionPreferenceStore
+
+    errors = []
+
+    stores = [
+        store
+        for store in get_store_classes()
+        if issubclass(store, (SessionPreferenceStore, CookiePreferenceStore))
+    ]
+    session_first = bool(stores) and issubclass(stores[0], SessionPreferenceStore)
+    if session_first and settings.SESSION_ENGINE in DB_SESSION_ENGINES:
+        errors.append(
+            Warning(
+                "Language preferences are read from database-backed sessions first",
+                hint='Use a cache-backed SESSION_ENGINE (e.g. "django.contrib.sessions.backends.cached_db"), '
+                "or put CookiePreferenceStore before SessionPreferenceStore in "
+                "I18N_NOPREFIX_PREFERENCE_STORES.",
+                id="django_i18n_noprefix.W101",
+            )
+        )
+
+    return errors
+
+
+@memoize_check
+def check_cache_middleware(app_configs, **kwargs):
+    """
+    Check that first-visit responses stay cacheable with cache middleware.
+
+    Persisting the detected language sets a cookie on cookieless requests,
+    and Django's cache middleware does not store such responses.
+    """
+    from django.conf import settings
+
+    from .stores import CookiePreferenceStore
+
+    errors = []
+
+    middleware = getattr(settings, "MIDDLEWARE", [])
+    uses_cache = any(name in middleware for name in CACHE_MIDDLEWARE)
+    persists_cookie = any(
+        issubclass(store, CookiePreferenceStore) for store in get_store_classes()
+    )
+    deferred = getattr(settings, "I18N_NOPREFIX_DEFER_COOKIE", False)
+    if uses_cache and persists_cookie and not deferred:
+        errors.append(
+            Warning(
+                "Language cookies make first-visit pages uncacheable by the cache middleware",
+                hint="Set I18N_NOPREFIX_DEFER_COOKIE = True to only write the language "
+                "cookie on explicit switches.",
+                id="django_i18n_noprefix.W102",
+            )
+        )
+
+    return errors
+
+
+@memoize_check
+def check_template_loaders(app_configs, **kwargs):
+    """
+    Check that templates using {% language_selector %} are not re-parsed
+    on every render.
+    """
+    from django.template import engines
+    from django.template.backends.django import DjangoTemplates
+
+    errors = []
+
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        loaders = [
+            loader[0] if isinstance(loader, (list, tuple)) else loader
+            for loader in engine.engine.loaders
+        ]
+        if not any(loader in CACHED_LOADERS for loader in loaders):
+            errors.append(
+                Warning(
+                    f'Template engine "{engine.name}" does not use the cached template loader',
+                    hint="Wrap its loaders in django.template.loaders.cached.Loader "
+                    "(or django_i18n_noprefix.loaders.Loader), so pages with "
+                    "{% language_selector %} are not parsed on every render.",
+                    id="django_i18n_noprefix.W103",
+                )
+            )
+
+    return errors
+
+
+def check_compiled_messages(app_configs, **kwargs):
+    """
+    Check that the translation catalogs in LOCALE_PATHS are compiled.
+
+    Not memoized: it depends on files, not settings.
+    """
+    import os
+
+    from django.conf import settings
+    from django.utils.translation import to_locale
+
+    errors = []
+
+    stale = []
+    for code, _name in getattr(settings, "LANGUAGES", []):
+        for locale_path in getattr(settings, "LOCALE_PATHS", []):
+            messages = os.path.join(str(locale_path), to_locale(code), "LC_MESSAGES")
+            po = os.path.join(messages, "django.po")
+            mo = os.path.join(messages, "django.mo")
+            if os.path.exists(po) and (
+                not os.path.exists(mo) or os.path.getmtime(mo) < os.path.getmtime(po)
+            ):
+                stale.append(code)
+                break
+    if stale:
+        errors.append(
+            Warning(
+                f"Translation catalogs are not compiled for: {', '.join(stale)}",
+                hint='Run "python manage.py compilemessages"; without .mo files '
+                "these languages fall back to untranslated text.",
+                id="django_i18n_noprefix.W104",
+            )
+        )
+
+    return errors
+
+
+@memoize_check
+def check_language_count(app_configs, **kwargs):
+    """Check for LANGUAGES too long to embed in every page."""
+    from django.conf import settings
+
+    errors = []
+
+    count = len(getattr(settings, "LANGUAGES", []))
+    if count > LARGE_LANGUAGE_COUNT:
+        errors.append(
+            Warning(
+                f"LANGUAGES has {count} languages; full language selectors embed all of them in every page",
+                hint="Use {% language_selector 'lazy' %}, which loads the list on "
+                "demand, then silence this check.",
+                id="django_i18n_noprefix.W105",
+            )
+        )
+
+    return errors
+
+
+PERFORMANCE_CHECKS = (
+    check_session_backend,
+    check_cache_middleware,
+    check_template_loaders,
+    check_compiled_messages,
+    check_language_count,
+)
@@ -0,0 +1,156 @@
+"""
+Per-language static assets, such as fonts and locale-specific stylesheets.
+
+Pages in CJK languages often need large font files that Latin pages must
+not download. List each language's assets in a manifest setting, and the
+``{% language_assets %}`` template tag emits links for the active
+language's assets only:
+
+    I18N_NOPREFIX_LANGUAGE_ASSETS = {
+        "ko": [
+            "fonts/NotoSansKR.woff2",
+            "i18n_noprefix/css/lang/cjk.css",
+        ],
+        "ar": [
+            {"path": "css/arabic.css", "media": "screen"},
+        ],
+    }
+
+Entries are static paths (passed through ``static()``), or dicts with a
+``path`` and any of ``rel``, ``as``, ``type``, ``media`` and ``crossorigin``.
+Fonts become ``<link rel="preload" as="font" crossorigin>`` and other files
+stylesheets, unless ``rel`` says otherwise. Languages without an entry of
+their own use their generic language's (``zh-hans`` -> ``zh``).
+
+The rendered HTML is built once per language and process.
+
+Settings:
+    I18N_NOPREFIX_LANGUAGE_ASSETS: language code -> list of assets
+"""
+
+import functools
+import os
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import SafeString
+
+FONT_TYPES = {
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+}
+
+SCRIPT_TYPES = {".js", ".mjs"}
+
+# Settings whose change can alter the rendered links
+DEPENDENT_SETTINGS = frozenset(
+    {
+        "I18N_NOPREFIX_LANGUAGE_ASSETS",
+        "STATIC_URL",
+        "STORAGES",
+        "STATICFILES_STORAGE",
+    }
+)
+
+
+def get_asset_manifest() -> Dict[str, List]:
+    """Return the configured language -> assets mapping."""
+    return getattr(settings, "I18N_NOPREFIX_LANGUAGE_ASSETS", None) or {}
+
+
+def get_assets(language: str) -> List[Dict[str, str]]:
+    """
+    Return the link attributes of ``language``'s assets, in manifest order.
+
+    Each item maps attribute names (``rel``, ``href``, ...) to values; a
+    value of ``""`` is a boolean attribute.
+    """
+    manifest = get_asset_manifest()
+    entries = manifest.get(language)
+    if entries is None:
+        entries = manifest.get(language.split("-")[0], ())
+    return [get_link_attributes(entry) for entry in entries]
+
+
+def get_link_attributes(entry) -> Dict[str, str]:
+    """Return the ``<link>`` attributes for one manifest entry."""
+    if isinstance(entry, str):
+        entry = {"path": entry}
+    elif not isinstance(entry, dict) or "path" not in entry:
+        raise ImproperlyConfigured(
+            "I18N_NOPREFIX_LANGUAGE_ASSETS entries must be static paths or "
+            f"dicts with a 'path', not {entry!r}."
+        )
+
+    path = entry["path"]
+    extension = os.path.splitext(path)[1].lower()
+    attributes = {"rel": "stylesheet", "href": static(path)}
+    if extension in FONT_TYPES:
+        attributes.update(
+            {
+                "rel": "preload",
+                "as": "font",
+                "type": FONT_TYPES[extension],
+                "crossorigin": "",
+            }
+        )
+    elif extension in SCRIPT_TYPES:
+        attributes.update({"rel": "preload", "as": "script"})
+
+    for name in ("rel", "as", "type", "media"):
+        if name in entry:
+            attributes[name] = entry[name]
+    if "crossorigin" in entry:
+        crossorigin = entry["crossorigin"]
+        if crossorigin is False:
+            attributes.pop("crossorigin", None)
+        else:
+            attributes["crossorigin"] = "" if crossorigin is True else crossorigin
+    return attributes
+
+
+@functools.lru_cache(maxsize=None)
+def render_language_assets(language: str) -> SafeString:
+    """Return the ``<link>`` tags for ``language``'s assets."""
+    return format_html_join(
+        "\n",
+        "<link{}>",
+        ((render_attributes(attributes),) for attributes in get_assets(language)),
+    )
+
+
+def render_attributes(attributes: Dict[str, str]) -> SafeString:
+    html = SafeString()
+    for name, value in attributes.items():
+        if value == "":
+            html += format_html(" {}", name)
+        else:
+            html += format_html(' {}="{}"', name, value)
+    return html
+
+
+@functools.lru_cache(maxsize=None)
+def get_preloads(language: str) -> Tuple[Tuple[str, str, bool], ...]:
+    """
+    Return (url, as, crossorigin) for each of ``language``'s preloaded
+    assets, to announce in a ``Link`` response header.
+    """
+    return tuple(
+        (attributes["href"], attributes["as"], "crossorigin" in attributes)
+        for attributes in get_assets(language)
+        if attributes["rel"] == "preload" and "as" in attributes
+    )
+
+
+@receiver(setting_changed)
+def _clear_rendered_assets(*, setting, **kwargs):
+    if setting in DEPENDENT_SETTINGS:
+        render_language_assets.cache_clear()
+        get_preloads.cache_clear()
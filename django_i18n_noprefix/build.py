@@ -0,0 +1,73 @@
+"""
+Writing content-hashed files at deploy time.
+
+Shared by the build_js_catalogs and build_selector_stylesheets management
+commands, which run before collectstatic on each deploy. Each built file is
+named after a hash of its content, so it can be served as immutable, and a
+JSON manifest in the same directory maps names (languages, styles) to the
+files' static paths.
+
+Files are written under a temporary name and renamed into place, so an
+interrupted build never leaves a truncated file under its final name. Files
+from earlier builds are left in place, since pages cached before the deploy
+may still reference them.
+"""
+
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Optional
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers never see a partial file."""
+    with open(path + ".tmp", "wb") as fh:
+        fh.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def write_hashed_file(
+    directory: str,
+    name: str,
+    extension: str,
+    content: bytes,
+    variants: Optional[Callable[[bytes], Dict[str, bytes]]] = None,
+) -> str:
+    """
+    Write ``content`` to ``<name>.<hash><extension>`` in ``directory`` and
+    return the file name.
+
+    ``variants`` returns sibling files by suffix (e.g. ``{".gz": ...}``);
+    it is only called when the file does not exist yet. Siblings are
+    written first, so a file that exists has all of them.
+    """
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    filename = f"{name}.{digest}{extension}"
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        for suffix, data in (variants(content) if variants else {}).items():
+            write_atomic(path + suffix, data)
+        write_atomic(path, content)
+    return filename
+
+
+def read_manifest(path: str) -> Optional[Dict[str, str]]:
+    """Return the manifest at ``path``, or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def write_manifest(path: str, entries: Dict[str, str], merge: bool = False) -> None:
+    """
+    Write the manifest mapping names to built files.
+
+    Call it after the files are written, so it never names a file that is
+    missing. With ``merge``, entries of an existing manifest that are not
+    rebuilt are kept.
+    """
+    combined = dict(read_manifest(path) or {}) if merge else {}
+    combined.update(entries)
+    write_atomic(path, json.dumps(combined, indent=2, sort_keys=True).encode())
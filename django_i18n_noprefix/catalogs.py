@@ -0,0 +1,144 @@
+"""
+Prebuilt JavaScript translation catalogs.
+
+Django's JavaScriptCatalog view rebuilds the catalog from the .mo files on
+every request. The build_js_catalogs management command instead renders the
+same catalog once per configured language and writes it to an immutable,
+content-hashed file:
+
+    <I18N_NOPREFIX_JS_CATALOG_ROOT>/jsi18n/ko.3f1c9a0b2d4e.js
+
+along with a ``catalogs.json`` manifest mapping languages to file names.
+Add the root to STATICFILES_DIRS so the files are collected and served by
+static storage or a CDN with far-future cache headers; the
+``{% js_catalog %}`` template tag looks up the file for the active language
+and, with ``preload=True``, has the middleware send a ``Link: rel=preload``
+header for it.
+
+Settings:
+    I18N_NOPREFIX_JS_CATALOG_ROOT: directory the catalogs are written to
+    I18N_NOPREFIX_JS_CATALOG_DOMAIN: gettext domain (default: 'djangojs')
+    I18N_NOPREFIX_JS_CATALOG_PACKAGES: app packages to include (default:
+        all installed apps, like JavaScriptCatalog)
+"""
+
+import functools
+import os
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.templatetags.static import static
+from django.utils import translation
+
+from .build import read_manifest, write_hashed_file, write_manifest
+
+CATALOG_DIR = "jsi18n"
+MANIFEST_NAME = "catalogs.json"
+PRELOAD_ATTR = "_i18n_noprefix_preload"
+
+
+def get_catalog_root() -> str:
+    """Return the configured catalog directory."""
+    root = getattr(settings, "I18N_NOPREFIX_JS_CATALOG_ROOT", None)
+    if not root:
+        raise ImproperlyConfigured(
+            "Set I18N_NOPREFIX_JS_CATALOG_ROOT to use prebuilt JavaScript catalogs."
+        )
+    return str(root)
+
+
+def render_catalog(
+    language: str, domain: str = "djangojs", packages: Optional[List[str]] = None
+) -> bytes:
+    """Render the JavaScriptCatalog script for ``language``."""
+    from django.views.i18n import JavaScriptCatalog
+
+    request = HttpRequest()
+    request.method = "GET"
+    view = JavaScriptCatalog.as_view(domain=domain, packages=packages or None)
+    with translation.override(language):
+        return view(request).content
+
+
+def build_catalogs(
+    root: str,
+    languages: Iterable[str],
+    domain: str = "djangojs",
+    packages: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Write one content-hashed catalog per language under ``root`` and the
+    manifest, returning the manifest (language code -> static path).
+    """
+    directory = os.path.join(root, CATALOG_DIR)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {}
+    for language in languages:
+        content = render_catalog(language, domain, packages)
+        filename = write_hashed_file(directory, language, ".js", content)
+        manifest[language] = f"{CATALOG_DIR}/{filename}"
+    write_manifest(os.path.join(directory, MANIFEST_NAME), manifest)
+
+    get_catalog_manifest.cache_clear()
+    return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_manifest() -> Dict[str, str]:
+    """Load the manifest written by build_js_catalogs (once per process)."""
+    path = os.path.join(get_catalog_root(), CATALOG_DIR, MANIFEST_NAME)
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise ImproperlyConfigured(
+            f"No JavaScript catalog manifest at {path}; "
+            "run 'manage.py build_js_catalogs'."
+        )
+    return manifest
+
+
+def catalog_url(language: Optional[str] = None) -> str:
+    """
+    Return the static URL of the prebuilt catalog for ``language`` (default:
+    the active language), falling back to LANGUAGE_CODE's catalog.
+    """
+    language = language or translation.get_language()
+    manifest = get_catalog_manifest()
+    path = manifest.get(language) or manifest.get(settings.LANGUAGE_CODE)
+    if path is None:
+        raise ImproperlyConfigured(
+            f"No JavaScript catalog for {language!r}; "
+            "rebuild with 'manage.py build_js_catalogs'."
+        )
+    return static(path)
+
+
+def request_preload(
+    request: HttpRequest, url: str, as_: str = "script", crossorigin: bool = False
+) -> None:
+    """
+    Ask NoPrefixLocaleMiddleware to announce ``url`` in a
+    ``Link: <url>; rel=preload`` response header.
+    """
+    link = f"<{url}>; rel=preload; as={as_}"
+    if crossorigin:
+        link += "; crossorigin"
+    request.__dict__.setdefault(PRELOAD_ATTR, []).append(link)
+
+
+def add_preload_header(request: HttpRequest, response) -> None:
+    """Add the Link preload header for URLs requested via request_preload()."""
+    links = request.__dict__.get(PRELOAD_ATTR)
+    if links:
+        existing = response.get("Link")
+        response["Link"] = ", ".join([existing, *links] if existing else links)
+
+
+@receiver(setting_changed)
+def _clear_catalog_manifest(*, setting, **kwargs):
+    if setting == "I18N_NOPREFIX_JS_CATALOG_ROOT":
+        get_catalog_manifest.cache_clear()
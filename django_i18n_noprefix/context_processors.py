@@ -0,0 +1,91 @@
+"""
+Context processor for django-i18n-noprefix.
+
+Add it to the template engine's context processors:
+
+    "context_processors": [
+        ...
+        "django_i18n_noprefix.context_processors.i18n_noprefix",
+    ]
+
+Templates then get an ``i18n_noprefix`` variable with:
+
+- ``language``: the active language code
+- ``current``: the active language's code, name (translated), native name
+  and bidi flag
+- ``languages``: the same for every configured language, plus
+  ``is_current`` and ``switch_url`` (as ``{% switch_language_url %}``)
+
+Example:
+    <html lang="{{ i18n_noprefix.language }}"
+          dir="{% if i18n_noprefix.current.bidi %}rtl{% else %}ltr{% endif %}">
+    {% for lang in i18n_noprefix.languages %}
+      <a href="{{ lang.switch_url }}" lang="{{ lang.code }}">{{ lang.name_local }}</a>
+    {% endfor %}
+
+The variable is built on first use only, from the precomputed language
+tables, and memoized on the request per language and page, so templates
+and includes rendered with several contexts share it.
+"""
+
+from typing import Any, Dict
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils import translation
+from django.utils.functional import SimpleLazyObject
+
+from .templatetags.i18n_noprefix import join_switch_url
+from .utils import get_language_metadata, get_language_names, get_switch_url_table
+
+REQUEST_ATTR = "_i18n_noprefix_context"
+
+
+def i18n_noprefix(request: HttpRequest) -> Dict[str, Any]:
+    """Expose the language data as a lazy ``i18n_noprefix`` variable."""
+    return {"i18n_noprefix": SimpleLazyObject(lambda: get_language_context(request))}
+
+
+def get_language_context(request: HttpRequest) -> Dict[str, Any]:
+    """Return the ``i18n_noprefix`` variable for the active language."""
+    language = translation.get_language()
+    key = (language, request.get_full_path())
+    memo = request.__dict__.setdefault(REQUEST_ATTR, {})
+    data = memo.get(key)
+    if data is None:
+        data = memo[key] = build_language_context(request, language)
+    return data
+
+
+def build_language_context(request: HttpRequest, language: str) -> Dict[str, Any]:
+    metadata = get_language_metadata()
+    names = get_language_names(language)
+    query_parameter = getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None)
+    table = None if query_parameter else get_switch_url_table()
+
+    languages = []
+    current = None
+    for code, name in names.items():
+        entry = {
+            "code": code,
+            "name": name,
+            "name_local": metadata[code].name_local,
+            "bidi": metadata[code].bidi,
+            "is_current": code == language,
+            "switch_url": join_switch_url(code, None, request, table, query_parameter),
+        }
+        languages.append(entry)
+        if entry["is_current"]:
+            current = entry
+
+    if current is None:
+        # Active language outside LANGUAGES (e.g. LANGUAGE_CODE = "en-us")
+        current = {
+            "code": language,
+            "name": language,
+            "name_local": language,
+            "bidi": translation.get_language_bidi(),
+            "is_current": True,
+            "switch_url": None,
+        }
+    return {"language": language, "current": current, "languages": languages}
@@ -0,0 +1,39 @@
+"""
+Template fragments that can be re-rendered after an AJAX language switch.
+
+Mark the translatable parts of a page with the ``i18n_fragment`` tag:
+
+    {% load i18n_noprefix %}
+    {% i18n_fragment "nav" %}...{% endi18n_fragment %}
+
+When set_language_ajax is asked for fragments, it renders the ``next`` page
+in the new language while capturing the output of each marked fragment, and
+returns just those pieces, so the client can swap them in place instead of
+reloading the page and all its assets.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from django.http import HttpRequest
+
+FRAGMENT_ATTR = "_i18n_noprefix_fragments"
+
+
+def start_capture(request: HttpRequest) -> None:
+    """Start recording fragments rendered for ``request``."""
+    request.__dict__[FRAGMENT_ATTR] = {}
+
+
+def record_fragment(request: Optional[HttpRequest], name: str, html: str) -> None:
+    """Record a rendered fragment if ``request`` is capturing."""
+    if request is None:
+        return
+    captured = request.__dict__.get(FRAGMENT_ATTR)
+    if captured is not None:
+        captured[name] = html
+
+
+def stop_capture(request: HttpRequest, names: Iterable[str]) -> Dict[str, str]:
+    """Stop recording and return the requested fragments that were rendered."""
+    captured = request.__dict__.pop(FRAGMENT_ATTR, None) or {}
+    return {name: captured[name] for name in names if name in captured}
@@ -0,0 +1,124 @@
+"""
+Jinja2 support for django-i18n-noprefix.
+
+Provides the template helpers as Jinja2 globals, backed by the same switch
+URL table and selector cache as the Django template tags:
+
+- ``switch_language_url(lang_code, next_url=None)``
+- ``is_current_language(lang_code)`` (also a filter)
+- ``language_selector(style="dropdown", next_url=None)``
+
+With Django's Jinja2 backend, use the bundled environment:
+
+    TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "APP_DIRS": True,
+            "OPTIONS": {"environment": "django_i18n_noprefix.jinja.environment"},
+        },
+        ...
+    ]
+
+or add the extension to your own environment:
+
+    env = Environment(extensions=["django_i18n_noprefix.jinja.I18nNoPrefixExtension"])
+
+The Jinja2 selector templates live in ``jinja2/i18n_noprefix/`` and can be
+overridden like any other template of the environment. Requires the
+optional ``jinja2`` package.
+"""
+
+from typing import Optional
+
+import jinja2
+from django.templatetags.static import static
+from django.utils import translation
+from jinja2.ext import Extension
+
+from .selector import get_selector_template, render_selector
+from .templatetags.i18n_noprefix import (
+    SELECTOR_TEMPLATES,
+    get_selector_context,
+    is_current_language,
+)
+from .templatetags.i18n_noprefix import switch_language_url as _switch_language_url
+
+_package_environment: Optional[jinja2.Environment] = None
+
+
+@jinja2.pass_context
+def switch_language_url(context, lang_code, next_url=None):
+    """
+    Return the URL switching to ``lang_code``, like ``{% switch_language_url %}``.
+
+    Example:
+        <a href="{{ switch_language_url('ko') }}">한국어</a>
+    """
+    return _switch_language_url(context, lang_code, next_url)
+
+
+@jinja2.pass_context
+def language_selector(context, style="dropdown", next_url=None):
+    """
+    Render the language selector, like ``{% language_selector %}``.
+
+    Example:
+        {{ language_selector('list') }}
+    """
+    request = context.get("request")
+    environment = context.environment
+
+    def render(switch_next):
+        values = get_selector_context(request, style, next_url, switch_next)
+        values["gettext"] = translation.gettext
+        values["static"] = static
+        template_name = SELECTOR_TEMPLATES.get(style, SELECTOR_TEMPLATES["dropdown"])
+        return get_template(environment, template_name).render(values)
+
+    return render_selector(request, style, next_url, render, environment)
+
+
+def get_template(environment: jinja2.Environment, template_name: str):
+    """
+    Return a compiled selector template from ``environment``, or from the
+    package's own templates if its loader does not know them.
+    """
+    if environment.loader is not None:
+        try:
+            return get_selector_template(environment, template_name)
+        except jinja2.TemplateNotFound:
+            pass
+    return get_selector_template(get_package_environment(), template_name)
+
+
+def get_package_environment() -> jinja2.Environment:
+    """Return an environment loading the bundled Jinja2 selector templates."""
+    global _package_environment
+    if _package_environment is None:
+        _package_environment = jinja2.Environment(
+            loader=jinja2.PackageLoader("django_i18n_noprefix", "jinja2"),
+            autoescape=True,
+        )
+    return _package_environment
+
+
+class I18nNoPrefixExtension(Extension):
+    """Jinja2 extension adding the language switching globals and filter."""
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.globals.update(
+            {
+                "switch_language_url": switch_language_url,
+                "is_current_language": is_current_language,
+                "language_selector": language_selector,
+            }
+        )
+        environment.filters["is_current_language"] = is_current_language
+
+
+def environment(**options) -> jinja2.Environment:
+    """Environment factory for Django's Jinja2 backend."""
+    env = jinja2.Environment(**options)
+    env.add_extension(I18nNoPrefixExtension)
+    return env
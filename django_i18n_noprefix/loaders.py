@@ -0,0 +1,140 @@
+"""
+Template loader that pre-translates static ``{% translate %}`` strings.
+
+Each ``{% translate "..." %}`` / ``{% blocktranslate %}`` node calls gettext
+again on every render. This loader works like Django's cached loader, but
+compiles and caches one variant of each template per active language, in
+which every translation that does not depend on the context (a string
+literal, no filters, no variables, no plural) is replaced by its
+pre-translated text. Templates reached through ``{% extends %}`` and
+``{% include %}`` are loaded through it as well, so they are folded too.
+
+Enable it in place of the default loaders (APP_DIRS must then be False):
+
+    TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [BASE_DIR / "templates"],
+            "OPTIONS": {
+                "loaders": ["django_i18n_noprefix.loaders.Loader"],
+            },
+        },
+    ]
+
+Without arguments it wraps the filesystem and app directories loaders; pass
+a list to wrap others, like the cached loader:
+
+    ("django_i18n_noprefix.loaders.Loader", ["myproject.loaders.DbLoader"])
+
+Memory use grows with the number of languages actually rendered. Like the
+cached loader, templates are not reloaded when the files change, except by
+the development server's autoreloader.
+"""
+
+from typing import Optional
+
+from django.template import Context, Node, NodeList, Template
+from django.template.base import TokenType
+from django.template.defaulttags import IfNode
+from django.template.loaders import cached
+from django.templatetags.i18n import BlockTranslateNode, LanguageNode, TranslateNode
+from django.utils import translation
+
+
+class Loader(cached.Loader):
+    """Cached loader keeping one pre-translated template per language."""
+
+    def __init__(self, engine, loaders=None):
+        if loaders is None:
+            loaders = [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ]
+        super().__init__(engine, loaders)
+
+    def get_template(self, template_name, skip=None):
+        compiled = self.cache_key(template_name, skip) in self.get_template_cache
+        template = super().get_template(template_name, skip)
+        if not compiled:
+            # First load for this language; folding is idempotent, so a
+            # concurrent load folding its own copy is harmless
+            fold_translations(template, template.nodelist)
+        return template
+
+    def cache_key(self, template_name, skip=None):
+        return f"{translation.get_language()}:{super().cache_key(template_name, skip)}"
+
+
+class PretranslatedNode(Node):
+    """A translation node replaced by its output in one language."""
+
+    def __init__(self, escaped: str, unescaped: str, asvar: Optional[str]):
+        self.escaped = escaped
+        self.unescaped = unescaped
+        self.asvar = asvar
+
+    def render(self, context):
+        value = self.escaped if context.autoescape else self.unescaped
+        if self.asvar:
+            context[self.asvar] = value
+            return ""
+        return value
+
+
+def fold_translations(template: Template, nodelist: NodeList) -> None:
+    """
+    Replace the constant translation nodes of ``nodelist`` (recursively)
+    with their output in the active language.
+    """
+    for index, node in enumerate(nodelist):
+        if is_constant_translation(node):
+            nodelist[index] = pretranslate(template, node)
+            continue
+        if isinstance(node, LanguageNode):
+            # {% language %} blocks render in another language
+            continue
+        if isinstance(node, IfNode):
+            for _condition, child in node.conditions_nodelists:
+                fold_translations(template, child)
+        for attr in node.child_nodelists:
+            child = getattr(node, attr, None)
+            if child is not None:
+                fold_translations(template, child)
+
+
+def is_constant_translation(node: Node) -> bool:
+    """Return True if ``node`` translates the same text on every render."""
+    if isinstance(node, TranslateNode):
+        var = node.filter_expression.var
+        return (
+            isinstance(getattr(var, "literal", None), str)
+            and not node.filter_expression.filters
+            and is_constant(node.message_context)
+        )
+    if isinstance(node, BlockTranslateNode):
+        return (
+            not node.extra_context
+            and not node.plural
+            and node.countervar is None
+            and all(token.token_type == TokenType.TEXT for token in node.singular)
+            and is_constant(node.message_context)
+        )
+    return False
+
+
+def is_constant(filter_expression) -> bool:
+    """Return True for a missing or string literal filter expression."""
+    return filter_expression is None or (
+        isinstance(filter_expression.var, str) and not filter_expression.filters
+    )
+
+
+def pretranslate(template: Template, node: Node) -> PretranslatedNode:
+    """Render ``node`` once with and once without autoescaping."""
+    outputs = []
+    for autoescape in (True, False):
+        context = Context(autoescape=autoescape)
+        context.template = template
+        output = node.render(context)
+        outputs.append(context[node.asvar] if node.asvar else output)
+    return PretranslatedNode(outputs[0], outputs[1], node.asvar)
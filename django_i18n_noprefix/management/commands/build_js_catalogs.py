@@ -0,0 +1,59 @@
+"""
+Write prebuilt, content-hashed JavaScript catalogs for every language.
+
+See django_i18n_noprefix.catalogs and django_i18n_noprefix.build.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from ...catalogs import build_catalogs, get_catalog_root
+
+
+class Command(BaseCommand):
+    help = "Write one immutable, content-hashed JavaScript catalog per language."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            help="Directory to write to (default: I18N_NOPREFIX_JS_CATALOG_ROOT).",
+        )
+        parser.add_argument(
+            "--domain",
+            default=getattr(settings, "I18N_NOPREFIX_JS_CATALOG_DOMAIN", "djangojs"),
+            help="gettext domain (default: djangojs).",
+        )
+        parser.add_argument(
+            "--package",
+            action="append",
+            dest="packages",
+            help="App package to include; may be repeated (default: all apps).",
+        )
+
+    def handle(self, *args, **options):
+        root = options["output_dir"]
+        if not root:
+            try:
+                root = get_catalog_root()
+            except ImproperlyConfigured as e:
+                raise CommandError(f"{e} Or pass --output-dir.") from None
+
+        packages = options["packages"] or getattr(
+            settings, "I18N_NOPREFIX_JS_CATALOG_PACKAGES", None
+        )
+        try:
+            manifest = build_catalogs(
+                root,
+                [code for code, _name in settings.LANGUAGES],
+                domain=options["domain"],
+                packages=packages,
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from None
+
+        for language, path in sorted(manifest.items()):
+            self.stdout.write(f"{language}: {path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(manifest)} JavaScript catalogs to {root}.")
+        )
@@ -0,0 +1,58 @@
+"""
+Write minified, content-hashed and precompressed selector stylesheets.
+
+See django_i18n_noprefix.stylesheets and django_i18n_noprefix.build.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from ...stylesheets import (
+    SOURCE_DIR,
+    STYLESHEETS,
+    build_stylesheets,
+    get_stylesheet_root,
+)
+
+
+class Command(BaseCommand):
+    help = "Write minified, content-hashed .css/.gz/.br selector stylesheets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            help="Directory to write to (default: I18N_NOPREFIX_STYLESHEET_ROOT).",
+        )
+        parser.add_argument(
+            "--style",
+            action="append",
+            dest="styles",
+            choices=sorted(STYLESHEETS),
+            help="Stylesheet to build; may be repeated (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        root = options["output_dir"]
+        if not root:
+            try:
+                root = get_stylesheet_root()
+            except ImproperlyConfigured as e:
+                raise CommandError(f"{e} Or pass --output-dir.") from None
+
+        manifest = build_stylesheets(root, options["styles"])
+
+        for style, path in sorted(manifest.items()):
+            built = os.path.join(root, *path.split("/"))
+            sizes = [
+                f"{os.path.getsize(os.path.join(SOURCE_DIR, STYLESHEETS[style]))} B",
+                f"min {os.path.getsize(built)} B",
+            ]
+            for suffix in (".gz", ".br"):
+                if os.path.exists(built + suffix):
+                    sizes.append(f"{suffix[1:]} {os.path.getsize(built + suffix)} B")
+            self.stdout.write(f"{style}: {path} ({', '.join(sizes)})")
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(manifest)} stylesheets to {root}.")
+        )
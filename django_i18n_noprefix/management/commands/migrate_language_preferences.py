@@ -0,0 +1,173 @@
+"""
+Migrate stored language preferences to the ``django_language`` session key.
+
+Sessions written by older setups keep the language under a legacy key (for
+example ``_language``, used by Django's LocaleMiddleware before Django 4.0).
+This command walks the session table in fixed-size chunks ordered by session
+key, moves legacy values to ``django_language``, drops values that are no
+longer in LANGUAGES and updates the changed rows chunk by chunk.
+
+It is safe to run against a live site: each row is only updated if its
+session data is still what was read, so a session changed in the meantime
+(say, by a login) is never reverted. Such sessions are counted as skipped;
+run the command again to migrate them.
+
+Memory use is bounded by --chunk-size. Every progress line reports the last
+session key processed; pass it to --start-after to resume an interrupted run.
+
+Language cookies live in browsers and cannot be migrated here;
+NoPrefixLocaleMiddleware rewrites them as visitors return.
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from ...resolution import SESSION_KEY
+from ...utils import is_valid_language
+
+DEFAULT_LEGACY_KEYS = ["_language"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Move language preferences stored under legacy session keys to "
+        f"'{SESSION_KEY}', in resumable chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--legacy-key",
+            action="append",
+            dest="legacy_keys",
+            help=(
+                "Session key holding a legacy language preference. May be "
+                f"repeated (default: {', '.join(DEFAULT_LEGACY_KEYS)})."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Sessions read and updated per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--start-after",
+            default="",
+            help="Resume after this session key (printed with each progress line).",
+        )
+        parser.add_argument(
+            "--include-expired",
+            action="store_true",
+            help="Also migrate sessions that have already expired.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the sessions that would change without writing.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        legacy_keys = options["legacy_keys"] or DEFAULT_LEGACY_KEYS
+        dry_run = options["dry_run"]
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        if not hasattr(store, "get_model_class"):
+            raise CommandError(
+                f"{settings.SESSION_ENGINE} does not store sessions in the "
+                "database; only database-backed session engines can be migrated."
+            )
+        model = store.get_model_class()
+        queryset = model.objects.order_by("session_key").only(
+            "session_key", "session_data"
+        )
+        if not options["include_expired"]:
+            queryset = queryset.filter(expire_date__gt=timezone.now())
+
+        # cached_db keeps a copy of each session in the cache
+        cache_prefix = getattr(store, "cache_key_prefix", None)
+        session_cache = caches[settings.SESSION_CACHE_ALIAS] if cache_prefix else None
+
+        last_key = options["start_after"]
+        scanned = changed = skipped = 0
+        started = time.monotonic()
+
+        while True:
+            chunk = list(queryset.filter(session_key__gt=last_key)[:chunk_size])
+            if not chunk:
+                break
+            last_key = chunk[-1].session_key
+            scanned += len(chunk)
+
+            updates = []
+            for session in chunk:
+                data = store.decode(session.session_data)
+                if self.migrate(data, legacy_keys):
+                    updates.append(
+                        (session.session_key, session.session_data, store.encode(data))
+                    )
+
+            if dry_run:
+                changed += len(updates)
+            elif updates:
+                updated = []
+                with transaction.atomic(using=queryset.db):
+                    for session_key, old_data, new_data in updates:
+                        if model.objects.filter(
+                            session_key=session_key, session_data=old_data
+                        ).update(session_data=new_data):
+                            updated.append(session_key)
+                changed += len(updated)
+                skipped += len(updates) - len(updated)
+                if session_cache is not None and updated:
+                    session_cache.delete_many(
+                        [cache_prefix + session_key for session_key in updated]
+                    )
+
+            elapsed = time.monotonic() - started
+            rate = scanned / elapsed if elapsed else 0.0
+            self.stdout.write(
+                f"Scanned {scanned} sessions, {changed} "
+                f"{'to update' if dry_run else 'updated'}"
+                f"{f', {skipped} skipped' if skipped else ''} "
+                f"({rate:.0f} sessions/s), last key {last_key}"
+            )
+
+        if dry_run:
+            summary = f"Dry run: {changed} of {scanned} sessions would be updated."
+        else:
+            summary = f"Updated {changed} of {scanned} sessions."
+            if skipped:
+                summary += (
+                    f" Skipped {skipped} sessions that changed during the run; "
+                    "run the command again to migrate them."
+                )
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def migrate(self, data, legacy_keys):
+        """
+        Rewrite the language keys of one decoded session in place.
+
+        Returns True if ``data`` changed.
+        """
+        changed = False
+        for key in legacy_keys:
+            if key == SESSION_KEY or key not in data:
+                continue
+            legacy = data.pop(key)
+            changed = True
+            if SESSION_KEY not in data and is_valid_language(legacy):
+                data[SESSION_KEY] = legacy
+
+        if SESSION_KEY in data and not is_valid_language(data[SESSION_KEY]):
+            del data[SESSION_KEY]
+            changed = True
+        return changed
@@ -6,12 +6,26 @@ language prefixes to URLs (e.g., /en/, /ko/, /ja/).
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
+from django.urls import NoReverseMatch, reverse
 from django.utils import translation
-from django.utils.translation import get_language_from_request
+from django.utils.cache import patch_vary_headers
+
+from .catalogs import add_preload_header
+from .resolution import (
+    SOURCE_DEFAULT,
+    SOURCE_HEADER,
+    SOURCE_QUERY,
+    LanguageResolution,
+    accept_language_codes,
+)
+from .stores import CookiePreferenceStore, PreferenceStore, get_preference_stores
+from .utils import aactivate_language, activate_language, get_language_codes
+from .writebehind import get_write_behind_queue
 
 logger = logging.getLogger(__name__)
 
@@ -25,51 +39,86 @@ class NoPrefixLocaleMiddleware:
     2. Cookie (django_language or custom)
     3. Accept-Language header
     4. Default language (LANGUAGE_CODE setting)
+
+    Steps 1 and 2 are the default preference stores; other stores (cache,
+    user model) can be configured with I18N_NOPREFIX_PREFERENCE_STORES.
+
+    The outcome is attached to the request as ``request.language_resolution``
+    (see LanguageResolution) alongside the usual ``request.LANGUAGE_CODE``.
+
+    With ``I18N_NOPREFIX_DEFER_COOKIE = True`` a language detected from
+    Accept-Language or the default is not persisted, so first-visit responses
+    carry no Set-Cookie header and stay cacheable; only explicit switches
+    write the cookie.
+
+    With ``I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"`` any URL accepts
+    ``?set_lang=ko`` to switch language and serve the page in one round trip.
+
+    With ``I18N_NOPREFIX_WRITE_BEHIND = True`` the cookie and request state are
+    still updated immediately, but cache and user writes are queued and
+    performed off the request path (see writebehind). Session writes stay
+    inline.
+
+    Views listed in ``language_independent_views`` (the language_list
+    endpoint) are passed through untouched: the stores are not read, so the
+    session is not accessed (no ``Vary: Cookie``), and nothing is persisted,
+    so their responses stay cacheable by shared caches.
+
+    The middleware is both sync and async capable. In async chains the
+    preference stores are loaded through their async APIs (session.aget on
+    Django 5.0+) before the language is resolved.
     """
 
+    sync_capable = True
+    async_capable = True
+
+    language_independent_views = ("django_i18n_noprefix:language_list",)
+
     def __init__(self, get_response):
         """Initialize the middleware."""
         self.get_response = get_response
 
-        # Get custom settings or use defaults
-        self.cookie_name = getattr(
-            settings, "I18N_NOPREFIX_COOKIE_NAME", settings.LANGUAGE_COOKIE_NAME
-        )
-        self.cookie_age = getattr(
-            settings,
-            "I18N_NOPREFIX_COOKIE_AGE",
-            settings.LANGUAGE_COOKIE_AGE or 365 * 24 * 60 * 60,  # 1 year
-        )
-        self.cookie_path = getattr(
-            settings, "I18N_NOPREFIX_COOKIE_PATH", settings.LANGUAGE_COOKIE_PATH
-        )
-        self.cookie_domain = getattr(
-            settings, "I18N_NOPREFIX_COOKIE_DOMAIN", settings.LANGUAGE_COOKIE_DOMAIN
-        )
-        self.cookie_secure = getattr(
-            settings,
-            "I18N_NOPREFIX_COOKIE_SECURE",
-            settings.LANGUAGE_COOKIE_SECURE or False,
-        )
-        self.cookie_httponly = getattr(
-            settings,
-            "I18N_NOPREFIX_COOKIE_HTTPONLY",
-            settings.LANGUAGE_COOKIE_HTTPONLY or False,
-        )
-        self.cookie_samesite = getattr(
-            settings,
-            "I18N_NOPREFIX_COOKIE_SAMESITE",
-            settings.LANGUAGE_COOKIE_SAMESITE or "Lax",
+        self.stores = get_preference_stores()
+
+        # Cookie settings come from the configured cookie store (or the
+        # defaults when cookies are not used for persistence)
+        cookie_store = (
+            next(
+                (s for s in self.stores if isinstance(s, CookiePreferenceStore)),
+                None,
+            )
+            or CookiePreferenceStore()
         )
+        self.cookie_name = cookie_store.cookie_name
+        self.cookie_age = cookie_store.cookie_age
+        self.cookie_path = cookie_store.cookie_path
+        self.cookie_domain = cookie_store.cookie_domain
+        self.cookie_secure = cookie_store.cookie_secure
+        self.cookie_httponly = cookie_store.cookie_httponly
+        self.cookie_samesite = cookie_store.cookie_samesite
+
+        self.defer_cookie = getattr(settings, "I18N_NOPREFIX_DEFER_COOKIE", False)
+        self.write_behind = get_write_behind_queue()
+        self.query_parameter = getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None)
+        self._independent_prefixes: Optional[Tuple[str, ...]] = None
+
+        # Run natively in async middleware chains (ASGI)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Process the request and response."""
-        # Get the current language
-        language = self.get_language(request)
+        if self.is_async:
+            return self.__acall__(request)
 
-        # Activate the language
-        translation.activate(language)
-        request.LANGUAGE_CODE = language
+        if self.is_language_independent(request):
+            return self.get_response(request)
+
+        self.activate_request_language(request, self.resolve_language(request))
+
+        if self.query_parameter is not None:
+            self.process_query_language(request)
 
         # Process the view
         response = self.get_response(request)
@@ -78,35 +127,149 @@ class NoPrefixLocaleMiddleware:
         # Use request.LANGUAGE_CODE which may have been updated by views
         self.save_language(request, response, request.LANGUAGE_CODE)
 
+        self.process_response_headers(request, response)
         return response
 
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of __call__, used under ASGI."""
+        if self.is_language_independent(request):
+            return await self.get_response(request)
+
+        # Load the stores without blocking the event loop; from here on
+        # reading them does no I/O
+        for store in self.stores:
+            await store.aprepare(request)
+
+        self.activate_request_language(request, self.resolve_language(request))
+
+        if self.query_parameter is not None:
+            await self.aprocess_query_language(request)
+
+        response = await self.get_response(request)
+
+        await self.asave_language(request, response, request.LANGUAGE_CODE)
+
+        self.process_response_headers(request, response)
+        return response
+
+    def is_language_independent(self, request: HttpRequest) -> bool:
+        """Return True if the request is for a language_independent_views view."""
+        if self._independent_prefixes is None:
+            # URLconfs are only safe to use once the first request arrives
+            self._independent_prefixes = self.get_language_independent_prefixes()
+        return bool(self._independent_prefixes) and request.path.startswith(
+            self._independent_prefixes
+        )
+
+    def get_language_independent_prefixes(self) -> Tuple[str, ...]:
+        """Return the URL prefixes of the installed language_independent_views."""
+        prefixes = []
+        for name in self.language_independent_views:
+            try:
+                # Drop the language code argument
+                prefixes.append(reverse(name, args=["xx"])[: -len("xx/")])
+            except NoReverseMatch:
+                continue
+        return tuple(prefixes)
+
+    def activate_request_language(
+        self, request: HttpRequest, resolution: LanguageResolution
+    ) -> None:
+        """Activate the resolved language and attach it to the request."""
+        language = resolution.code
+
+        # Activate the language. Re-activating the language that is already
+        # active on this thread copies asgiref's local storage, so skip it.
+        if translation.get_language() != language:
+            translation.activate(language)
+        request.LANGUAGE_CODE = language
+        request.language_resolution = resolution
+
+    def process_response_headers(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> None:
+        """Add the Link and Vary headers the response needs."""
+        # Link preload headers requested by templates ({% js_catalog %})
+        add_preload_header(request, response)
+
+        if self.defer_cookie:
+            # Responses are now shared between visitors, so caches must key
+            # them on everything that can select the language.
+            patch_vary_headers(response, ("Accept-Language", "Cookie"))
+
+    def process_query_language(self, request: HttpRequest) -> None:
+        """
+        Switch language for a one-shot ``?<I18N_NOPREFIX_QUERY_PARAMETER>=<code>``
+        request, so the page is served in the new language without a redirect.
+
+        The choice is persisted like a change_language switch. Invalid codes
+        are ignored.
+        """
+        lang_code = self.get_query_language(request)
+        if lang_code and activate_language(request, lang_code):
+            request.language_resolution = request.language_resolution.with_code(
+                lang_code, SOURCE_QUERY
+            )
+
+    async def aprocess_query_language(self, request: HttpRequest) -> None:
+        """Async version of process_query_language()."""
+        lang_code = self.get_query_language(request)
+        if lang_code and await aactivate_language(request, lang_code):
+            request.language_resolution = request.language_resolution.with_code(
+                lang_code, SOURCE_QUERY
+            )
+
+    def get_query_language(self, request: HttpRequest) -> Optional[str]:
+        """Return the one-shot query parameter's value, if any."""
+        # Only build request.GET when the parameter can be present
+        if self.query_parameter not in request.META.get("QUERY_STRING", ""):
+            return None
+        return request.GET.get(self.query_parameter)
+
     def get_language(self, request: HttpRequest) -> str:
         """
         Determine the language for the request.
 
         Priority:
-        1. Session (django_language)
-        2. Cookie
-        3. Accept-Language header
-        4. Default language
+        1. Preference stores (session, then cookie by default)
+        2. Accept-Language header
+        3. Default language
         """
-        # 1. Check session
-        language = self.get_language_from_session(request)
-        if language:
-            return language
+        return self.resolve_language(request).code
 
-        # 2. Check cookie
-        language = self.get_language_from_cookie(request)
-        if language:
-            return language
+    def resolve_language(self, request: HttpRequest) -> LanguageResolution:
+        """
+        Determine the language for the request and where it came from.
 
-        # 3. Check Accept-Language header
-        language = self.get_language_from_header(request)
-        if language:
-            return language
+        Uses the same priority as get_language().
+        """
+        # 1. Check preference stores in priority order
+        language = None
+        for store in self.stores:
+            language = self.read_store(store, request)
+            if language and self.is_valid_language(language):
+                source = store.source
+                break
+            language = None
+
+        # 2. Check Accept-Language header
+        if not language:
+            source = SOURCE_HEADER
+            language = self.get_language_from_header(request)
 
-        # 4. Return default language
-        return settings.LANGUAGE_CODE
+        # 3. Fall back to the default language
+        if not language:
+            source = SOURCE_DEFAULT
+            language = settings.LANGUAGE_CODE
+
+        return LanguageResolution(
+            language,
+            source,
+            session=getattr(request, "session", None),
+            cookies=request.COOKIES,
+            accept=request.META.get("HTTP_ACCEPT_LANGUAGE", ""),
+            cookie_name=self.cookie_name,
+        )
 
     def get_language_from_session(self, request: HttpRequest) -> Optional[str]:
         """Get language from session if available."""
@@ -126,18 +289,17 @@ class NoPrefixLocaleMiddleware:
     def get_language_from_header(self, request: HttpRequest) -> Optional[str]:
         """
         Get language from Accept-Language header.
-        Uses Django's built-in language detection.
+        Uses Django's built-in header parsing and variant matching.
         """
-        # Use Django's built-in function to parse Accept-Language header
-        language = get_language_from_request(request, check_path=False)
-        if language and self.is_valid_language(language):
-            return language
+        accept = request.META.get("HTTP_ACCEPT_LANGUAGE", "")
+        for language in accept_language_codes(accept):
+            if self.is_valid_language(language):
+                return language
         return None
 
     def is_valid_language(self, language: str) -> bool:
         """Check if the language code is valid."""
-        available_languages = [lang[0] for lang in settings.LANGUAGES]
-        return language in available_languages
+        return language in get_language_codes()
 
     def save_language(
         self, request: HttpRequest, response: HttpResponse, current_language: str
@@ -145,8 +307,30 @@ class NoPrefixLocaleMiddleware:
         """
         Save language preference if it changed.
 
-        - Saves to session if available
-        - Always saves to cookie for session-less users
+        - Saves to every preference store (session and cookie by default)
+          whose stored value differs from the current language
+        - Skips detected (header/default) languages when the cookie is deferred
+        """
+        explicit = getattr(request, "_language_was_set", False)
+        for store in self.queue_writes(request, current_language):
+            store.write(request, response, current_language, explicit)
+
+    async def asave_language(
+        self, request: HttpRequest, response: HttpResponse, current_language: str
+    ) -> None:
+        """Async version of save_language()."""
+        explicit = getattr(request, "_language_was_set", False)
+        for store in self.queue_writes(request, current_language):
+            await store.awrite(request, response, current_language, explicit)
+
+    def queue_writes(
+        self, request: HttpRequest, current_language: str
+    ) -> Sequence[PreferenceStore]:
+        """
+        Decide which stores must persist ``current_language``.
+
+        Writes that can be deferred are handed to the write-behind queue;
+        the stores to write inline are returned.
         """
         # Check if language was explicitly set (e.g., via set_language view)
         language_was_set = getattr(request, "_language_was_set", False)
@@ -154,28 +338,45 @@ class NoPrefixLocaleMiddleware:
         # Save if language was explicitly set or if there's no cookie yet
         should_save = language_was_set or not request.COOKIES.get(self.cookie_name)
 
-        if should_save:
-            # Save to session if available
-            if (
-                hasattr(request, "session")
-                and hasattr(request.session, "session_key")
-                and request.session.session_key
-            ):
-                request.session["django_language"] = current_language
-            elif hasattr(request, "session") and not hasattr(
-                request.session, "session_key"
+        # In deferred mode, a language merely detected from the request is
+        # re-detected next time, so persisting it only costs cacheability
+        if should_save and not language_was_set and self.defer_cookie:
+            resolution = getattr(request, "language_resolution", None)
+            if resolution is not None and resolution.source in (
+                SOURCE_HEADER,
+                SOURCE_DEFAULT,
             ):
-                # For dict-like sessions (e.g., in tests)
-                request.session["django_language"] = current_language
-
-            # Always save to cookie
-            response.set_cookie(
-                key=self.cookie_name,
-                value=current_language,
-                max_age=self.cookie_age,
-                path=self.cookie_path,
-                domain=self.cookie_domain,
-                secure=self.cookie_secure,
-                httponly=self.cookie_httponly,
-                samesite=self.cookie_samesite,
-            )
+                should_save = False
+
+        if not should_save:
+            return ()
+
+        # Write only to stores whose value really changes, so an
+        # unchanged session is not marked modified and re-saved
+        inline = []
+        for store in self.stores:
+            if self.read_store(store, request) == current_language:
+                continue
+            key = None
+            if self.write_behind is not None:
+                key = store.deferred_key(request)
+            if key:
+                job = store.deferred_write(request, current_language, language_was_set)
+                if job is not None:
+                    self.write_behind.submit(key, current_language, job)
+            else:
+                inline.append(store)
+        return inline
+
+    def read_store(self, store: PreferenceStore, request: HttpRequest) -> Optional[str]:
+        """
+        Read a preference store, preferring a write still waiting in the
+        write-behind queue so this process sees its own recent changes.
+        """
+        if self.write_behind is not None:
+            key = store.deferred_key(request)
+            if key:
+                pending = self.write_behind.pending(key)
+                if pending is not None:
+                    return pending
+        return store.read(request)
@@ -0,0 +1,349 @@
+"""
+Rate limiting for the language switch endpoints.
+
+Every language switch writes the session, so a client calling
+change_language in a loop turns directly into session store load.
+LanguageSwitchRateLimitMiddleware gives each client a token bucket and
+answers 429 Too Many Requests once it is empty. Install it before
+SessionMiddleware so rejected requests never touch the session:
+
+    MIDDLEWARE = [
+        "django_i18n_noprefix.ratelimit.LanguageSwitchRateLimitMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        ...
+    ]
+
+Clients are keyed by IP address (REMOTE_ADDR) by default, which they
+cannot choose per request. Clients behind one NAT or proxy share that
+address and so one bucket; set I18N_NOPREFIX_RATE_LIMIT_KEY to key them on
+something else, such as a forwarded address your proxy sets. The session
+cookie is not verified before SessionMiddleware
+runs, so a client rotating random cookies would get a fresh bucket each
+time; it can only be used for an optional, tighter bucket per session on
+top of the per-address one. The buckets live in process memory by default;
+set I18N_NOPREFIX_RATE_LIMIT_CACHE to share them between processes through
+a Django cache.
+
+Settings:
+    I18N_NOPREFIX_RATE_LIMIT: allowed switches per IP address, e.g.
+        '10/minute' (default). The number is also the burst size. Units:
+        second, minute, hour.
+    I18N_NOPREFIX_RATE_LIMIT_KEY: dotted path to a function taking the
+        request and returning the client's key, or None to not limit the
+        request (default: get_client_key)
+    I18N_NOPREFIX_RATE_LIMIT_PER_SESSION: allowed switches per session
+        cookie, in addition to the per-client limit (default: None)
+    I18N_NOPREFIX_RATE_LIMIT_CACHE: cache alias for shared buckets
+        (default: None, in-process)
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from django.urls import NoReverseMatch, reverse
+from django.utils.module_loading import import_string
+
+DEFAULT_RATE_LIMIT = "10/minute"
+
+PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "second": 1,
+    "m": 60,
+    "min": 60,
+    "minute": 60,
+    "h": 3600,
+    "hour": 3600,
+}
+
+
+def parse_rate(
+    rate: str, setting: str = "I18N_NOPREFIX_RATE_LIMIT"
+) -> Tuple[int, float]:
+    """Parse '10/minute' into (burst, tokens per second)."""
+    try:
+        count, period = rate.split("/")
+        count = int(count)
+        seconds = PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ImproperlyConfigured(
+            f"Invalid {setting} {rate!r}; use e.g. '10/minute'."
+        ) from None
+    if count < 1:
+        raise ImproperlyConfigured(f"{setting} must allow at least 1.")
+    return count, count / seconds
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per client key.
+
+    Buckets refill continuously at ``rate`` tokens per second up to
+    ``burst``. At most ``max_keys`` buckets are kept; the least recently
+    used are dropped first (a dropped client simply starts full again).
+    """
+
+    def __init__(self, burst: int, rate: float, max_keys: int = 10000):
+        self.burst = burst
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+        self._stats = {"allowed": 0, "limited": 0}
+
+    def allow(self, key: str) -> bool:
+        """Take a token for ``key``; return False if none is left."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self._stats["allowed" if allowed else "limited"] += 1
+        return allowed
+
+    def retry_after(self) -> int:
+        """Seconds until an empty bucket has a token again."""
+        return max(1, int(1 / self.rate + 0.999))
+
+    def stats(self) -> Dict[str, int]:
+        """Return allowed/limited counts and the number of tracked keys."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["keys"] = len(self._buckets)
+        return stats
+
+
+class CacheTokenBucketLimiter(TokenBucketLimiter):
+    """
+    Token buckets stored in a Django cache, shared by all processes.
+
+    The read-modify-write is not atomic across processes, so concurrent
+    requests from one client may occasionally both get the last token;
+    that is fine for shedding abusive load. Stats are per process.
+    """
+
+    key_prefix = "i18n_noprefix:ratelimit"
+
+    def __init__(self, burst: int, rate: float, cache_alias: str = "default"):
+        super().__init__(burst, rate)
+        self.cache_alias = cache_alias
+
+    def allow(self, key: str) -> bool:
+        cache = caches[self.cache_alias]
+        cache_key = f"{self.key_prefix}:{key}"
+        now = time.time()
+        tokens, updated = cache.get(cache_key) or (self.burst, now)
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Keep the entry until the bucket would be full again
+        cache.set(cache_key, (tokens, now), int(self.burst / self.rate) + 1)
+        with self._lock:
+            self._stats["allowed" if allowed else "limited"] += 1
+        return allowed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+def get_client_key(request: HttpRequest) -> str:
+    """Identify the client by IP address, hashed for limiter storage."""
+    raw = f"ip:{request.META.get('REMOTE_ADDR', '')}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+@functools.lru_cache(maxsize=None)
+def get_key_function() -> Callable[[HttpRequest], Optional[str]]:
+    """
+    Return the function keying clients, from I18N_NOPREFIX_RATE_LIMIT_KEY.
+
+    Keys are stored as returned (in cache keys with a shared limiter), so
+    custom functions should hash them like get_client_key does.
+    """
+    path = getattr(settings, "I18N_NOPREFIX_RATE_LIMIT_KEY", None)
+    return import_string(path) if path else get_client_key
+
+
+def get_session_client_key(request: HttpRequest) -> Optional[str]:
+    """
+    Identify the client by session cookie, or None without one.
+
+    The cookie is read directly, without loading the session. Keys are
+    hashed so session keys never end up in limiter storage.
+    """
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None
+    return hashlib.sha256(f"session:{session_key}".encode()).hexdigest()[:32]
+
+
+_limiters: Dict[str, Optional[TokenBucketLimiter]] = {}
+_limiter_lock = threading.Lock()
+
+
+def get_limiter(setting: str, default: Optional[str]) -> Optional[TokenBucketLimiter]:
+    """
+    Return the process-wide limiter for the rate in ``setting``, or None if
+    the setting (and ``default``) is empty.
+    """
+    with _limiter_lock:
+        if setting not in _limiters:
+            rate_setting = getattr(settings, setting, default)
+            limiter = None
+            if rate_setting:
+                burst, rate = parse_rate(rate_setting, setting)
+                cache_alias = getattr(settings, "I18N_NOPREFIX_RATE_LIMIT_CACHE", None)
+                if cache_alias:
+                    limiter = CacheTokenBucketLimiter(burst, rate, cache_alias)
+                else:
+                    limiter = TokenBucketLimiter(burst, rate)
+            _limiters[setting] = limiter
+        return _limiters[setting]
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Return the process-wide per-address limiter configured by the settings."""
+    return get_limiter("I18N_NOPREFIX_RATE_LIMIT", DEFAULT_RATE_LIMIT)
+
+
+def get_session_rate_limiter() -> Optional[TokenBucketLimiter]:
+    """Return the process-wide per-session limiter, if one is configured."""
+    return get_limiter("I18N_NOPREFIX_RATE_LIMIT_PER_SESSION", None)
+
+
+@receiver(setting_changed)
+def _reset_limiter(*, setting, **kwargs):
+    if setting in (
+        "I18N_NOPREFIX_RATE_LIMIT",
+        "I18N_NOPREFIX_RATE_LIMIT_PER_SESSION",
+        "I18N_NOPREFIX_RATE_LIMIT_CACHE",
+    ):
+        _limiters.clear()
+    elif setting == "I18N_NOPREFIX_RATE_LIMIT_KEY":
+        get_key_function.cache_clear()
+
+
+class LanguageSwitchRateLimitMiddleware:
+    """
+    Answer 429 to clients that switch language too often.
+
+    Applies to change_language, change_language_inline, set_language_ajax
+    and one-shot ``?<I18N_NOPREFIX_QUERY_PARAMETER>=`` switches. Other
+    requests only pay a string prefix check.
+
+    The middleware is both sync and async capable. In async chains only
+    switch requests leave the event loop, since the key function and a
+    cache-backed limiter may block.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    switch_views = (
+        "django_i18n_noprefix:change_language",
+        "django_i18n_noprefix:change_language_inline",
+        "django_i18n_noprefix:set_language_ajax",
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_parameter = getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None)
+        self._prefixes: Optional[Tuple[str, ...]] = None
+
+        # Run natively in async middleware chains (ASGI)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+
+        if self.is_switch(request):
+            response = self.limit(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of __call__, used under ASGI."""
+        if self.is_switch(request):
+            response = await sync_to_async(self.limit)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def limit(self, request: HttpRequest) -> Optional[HttpResponse]:
+        """Return the 429 response for a switch over the limit, else None."""
+        limiter = self.get_exhausted_limiter(request)
+        if limiter is None:
+            return None
+        response = HttpResponse(
+            "Too many language changes", status=429, content_type="text/plain"
+        )
+        response["Retry-After"] = str(limiter.retry_after())
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def get_exhausted_limiter(
+        self, request: HttpRequest
+    ) -> Optional[TokenBucketLimiter]:
+        """Take a token from each bucket; return the one that had none left."""
+        key = get_key_function()(request)
+        if key is None:
+            return None
+        limiter = get_rate_limiter()
+        if not limiter.allow(key):
+            return limiter
+        session_limiter = get_session_rate_limiter()
+        if session_limiter is not None:
+            key = get_session_client_key(request)
+            if key is not None and not session_limiter.allow(key):
+                return session_limiter
+        return None
+
+    def is_switch(self, request: HttpRequest) -> bool:
+        """Return True if the request changes language."""
+        if self._prefixes is None:
+            # URLconfs are only safe to use once the first request arrives
+            self._prefixes = self.get_switch_prefixes()
+        if self._prefixes and request.path.startswith(self._prefixes):
+            return True
+        return bool(
+            self.query_parameter
+            and self.query_parameter in request.META.get("QUERY_STRING", "")
+            and request.GET.get(self.query_parameter)
+        )
+
+    def get_switch_prefixes(self) -> Tuple[str, ...]:
+        """Return the URL prefixes of the installed switch views."""
+        prefixes = []
+        for name in self.switch_views:
+            try:
+                url = reverse(name)
+            except NoReverseMatch:
+                try:
+                    # Drop the language code argument
+                    url = reverse(name, args=["xx"])[: -len("xx/")]
+                except NoReverseMatch:
+                    continue
+            prefixes.append(url)
+        return tuple(prefixes)
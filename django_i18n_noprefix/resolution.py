@@ -0,0 +1,123 @@
+"""
+Language resolution results for django-i18n-noprefix.
+
+NoPrefixLocaleMiddleware attaches a LanguageResolution to every request as
+``request.language_resolution``. It records which language won and where it
+came from, and can rank every acceptable language for the request (useful
+for fallback chains) without re-parsing Accept-Language unless asked.
+"""
+
+from typing import Any, Iterator, List, Mapping, Optional
+
+from django.conf import settings
+from django.utils.translation import get_supported_language_variant
+from django.utils.translation.trans_real import parse_accept_lang_header
+
+from .utils import get_language_codes
+
+SESSION_KEY = "django_language"
+
+SOURCE_SESSION = "session"
+SOURCE_COOKIE = "cookie"
+SOURCE_HEADER = "header"
+SOURCE_DEFAULT = "default"
+SOURCE_QUERY = "query"
+
+
+def accept_language_codes(header: str) -> Iterator[str]:
+    """
+    Yield supported language codes from an Accept-Language header value.
+
+    Codes are yielded in order of preference (highest q-value first) and are
+    mapped to the configured variant (e.g. ``ko-KR`` yields ``ko``), using
+    Django's own header parsing and variant lookup.
+
+    Example:
+        >>> list(accept_language_codes("ja,ko;q=0.8"))
+        ['ja', 'ko']
+    """
+    for accept_lang, _quality in parse_accept_lang_header(header):
+        if accept_lang == "*":
+            break
+        try:
+            yield get_supported_language_variant(accept_lang)
+        except LookupError:
+            continue
+
+
+class LanguageResolution:
+    """
+    The outcome of language detection for a single request.
+
+    Attributes:
+        code: The language code that was activated
+        source: Where it came from - 'session', 'cookie', 'header', 'default'
+            or 'query' (one-shot switch, see I18N_NOPREFIX_QUERY_PARAMETER)
+
+    The ranked ``candidates`` list is only computed on first access.
+    """
+
+    __slots__ = (
+        "code",
+        "source",
+        "_session",
+        "_cookies",
+        "_accept",
+        "_cookie_name",
+        "_candidates",
+    )
+
+    def __init__(
+        self,
+        code: str,
+        source: str,
+        session: Optional[Mapping[str, Any]],
+        cookies: Mapping[str, str],
+        accept: str,
+        cookie_name: str,
+    ):
+        self.code = code
+        self.source = source
+        # Keep only what is needed to rank candidates later, rather than the
+        # request itself, so the request and its resolution never form a cycle
+        self._session = session
+        self._cookies = cookies
+        self._accept = accept
+        self._cookie_name = cookie_name
+        self._candidates: Optional[List[str]] = None
+
+    def __repr__(self):
+        return f"<LanguageResolution code={self.code!r} source={self.source!r}>"
+
+    def with_code(self, code: str, source: str) -> "LanguageResolution":
+        """Return a resolution to ``code`` from ``source`` for the same request."""
+        return LanguageResolution(
+            code, source, self._session, self._cookies, self._accept, self._cookie_name
+        )
+
+    @property
+    def candidates(self) -> List[str]:
+        """
+        Every acceptable language for the request, best first.
+
+        Order: the resolved language, then session, cookie, Accept-Language
+        (by quality) and LANGUAGE_CODE. Only configured languages are listed
+        and each appears once.
+        """
+        if self._candidates is None:
+            valid_codes = get_language_codes()
+            ranked: List[str] = []
+
+            def add(code):
+                if code and code in valid_codes and code not in ranked:
+                    ranked.append(code)
+
+            add(self.code)
+            if self._session is not None:
+                add(self._session.get(SESSION_KEY))
+            add(self._cookies.get(self._cookie_name))
+            for code in accept_language_codes(self._accept):
+                add(code)
+            add(settings.LANGUAGE_CODE)
+            self._candidates = ranked
+        return self._candidates
@@ -0,0 +1,282 @@
+"""
+Cache for the rendered ``{% language_selector %}`` widget.
+
+The selector's HTML depends only on the active language, the style, the
+``next_url`` argument and the URL and language configuration, so it is
+rendered once and reused from two tiers:
+
+1. a per-request memo, for pages that include the selector more than once
+2. a bounded, process-wide LRU shared by all requests
+
+When the selector links back to the current page (no ``next_url``), it is
+rendered with a placeholder in place of the page path, and each request
+only substitutes its own (URL-quoted) path. The "static" and "lazy" styles
+have no per-page part at all, so they can also be cached outside Django
+(see render_static_selector in the template tags).
+
+The "lazy" style renders only the current language and fetches the full
+list from the language_list view (see get_language_list) when the visitor
+interacts with it, which keeps very large LANGUAGES out of every page.
+
+Settings:
+    I18N_NOPREFIX_SELECTOR_CACHE_SIZE: rendered selectors kept per process
+        (default: 256; 0 disables the process tier)
+
+Custom selector templates must only depend on the documented template
+context (languages, current_language, ...), not on other context
+processors, since their output is shared between requests.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import quote_plus
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.template import Engine, Template
+from django.urls import get_script_prefix, get_urlconf
+from django.utils import translation
+from django.utils.autoreload import file_changed
+from django.utils.safestring import SafeString, mark_safe
+
+from .utils import get_language_metadata, get_language_names, get_switch_url_table
+
+DEFAULT_CACHE_SIZE = 256
+
+# Survives urlencode() and HTML escaping unchanged
+NEXT_PLACEHOLDER = "I18N_NOPREFIX_NEXT_URL"
+
+REQUEST_ATTR = "_i18n_noprefix_selectors"
+
+# Selector styles whose markup does not depend on the page
+STATIC_STYLE = "static"
+LAZY_STYLE = "lazy"
+PAGE_INDEPENDENT_STYLES = frozenset({STATIC_STYLE, LAZY_STYLE})
+
+# Settings whose change can alter a rendered selector
+DEPENDENT_SETTINGS = frozenset(
+    {
+        "LANGUAGES",
+        "LANGUAGES_BIDI",
+        "LANGUAGE_CODE",
+        "ROOT_URLCONF",
+        "TEMPLATES",
+        "I18N_NOPREFIX_QUERY_PARAMETER",
+        "I18N_NOPREFIX_SELECTOR_CACHE_SIZE",
+    }
+)
+
+
+class SelectorCache:
+    """Bounded LRU of rendered selectors, safe to share between threads."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"request_hits": 0, "hits": 0, "misses": 0}
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+            return html
+
+    def set(self, key: Hashable, html: str) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def record_request_hit(self) -> None:
+        with self._lock:
+            self._stats["request_hits"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counts per tier and the number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+
+_cache: Optional[SelectorCache] = None
+_cache_lock = threading.Lock()
+_version = 0
+
+
+def get_selector_cache() -> SelectorCache:
+    """Return the process-wide selector cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SelectorCache(
+                    getattr(
+                        settings,
+                        "I18N_NOPREFIX_SELECTOR_CACHE_SIZE",
+                        DEFAULT_CACHE_SIZE,
+                    )
+                )
+    return _cache
+
+
+_templates: Dict[Tuple[Engine, str, Optional[str]], Template] = {}
+
+
+def get_selector_template(engine: Engine, template_name: str) -> Template:
+    """
+    Return the compiled selector template, loading it once per engine
+    (a Django Engine or a Jinja2 Environment) and language, since loaders
+    like django_i18n_noprefix.loaders.Loader compile per language.
+    """
+    key = (engine, template_name, translation.get_language())
+    compiled = _templates.get(key)
+    if compiled is None:
+        compiled = _templates[key] = engine.get_template(template_name)
+    return compiled
+
+
+_language_lists: Dict[Tuple, Tuple[bytes, str]] = {}
+
+
+def get_language_list(language: str) -> Tuple[bytes, str]:
+    """
+    Return the JSON language list served to lazy selectors, and its ETag.
+
+    Names are translated into ``language``; each entry's ``url`` is the
+    switch URL, to which clients append ``?next=``. The body is built once
+    per language and URL configuration.
+    """
+    key = (language, get_urlconf(), get_script_prefix(), _version)
+    cached = _language_lists.get(key)
+    if cached is None:
+        table = get_switch_url_table()
+        metadata = get_language_metadata()
+        languages = [
+            {
+                "code": code,
+                "name": name,
+                "name_local": metadata[code].name_local,
+                "url": table[code],
+            }
+            for code, name in get_language_names(language).items()
+        ]
+        body = json.dumps(
+            {"language": language, "languages": languages}, ensure_ascii=False
+        ).encode()
+        etag = hashlib.sha256(body).hexdigest()[:16]
+        cached = _language_lists[key] = (body, etag)
+    return cached
+
+
+def clear_selector_cache() -> None:
+    """
+    Drop every rendered selector and compiled selector template, e.g. after
+    changing selector templates at runtime. Requests already in progress
+    keep their memoized copies.
+    """
+    global _cache, _version
+    with _cache_lock:
+        _version += 1
+        _cache = None
+        _templates.clear()
+        _language_lists.clear()
+
+
+def render_selector(
+    request: Optional[HttpRequest],
+    style: str,
+    next_url: Optional[str],
+    render: Callable[[Optional[str]], str],
+    engine: Optional[Engine] = None,
+) -> SafeString:
+    """
+    Return the selector HTML, calling ``render(switch_next)`` on a miss.
+
+    ``engine`` is the Django Engine or Jinja2 Environment that ``render``
+    uses. Each may override the selector templates differently, so their
+    renderings are cached separately.
+
+    ``switch_next`` is the ``next`` URL the switch links must carry: the
+    given ``next_url``, or the placeholder to substitute when the selector
+    links back to the current page.
+    """
+    switch_next, path = resolve_next(request, next_url, style)
+    key = (
+        translation.get_language(),
+        engine,
+        style,
+        switch_next,
+        get_urlconf(),
+        get_script_prefix(),
+        _version,
+    )
+
+    cache = get_selector_cache()
+    memo = request.__dict__.get(REQUEST_ATTR) if request is not None else None
+    if memo is not None and key in memo:
+        cache.record_request_hit()
+        return memo[key]
+
+    html = cache.get(key)
+    if html is None:
+        html = render(switch_next)
+        cache.set(key, html)
+    if path is not None:
+        html = html.replace(NEXT_PLACEHOLDER, quote_plus(path))
+    html = mark_safe(html)
+
+    if request is not None:
+        if memo is None:
+            memo = request.__dict__[REQUEST_ATTR] = {}
+        memo[key] = html
+    return html
+
+
+def resolve_next(
+    request: Optional[HttpRequest], next_url: Optional[str], style: str = ""
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the ``next`` URL to render switch links with, and the path to
+    substitute for the placeholder (None when there is nothing to replace).
+
+    The static and lazy styles never link back to the current page, so
+    their markup is the same on every page.
+    """
+    if next_url or request is None or style in PAGE_INDEPENDENT_STYLES:
+        return next_url, None
+    if getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None):
+        # One-shot links are the page URL itself, query string included,
+        # so they cannot share one rendering
+        return request.get_full_path(), None
+    return NEXT_PLACEHOLDER, request.path
+
+
+@receiver(setting_changed)
+def _clear_on_setting_changed(*, setting, **kwargs):
+    if setting in DEPENDENT_SETTINGS:
+        clear_selector_cache()
+
+
+@receiver(file_changed)
+def _clear_on_file_changed(*, file_path, **kwargs):
+    # The development server reloads templates without restarting
+    if file_path.suffix == ".html":
+        clear_selector_cache()
@@ -0,0 +1,288 @@
+"""
+Signals sent by django-i18n-noprefix.
+
+``language_changed`` is sent by activate_language() whenever a request
+switches to a different language. Ordinary receivers run inline, during the
+switch request:
+
+    from django.dispatch import receiver
+    from django_i18n_noprefix.signals import language_changed
+
+    @receiver(language_changed)
+    def on_language_changed(sender, request, language, previous, **kwargs):
+        ...
+
+Receivers that are slow or talk to other services (analytics, CRM sync,
+cache purges) can instead be registered with ``deferred_receiver``. They are
+called off the request thread by a small thread pool, once the response has
+been sent (so the new preference is saved), with a batch of LanguageChange
+records collected since their previous call:
+
+    from django_i18n_noprefix.signals import deferred_receiver
+
+    @deferred_receiver(batch_size=100)
+    def sync_crm(changes):
+        for change in changes:
+            ...
+
+Settings:
+    I18N_NOPREFIX_SIGNAL_WORKERS: threads running deferred receivers
+        (default: 2)
+    I18N_NOPREFIX_SIGNAL_MAX_PENDING: queued changes per receiver before new
+        ones are delivered inline instead (default: 10000)
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.dispatch import Signal, receiver
+
+logger = logging.getLogger(__name__)
+
+# Sent with request, language and previous (None if there was none)
+language_changed = Signal()
+
+# (dispatcher, change) pairs from the current request, queued once its
+# response is closed; None outside a request (e.g. in management commands)
+_request_changes = ContextVar("i18n_noprefix_request_changes", default=None)
+
+
+class LanguageChange(NamedTuple):
+    """A language switch, detached from its request."""
+
+    language: str
+    previous: Optional[str]
+    user_id: Optional[object]
+    session_key: Optional[str]
+    timestamp: float
+
+    @classmethod
+    def from_request(
+        cls, request, language: str, previous: Optional[str]
+    ) -> "LanguageChange":
+        user = getattr(request, "user", None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        session_key = getattr(getattr(request, "session", None), "session_key", None)
+        return cls(language, previous, user_id, session_key, time.time())
+
+
+class _DeferredReceiver:
+    """A deferred receiver with its own queue of undelivered changes."""
+
+    def __init__(self, func: Callable[[List[LanguageChange]], None], batch_size: int):
+        self.func = func
+        self.batch_size = batch_size
+        self.queue = deque()
+        self.scheduled = False
+        self.stats = {
+            "delivered": 0,
+            "batches": 0,
+            "failed": 0,
+            "inline": 0,
+            "max_pending": 0,
+        }
+
+
+class DeferredDispatcher:
+    """
+    Deliver language_changed to batched receivers on a thread pool.
+
+    Each receiver has its own queue and at most one batch in flight, so
+    changes reach it in order and a slow receiver does not hold up the
+    others. Changes that arrive while a batch runs are delivered together in
+    the next one. When a receiver falls max_pending changes behind, new
+    changes are delivered inline, slowing the producer instead of growing
+    without bound.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 10000):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._receivers: List[_DeferredReceiver] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connected = False
+
+    def connect(
+        self, func: Callable[[List[LanguageChange]], None], batch_size: int = 100
+    ) -> None:
+        """Register ``func`` to receive batches of LanguageChange records."""
+        with self._lock:
+            self._receivers.append(_DeferredReceiver(func, batch_size))
+            if not self._connected:
+                language_changed.connect(
+                    self.handle, weak=False, dispatch_uid=f"deferred-{id(self)}"
+                )
+                self._connected = True
+
+    def disconnect(self, func: Callable[[List[LanguageChange]], None]) -> None:
+        """Unregister ``func``; changes still queued for it are discarded."""
+        with self._lock:
+            self._receivers = [r for r in self._receivers if r.func != func]
+
+    def handle(self, sender, request, language, previous, **kwargs) -> None:
+        """
+        language_changed receiver: queue the change for every receiver.
+
+        During a request the change is held back until the response has been
+        sent, when the middleware and SessionMiddleware have saved the new
+        preference; receivers must not see the old stored language.
+        """
+        change = LanguageChange.from_request(request, language, previous)
+        pending = _request_changes.get()
+        if pending is not None:
+            pending.append((self, change))
+        else:
+            self.queue(change)
+
+    def queue(self, change: LanguageChange) -> None:
+        """Queue ``change`` for every receiver."""
+        inline = []
+        with self._lock:
+            for receiver in self._receivers:
+                if len(receiver.queue) >= self.max_pending:
+                    receiver.stats["inline"] += 1
+                    inline.append(receiver)
+                    continue
+                receiver.queue.append(change)
+                depth = len(receiver.queue)
+                if depth > receiver.stats["max_pending"]:
+                    receiver.stats["max_pending"] = depth
+                if not receiver.scheduled:
+                    receiver.scheduled = True
+                    self._get_executor().submit(self._drain, receiver)
+
+        for receiver in inline:
+            self._deliver(receiver, [change])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued change has been delivered.
+
+        Returns False if ``timeout`` seconds passed first.
+        """
+        with self._lock:
+            return self._idle.wait_for(
+                lambda: not any(r.scheduled for r in self._receivers), timeout
+            )
+
+    def shutdown(self) -> None:
+        """Deliver queued changes and stop the worker threads."""
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return backpressure metrics per receiver (keyed by qualified name).
+
+        ``pending`` is the current queue length and ``lag`` the age in
+        seconds of the oldest undelivered change.
+        """
+        now = time.time()
+        with self._lock:
+            result = {}
+            for receiver in self._receivers:
+                stats = dict(receiver.stats)
+                stats["pending"] = len(receiver.queue)
+                stats["lag"] = (
+                    now - receiver.queue[0].timestamp if receiver.queue else 0.0
+                )
+                name = f"{receiver.func.__module__}.{receiver.func.__qualname__}"
+                result[name] = stats
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Called with the lock held
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="i18n-noprefix-signals",
+            )
+        return self._executor
+
+    def _drain(self, receiver: _DeferredReceiver) -> None:
+        while True:
+            with self._lock:
+                size = min(len(receiver.queue), receiver.batch_size)
+                if not size:
+                    receiver.scheduled = False
+                    self._idle.notify_all()
+                    return
+                batch = [receiver.queue.popleft() for _ in range(size)]
+            self._deliver(receiver, batch)
+
+    def _deliver(self, receiver: _DeferredReceiver, batch: List[LanguageChange]):
+        try:
+            receiver.func(batch)
+        except Exception:
+            logger.exception(
+                "Deferred language_changed receiver %r failed", receiver.func
+            )
+            outcome = "failed"
+        else:
+            outcome = "delivered"
+        with self._lock:
+            receiver.stats[outcome] += len(batch)
+            receiver.stats["batches"] += 1
+
+
+_dispatcher: Optional[DeferredDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_deferred_dispatcher() -> DeferredDispatcher:
+    """Return the process-wide dispatcher used by deferred_receiver."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = DeferredDispatcher(
+                max_workers=getattr(settings, "I18N_NOPREFIX_SIGNAL_WORKERS", 2),
+                max_pending=getattr(
+                    settings, "I18N_NOPREFIX_SIGNAL_MAX_PENDING", 10000
+                ),
+            )
+        return _dispatcher
+
+
+def deferred_receiver(batch_size: int = 100):
+    """
+    Decorator registering a batched language_changed receiver that runs off
+    the request thread. The function is called with a list of LanguageChange.
+    """
+
+    def decorator(func):
+        get_deferred_dispatcher().connect(func, batch_size=batch_size)
+        return func
+
+    return decorator
+
+
+@receiver(request_started)
+def _start_request_changes(**kwargs):
+    _request_changes.set([])
+
+
+@receiver(request_finished)
+def _queue_request_changes(**kwargs):
+    pending = _request_changes.get()
+    _request_changes.set(None)
+    for dispatcher, change in pending or ():
+        dispatcher.queue(change)
+
+
+@atexit.register
+def _shutdown_on_exit():
+    if _dispatcher is not None:
+        _dispatcher.shutdown()
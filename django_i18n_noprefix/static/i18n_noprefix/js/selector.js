@@ -0,0 +1,94 @@
+/*
+ * django-i18n-noprefix: static and lazy language selectors.
+ *
+ * Static selector links carry no ?next= parameter so that their markup is
+ * the same on every page. When one is clicked, add the current page as
+ * ?next= so the switch returns here.
+ *
+ * Lazy selectors only render the current language. The first time one is
+ * used, fetch the language list from its data-i18n-noprefix-languages URL
+ * and build the links.
+ */
+(function () {
+  "use strict";
+
+  if (window.i18nNoprefixSelector) {
+    return;
+  }
+  window.i18nNoprefixSelector = true;
+
+  function closest(element, selector) {
+    return element && element.closest ? element.closest(selector) : null;
+  }
+
+  function buildList(selector, data) {
+    var list = document.createElement("ul");
+    list.className = "i18n-noprefix-selector__list";
+    list.setAttribute("role", "list");
+    data.languages.forEach(function (language) {
+      if (language.code === data.language) {
+        return;
+      }
+      var item = document.createElement("li");
+      item.className = "i18n-noprefix-selector__item";
+      var link = document.createElement("a");
+      link.className = "i18n-noprefix-selector__link";
+      link.href = language.url;
+      link.lang = language.code;
+      link.hreflang = language.code;
+      link.setAttribute("data-i18n-noprefix-switch", "");
+      link.textContent = language.name_local;
+      link.title = language.name;
+      item.appendChild(link);
+      list.appendChild(item);
+    });
+    selector.appendChild(list);
+    return list;
+  }
+
+  function load(selector) {
+    if (!selector.i18nNoprefixList) {
+      selector.i18nNoprefixList = fetch(
+        selector.getAttribute("data-i18n-noprefix-languages"),
+        { credentials: "same-origin" }
+      )
+        .then(function (response) {
+          return response.json();
+        })
+        .then(function (data) {
+          return buildList(selector, data);
+        });
+    }
+    return selector.i18nNoprefixList;
+  }
+
+  // Start loading as soon as the visitor shows interest
+  ["mouseover", "focusin", "touchstart"].forEach(function (type) {
+    document.addEventListener(type, function (event) {
+      var selector = closest(event.target, "[data-i18n-noprefix-languages]");
+      if (selector) {
+        load(selector);
+      }
+    }, { passive: true });
+  });
+
+  document.addEventListener("click", function (event) {
+    var toggle = closest(event.target, "[data-i18n-noprefix-languages] > button");
+    if (toggle) {
+      var expanded = toggle.getAttribute("aria-expanded") === "true";
+      toggle.setAttribute("aria-expanded", String(!expanded));
+      load(toggle.parentNode).then(function (list) {
+        list.hidden = expanded;
+      });
+      return;
+    }
+
+    var link = closest(event.target, "a[data-i18n-noprefix-switch]");
+    if (!link) {
+      return;
+    }
+    var url = new URL(link.href, window.location.href);
+    url.searchParams.set("next", window.location.pathname + window.location.search);
+    link.href = url.toString();
+  });
+})();
@@ -0,0 +1,344 @@
+"""
+Language preference stores for django-i18n-noprefix.
+
+A preference store is one place where a user's language choice is kept:
+the session, a cookie, the Django cache or a field on the user model.
+NoPrefixLocaleMiddleware reads the configured stores in order to detect the
+language, and when the language needs persisting it writes it back only to
+the stores whose value actually differs - at most once per response.
+
+Configure the stores (in priority order) with dotted paths:
+
+    I18N_NOPREFIX_PREFERENCE_STORES = [
+        "django_i18n_noprefix.stores.SessionPreferenceStore",
+        "django_i18n_noprefix.stores.CookiePreferenceStore",
+    ]
+"""
+
+from typing import Callable, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+from .resolution import SESSION_KEY, SOURCE_COOKIE, SOURCE_SESSION
+
+DEFAULT_PREFERENCE_STORES = [
+    "django_i18n_noprefix.stores.SessionPreferenceStore",
+    "django_i18n_noprefix.stores.CookiePreferenceStore",
+]
+
+
+class PreferenceStore:
+    """
+    Base class for language preference stores.
+
+    Subclasses set ``source`` (reported as LanguageResolution.source when the
+    store supplies the language) and implement read() and write().
+    """
+
+    source = ""
+
+    def read(self, request: HttpRequest) -> Optional[str]:
+        """Return the stored language code, or None if nothing is stored."""
+        raise NotImplementedError
+
+    def write(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        language: str,
+        explicit: bool,
+    ) -> None:
+        """
+        Persist ``language``.
+
+        Only called when the stored value differs from ``language``.
+        ``explicit`` is True when the user chose the language (e.g. via the
+        change_language view) rather than it being detected.
+        """
+        raise NotImplementedError
+
+    async def aprepare(self, request: HttpRequest) -> None:
+        """
+        Load whatever read() needs without blocking the event loop, so that
+        read() and write() do no I/O afterwards (used under ASGI).
+
+        The default runs read() in a thread; session, cache and user stores
+        cache what they loaded on the request.
+        """
+        await sync_to_async(self.read)(request)
+
+    async def awrite(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        language: str,
+        explicit: bool,
+    ) -> None:
+        """Async version of write(); the default runs write() in a thread."""
+        await sync_to_async(self.write)(request, response, language, explicit)
+
+    def deferred_key(self, request: HttpRequest) -> Optional[str]:
+        """
+        Return the key identifying this store's record for the request, when
+        writes can be deferred to the write-behind queue.
+
+        Writes queued under the same key are coalesced. The default (None)
+        means the store is always written inline.
+        """
+        return None
+
+    def deferred_write(
+        self, request: HttpRequest, language: str, explicit: bool
+    ) -> Optional[Callable[[], None]]:
+        """
+        Return a job that persists ``language`` without the request, or None
+        if nothing needs writing. Only called when deferred_key() is not None.
+        """
+        return None
+
+
+class SessionPreferenceStore(PreferenceStore):
+    """
+    Store the language under ``django_language`` in the session.
+
+    Never deferred to the write-behind queue: SessionMiddleware saves the
+    session with the response anyway, cookie-based backends (signed_cookies)
+    can only be written there, and a queued write would race other changes
+    the request makes to the session. The next request then reads the new
+    language in whichever process serves it.
+    """
+
+    source = SOURCE_SESSION
+
+    def read(self, request: HttpRequest) -> Optional[str]:
+        session = getattr(request, "session", None)
+        if session is None:
+            return None
+        return session.get(SESSION_KEY)
+
+    def write(self, request, response, language, explicit):
+        session = self.get_writable_session(request, explicit)
+        if session is not None:
+            session[SESSION_KEY] = language
+
+    async def aprepare(self, request):
+        session = getattr(request, "session", None)
+        if session is not None and hasattr(session, "aget"):
+            # Django 5.0+: loads the session without a thread
+            await session.aget(SESSION_KEY)
+        else:
+            await super().aprepare(request)
+
+    async def awrite(self, request, response, language, explicit):
+        session = self.get_writable_session(request, explicit)
+        if session is None:
+            return
+        if hasattr(session, "aset"):
+            await session.aset(SESSION_KEY, language)
+        else:
+            await sync_to_async(session.__setitem__)(SESSION_KEY, language)
+
+    def get_writable_session(self, request: HttpRequest, explicit: bool):
+        """Return the session to write to, or None to skip the write."""
+        session = getattr(request, "session", None)
+        if session is None:
+            return None
+        # Don't create a session just to hold a detected language. Dict-like
+        # sessions without session_key (e.g. in tests) count as existing.
+        if not explicit and not getattr(session, "session_key", True):
+            return None
+        return session
+
+
+class CookiePreferenceStore(PreferenceStore):
+    """Store the language in a cookie (I18N_NOPREFIX_COOKIE_* settings)."""
+
+    source = SOURCE_COOKIE
+
+    def __init__(self):
+        self.cookie_name = getattr(
+            settings, "I18N_NOPREFIX_COOKIE_NAME", settings.LANGUAGE_COOKIE_NAME
+        )
+        self.cookie_age = getattr(
+            settings,
+            "I18N_NOPREFIX_COOKIE_AGE",
+            settings.LANGUAGE_COOKIE_AGE or 365 * 24 * 60 * 60,  # 1 year
+        )
+        self.cookie_path = getattr(
+            settings, "I18N_NOPREFIX_COOKIE_PATH", settings.LANGUAGE_COOKIE_PATH
+        )
+        self.cookie_domain = getattr(
+            settings, "I18N_NOPREFIX_COOKIE_DOMAIN", settings.LANGUAGE_COOKIE_DOMAIN
+        )
+        self.cookie_secure = getattr(
+            settings,
+            "I18N_NOPREFIX_COOKIE_SECURE",
+            settings.LANGUAGE_COOKIE_SECURE or False,
+        )
+        self.cookie_httponly = getattr(
+            settings,
+            "I18N_NOPREFIX_COOKIE_HTTPONLY",
+            settings.LANGUAGE_COOKIE_HTTPONLY or False,
+        )
+        self.cookie_samesite = getattr(
+            settings,
+            "I18N_NOPREFIX_COOKIE_SAMESITE",
+            settings.LANGUAGE_COOKIE_SAMESITE or "Lax",
+        )
+
+        # Cookie attributes are identical for every language, so build them
+        # once instead of on each response that persists the language.
+        self.cookie_kwargs = {
+            "max_age": self.cookie_age,
+            "path": self.cookie_path,
+            "domain": self.cookie_domain,
+            "secure": self.cookie_secure,
+            "httponly": self.cookie_httponly,
+            "samesite": self.cookie_samesite,
+        }
+
+    def read(self, request: HttpRequest) -> Optional[str]:
+        return request.COOKIES.get(self.cookie_name)
+
+    def write(self, request, response, language, explicit):
+        response.set_cookie(key=self.cookie_name, value=language, **self.cookie_kwargs)
+
+    # Cookies involve no I/O
+    async def aprepare(self, request):
+        pass
+
+    async def awrite(self, request, response, language, explicit):
+        self.write(request, response, language, explicit)
+
+
+class CachePreferenceStore(PreferenceStore):
+    """
+    Store the language in a Django cache, keyed by user or session.
+
+    Settings:
+        I18N_NOPREFIX_CACHE_ALIAS: cache to use (default: 'default')
+        I18N_NOPREFIX_CACHE_TIMEOUT: entry lifetime in seconds (default: None,
+            i.e. never expire)
+
+    Anonymous visitors without a session have no key and are skipped.
+    """
+
+    source = "cache"
+    key_prefix = "i18n_noprefix:language"
+
+    def __init__(self):
+        self.cache_alias = getattr(settings, "I18N_NOPREFIX_CACHE_ALIAS", "default")
+        self.timeout = getattr(settings, "I18N_NOPREFIX_CACHE_TIMEOUT", None)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_cache_key(self, request: HttpRequest) -> Optional[str]:
+        """Return the cache key for the request's user or session."""
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"{self.key_prefix}:user:{user.pk}"
+        session_key = getattr(getattr(request, "session", None), "session_key", None)
+        if session_key:
+            return f"{self.key_prefix}:session:{session_key}"
+        return None
+
+    def read(self, request: HttpRequest) -> Optional[str]:
+        key = self.get_cache_key(request)
+        if not key:
+            return None
+        # Remember the value for the rest of the request, so comparing it
+        # before a write does not cost a second cache round trip
+        memo = getattr(request, "_i18n_noprefix_cache_read", None)
+        if memo is None or memo[0] != key:
+            memo = (key, self.cache.get(key))
+            request._i18n_noprefix_cache_read = memo
+        return memo[1]
+
+    def write(self, request, response, language, explicit):
+        key = self.get_cache_key(request)
+        if key:
+            self.cache.set(key, language, self.timeout)
+            request._i18n_noprefix_cache_read = (key, language)
+
+    async def awrite(self, request, response, language, explicit):
+        key = self.get_cache_key(request)
+        if key:
+            await self.cache.aset(key, language, self.timeout)
+            request._i18n_noprefix_cache_read = (key, language)
+
+    def deferred_key(self, request):
+        key = self.get_cache_key(request)
+        return f"{self.source}:{key}" if key else None
+
+    def deferred_write(self, request, language, explicit):
+        key = self.get_cache_key(request)
+        cache, timeout = self.cache, self.timeout
+        request._i18n_noprefix_cache_read = (key, language)
+        return lambda: cache.set(key, language, timeout)
+
+
+class UserPreferenceStore(PreferenceStore):
+    """
+    Store the language on the authenticated user model.
+
+    Settings:
+        I18N_NOPREFIX_USER_LANGUAGE_FIELD: model field name (default: 'language')
+
+    Only explicit choices are written; a detected language is not a profile
+    preference. Place NoPrefixLocaleMiddleware after AuthenticationMiddleware
+    so request.user is available when the language is detected.
+    """
+
+    source = "user"
+
+    def __init__(self):
+        self.field_name = getattr(
+            settings, "I18N_NOPREFIX_USER_LANGUAGE_FIELD", "language"
+        )
+
+    def get_user(self, request: HttpRequest):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
+
+    def read(self, request: HttpRequest) -> Optional[str]:
+        user = self.get_user(request)
+        if user is None:
+            return None
+        return getattr(user, self.field_name, None) or None
+
+    def write(self, request, response, language, explicit):
+        user = self.get_user(request)
+        if user is None or not explicit:
+            return
+        setattr(user, self.field_name, language)
+        user.save(update_fields=[self.field_name])
+
+    def deferred_key(self, request):
+        user = self.get_user(request)
+        return f"{self.source}:{user.pk}" if user is not None else None
+
+    def deferred_write(self, request, language, explicit):
+        if not explicit:
+            return None
+        user = request.user
+        # Keep request.user consistent for the rest of the request
+        setattr(user, self.field_name, language)
+        queryset = type(user)._default_manager.filter(pk=user.pk)
+        values = {self.field_name: language}
+        return lambda: queryset.update(**values)
+
+
+def get_preference_stores() -> Tuple[PreferenceStore, ...]:
+    """Instantiate the stores named in I18N_NOPREFIX_PREFERENCE_STORES."""
+    paths = getattr(
+        settings, "I18N_NOPREFIX_PREFERENCE_STORES", DEFAULT_PREFERENCE_STORES
+    )
+    return tuple(import_string(path)() for path in paths)
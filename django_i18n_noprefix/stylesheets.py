@@ -0,0 +1,166 @@
+"""
+Minified, precompressed selector stylesheets.
+
+The stylesheets in ``static/i18n_noprefix/css/`` are readable sources. The
+build_selector_stylesheets management command writes a minified,
+content-hashed copy of each, with ``.gz`` and (if the ``brotli`` package is
+installed) ``.br`` siblings, which whitenoise and nginx's ``gzip_static`` /
+``brotli_static`` serve to clients that accept them:
+
+    <I18N_NOPREFIX_STYLESHEET_ROOT>/i18n_noprefix/css/dist/vanilla.3f1c9a0b2d4e.min.css
+    <I18N_NOPREFIX_STYLESHEET_ROOT>/i18n_noprefix/css/dist/vanilla.3f1c9a0b2d4e.min.css.gz
+    <I18N_NOPREFIX_STYLESHEET_ROOT>/i18n_noprefix/css/dist/vanilla.3f1c9a0b2d4e.min.css.br
+
+along with a ``stylesheets.json`` manifest mapping styles to file names.
+Add the root to STATICFILES_DIRS, then ``{% selector_stylesheet 'vanilla' %}``
+links the built file for a framework. It links the readable source until
+the stylesheets are built.
+
+Settings:
+    I18N_NOPREFIX_STYLESHEET_ROOT: directory the stylesheets are written to
+"""
+
+import functools
+import gzip
+import os
+import re
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+
+from .build import read_manifest, write_hashed_file, write_manifest
+
+STYLESHEET_DIR = "i18n_noprefix/css/dist"
+MANIFEST_NAME = "stylesheets.json"
+
+SOURCE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "static", "i18n_noprefix", "css"
+)
+
+# Selector style -> source file, relative to static/i18n_noprefix/css
+STYLESHEETS = {
+    "vanilla": "vanilla.css",
+    "tailwind": "tailwind.css",
+    "bootstrap5": "bootstrap5.css",
+}
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_STRING_RE = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+_COLON_RE = re.compile(r":\s+")
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from ``css``.
+
+    String literals are left untouched. Spaces before ``:`` are kept, since
+    they are descendant combinators in selectors (``.a :focus``).
+    """
+    parts = _STRING_RE.split(_COMMENT_RE.sub("", css))
+    for index in range(0, len(parts), 2):
+        part = _WHITESPACE_RE.sub(" ", parts[index])
+        part = _PUNCTUATION_RE.sub(r"\1", part)
+        parts[index] = _COLON_RE.sub(":", part)
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def get_stylesheet_root() -> str:
+    """Return the configured stylesheet directory."""
+    root = getattr(settings, "I18N_NOPREFIX_STYLESHEET_ROOT", None)
+    if not root:
+        raise ImproperlyConfigured(
+            "Set I18N_NOPREFIX_STYLESHEET_ROOT to build the selector stylesheets."
+        )
+    return str(root)
+
+
+def compress(content: bytes) -> Dict[str, bytes]:
+    """
+    Return the precompressed variants of ``content`` by file suffix.
+
+    gzip output is reproducible (no timestamp), so rebuilding an unchanged
+    stylesheet writes identical files.
+    """
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        variants[".br"] = brotli.compress(content, mode=brotli.MODE_TEXT)
+    return variants
+
+
+def build_stylesheets(
+    root: str, styles: Optional[Iterable[str]] = None
+) -> Dict[str, str]:
+    """
+    Write the minified, compressed stylesheets under ``root`` and the
+    manifest, returning the built styles (style -> static path).
+
+    Styles that are not rebuilt keep their manifest entries.
+    """
+    directory = os.path.join(root, *STYLESHEET_DIR.split("/"))
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {}
+    for style in styles or STYLESHEETS:
+        source = os.path.join(SOURCE_DIR, get_source_name(style))
+        with open(source, encoding="utf-8") as fh:
+            content = minify_css(fh.read()).encode()
+        filename = write_hashed_file(directory, style, ".min.css", content, compress)
+        manifest[style] = f"{STYLESHEET_DIR}/{filename}"
+    write_manifest(os.path.join(directory, MANIFEST_NAME), manifest, merge=True)
+
+    get_stylesheet_manifest.cache_clear()
+    stylesheet_url.cache_clear()
+    return manifest
+
+
+def get_source_name(style: str) -> str:
+    """Return the source file name of ``style``."""
+    try:
+        return STYLESHEETS[style]
+    except KeyError:
+        raise ValueError(
+            f"Unknown selector stylesheet {style!r}; "
+            f"choose one of: {', '.join(STYLESHEETS)}"
+        ) from None
+
+
+@functools.lru_cache(maxsize=None)
+def get_stylesheet_manifest() -> Dict[str, str]:
+    """
+    Load the manifest written by build_selector_stylesheets (once per
+    process); empty if the stylesheets were not built.
+    """
+    root = getattr(settings, "I18N_NOPREFIX_STYLESHEET_ROOT", None)
+    if not root:
+        return {}
+    path = os.path.join(str(root), *STYLESHEET_DIR.split("/"), MANIFEST_NAME)
+    return read_manifest(path) or {}
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_url(style: str) -> str:
+    """
+    Return the static URL of ``style``'s built stylesheet, or of its
+    readable source if it was not built.
+    """
+    path = get_stylesheet_manifest().get(style)
+    if path is None:
+        path = f"i18n_noprefix/css/{get_source_name(style)}"
+    return static(path)
+
+
+@receiver(setting_changed)
+def _clear_stylesheet_manifest(*, setting, **kwargs):
+    if setting in ("I18N_NOPREFIX_STYLESHEET_ROOT", "STATIC_URL", "STORAGES"):
+        get_stylesheet_manifest.cache_clear()
+        stylesheet_url.cache_clear()
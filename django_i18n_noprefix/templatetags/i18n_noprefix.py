@@ -10,12 +10,35 @@ Use Django's tags for most i18n operations:
 Our tags focus on language switching functionality.
 """
 
+from urllib.parse import parse_qsl, quote_plus, urlsplit, urlunsplit
+
 from django import template
+from django.conf import settings
+from django.template import Context, Engine
+from django.template.library import parse_bits
 from django.urls import reverse
 from django.utils import translation
+from django.utils.html import format_html
 from django.utils.http import urlencode
 
-from ..utils import is_valid_language
+from ..assets import get_preloads, render_language_assets
+from ..catalogs import catalog_url, request_preload
+from ..fragments import record_fragment
+from ..selector import (
+    LAZY_STYLE,
+    PAGE_INDEPENDENT_STYLES,
+    STATIC_STYLE,
+    get_language_list,
+    get_selector_template,
+    render_selector,
+)
+from ..stylesheets import stylesheet_url
+from ..utils import (
+    get_language_metadata,
+    get_language_names,
+    get_switch_url_table,
+    is_valid_language,
+)
 
 register = template.Library()
 
@@ -33,6 +56,10 @@ def switch_language_url(context, lang_code, next_url=None):
     Returns:
         URL string for language switching
 
+    With I18N_NOPREFIX_QUERY_PARAMETER set, the URL is the target page
+    itself with the one-shot parameter (e.g. ``/about/?set_lang=ko``), so
+    switching costs a single request instead of a redirect.
+
     Example:
         {% switch_language_url 'ko' %}
         {% switch_language_url 'en' next_url='/about/' %}
@@ -40,21 +67,48 @@ def switch_language_url(context, lang_code, next_url=None):
     if not is_valid_language(lang_code):
         return "#"  # Return anchor for invalid language
 
-    base_url = reverse("django_i18n_noprefix:change_language", args=[lang_code])
+    query_parameter = getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None)
+    table = None if query_parameter else get_switch_url_table()
+    return join_switch_url(
+        lang_code, next_url, context.get("request"), table, query_parameter
+    )
+
+
+def join_switch_url(lang_code, next_url, request, table, query_parameter):
+    """
+    Build the switch link for a valid ``lang_code`` from the switch URL
+    table (see get_switch_url_table), using string joins only.
+    """
+    # One-shot mode: link straight to the page with ?set_lang=<code>
+    if query_parameter:
+        if not next_url:
+            next_url = request.get_full_path() if request else "/"
+        return set_query_parameter(next_url, query_parameter, lang_code)
+
+    base_url = table[lang_code]
 
     # If no next_url provided, use the current page
-    if not next_url:
-        request = context.get("request")
-        if request:
-            next_url = request.path
+    if not next_url and request:
+        next_url = request.path
 
     if next_url:
-        params = urlencode({"next": next_url})
-        return f"{base_url}?{params}"
+        return f"{base_url}?next={quote_plus(str(next_url))}"
 
     return base_url
 
 
+def set_query_parameter(url, name, value):
+    """Return ``url`` with query parameter ``name`` set to ``value``."""
+    parts = urlsplit(url)
+    query = [
+        (key, val)
+        for key, val in parse_qsl(parts.query, keep_blank_values=True)
+        if key != name
+    ]
+    query.append((name, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
 @register.filter
 def is_current_language(lang_code):
     """
@@ -74,62 +128,314 @@ def is_current_language(lang_code):
     return lang_code == translation.get_language()
 
 
-@register.simple_tag(takes_context=True)
-def language_selector(context, style="dropdown", next_url=None):
+SELECTOR_TEMPLATES = {
+    "dropdown": "i18n_noprefix/language_selector.html",
+    "list": "i18n_noprefix/language_selector_list.html",
+    "inline": "i18n_noprefix/language_selector_inline.html",
+    STATIC_STYLE: "i18n_noprefix/language_selector_static.html",
+    LAZY_STYLE: "i18n_noprefix/language_selector_lazy.html",
+}
+
+
+class LanguageSelectorNode(template.Node):
+    def __init__(self, args, kwargs, target_var):
+        self.args = args
+        self.kwargs = kwargs
+        self.target_var = target_var
+
+    def render(self, context):
+        args = [arg.resolve(context) for arg in self.args]
+        kwargs = {name: value.resolve(context) for name, value in self.kwargs.items()}
+        html = language_selector(context, *args, **kwargs)
+        if self.target_var is not None:
+            context[self.target_var] = html
+            return ""
+        return html
+
+
+@register.tag("language_selector")
+def do_language_selector(parser, token):
     """
     Render a language selector widget.
 
     Args:
-        context: Template context (automatic)
-        style: Widget style - 'dropdown', 'list', or 'inline' (default: 'dropdown')
+        style: Widget style - 'dropdown', 'list', 'inline', 'static' or
+            'lazy' (default: 'dropdown')
         next_url: URL to redirect to after language change (default: current page)
 
-    Returns:
-        Rendered language selector HTML
+    The 'static' style renders the same markup on every page: its links
+    carry no ``next`` (a small script adds the current page on click), so
+    it can be cached once per language, e.g. in ``{% cache %}``, a CDN or
+    an ESI fragment. The 'lazy' style goes further for long LANGUAGES
+    lists: it renders only the current language and loads the others from
+    the language_list view when opened.
+
+    The rendered HTML is cached per request and per process (see selector),
+    so including the selector on every page costs a dictionary lookup. On a
+    miss, the style template compiled at first use is rendered with a
+    minimal context instead of going through render_to_string.
 
     Example:
         {% language_selector %}
         {% language_selector style='list' %}
         {% language_selector style='inline' next_url='/dashboard/' %}
+        {% language_selector 'list' as selector %}
+        {% language_selector 'static' %}
+        {% language_selector 'lazy' %}
+    """
+    bits = token.split_contents()[1:]
+    target_var = None
+    if len(bits) >= 2 and bits[-2] == "as":
+        target_var = bits[-1]
+        bits = bits[:-2]
+    args, kwargs = parse_bits(
+        parser,
+        bits,
+        ["style", "next_url"],
+        None,
+        None,
+        ("dropdown", None),
+        [],
+        {},
+        False,
+        "language_selector",
+    )
+    return LanguageSelectorNode(args, kwargs, target_var)
+
+
+def language_selector(context, style="dropdown", next_url=None):
+    """
+    Return the language selector HTML for ``context``.
+
+    This is what ``{% language_selector %}`` renders; it can also be called
+    from Python with a dict-like context holding the request.
     """
-    from django.conf import settings
-    from django.template.loader import render_to_string
+    request = context.get("request")
+    engine = getattr(getattr(context, "template", None), "engine", None)
+    if engine is None:
+        engine = Engine.get_default()
 
+    def render(switch_next):
+        return render_language_selector(request, style, next_url, switch_next, engine)
+
+    return render_selector(request, style, next_url, render, engine)
+
+
+def render_static_selector(language):
+    """
+    Return the static selector HTML for ``language``.
+
+    The markup is the same on every page, so it can be prerendered (e.g. at
+    deploy time, one file per language) or cached once per language.
+
+    Example:
+        >>> html = render_static_selector("ko")
+    """
+    with translation.override(language):
+        return render_language_selector(None, STATIC_STYLE, None, None)
+
+
+def render_language_selector(request, style, next_url, switch_next, engine=None):
+    """Render the selector template, with switch links carrying ``switch_next``."""
+    # Select the appropriate template, compiled once per engine
+    template_name = SELECTOR_TEMPLATES.get(style, SELECTOR_TEMPLATES["dropdown"])
+    compiled = get_selector_template(engine or Engine.get_default(), template_name)
+
+    # The selector templates only use these variables, so skip the
+    # context processors a RequestContext would run
+    return compiled.render(
+        Context(get_selector_context(request, style, next_url, switch_next))
+    )
+
+
+def get_selector_context(request, style, next_url, switch_next):
+    """
+    Return the variables the selector templates use (shared by the Django
+    and Jinja2 templates).
+    """
     current_language = translation.get_language()
 
-    # Get language info for all available languages
+    # Look the switch URLs up once for all languages. Static selectors
+    # cannot link to the page itself, so they always use the switch view.
+    query_parameter = getattr(settings, "I18N_NOPREFIX_QUERY_PARAMETER", None)
+    link_request = request
+    if style in PAGE_INDEPENDENT_STYLES:
+        query_parameter = link_request = None
+    table = None if query_parameter else get_switch_url_table()
+
+    # Get language info for all available languages; the lazy selector
+    # only shows the current one and fetches the rest from languages_url
+    # Names come from the precomputed tables, already translated
+    metadata = get_language_metadata()
+    names = get_language_names(current_language)
     languages = []
-    for code, name in settings.LANGUAGES:
+    languages_url = None
+    codes = names
+    if style == LAZY_STYLE:
+        codes = [code for code in names if code == current_language]
+        languages_url = "{}?v={}".format(
+            reverse("django_i18n_noprefix:language_list", args=[current_language]),
+            get_language_list(current_language)[1],
+        )
+    for code in codes:
         languages.append(
             {
                 "code": code,
-                "name": name,
+                "name": names[code],
+                "name_local": metadata[code].name_local,
+                "bidi": metadata[code].bidi,
                 "is_current": code == current_language,
-                "switch_url": switch_language_url(code, next_url),
+                "switch_url": join_switch_url(
+                    code, switch_next, link_request, table, query_parameter
+                ),
             }
         )
 
-    # Get template based on style
-    template_map = {
-        "dropdown": "i18n_noprefix/language_selector.html",
-        "list": "i18n_noprefix/language_selector_list.html",
-        "inline": "i18n_noprefix/language_selector_inline.html",
-    }
-
-    # Select the appropriate template
-    template_name = template_map.get(style, template_map["dropdown"])
-
-    # Prepare context
-    template_context = {
+    return {
         "languages": languages,
         "current_language": current_language,
-        "current_language_name": dict(settings.LANGUAGES).get(current_language, ""),
+        "current_language_name": names.get(current_language, ""),
         "style": style,
         "next_url": next_url,
         "LANGUAGE_CODE": current_language,  # For compatibility
+        "languages_url": languages_url,
     }
 
-    # Render and return the template
-    return render_to_string(
-        template_name, template_context, request=context.get("request")
-    )
+
+@register.simple_tag
+def js_catalog_url(lang_code=None):
+    """
+    Return the URL of the prebuilt JavaScript catalog for a language.
+
+    Args:
+        lang_code: Language code (default: current language)
+
+    Returns:
+        Static URL of the content-hashed catalog file
+
+    Example:
+        {% js_catalog_url as catalog %}
+    """
+    return catalog_url(lang_code)
+
+
+@register.simple_tag(takes_context=True)
+def js_catalog(context, preload=False):
+    """
+    Render a script tag loading the prebuilt catalog for the current language.
+
+    Catalogs are written by the build_js_catalogs management command.
+
+    Args:
+        context: Template context (automatic)
+        preload: Also send a ``Link: rel=preload`` header for the catalog
+            (requires NoPrefixLocaleMiddleware and a request in the context)
+
+    Returns:
+        <script> tag HTML
+
+    Example:
+        {% js_catalog %}
+        {% js_catalog preload=True %}
+    """
+    url = catalog_url()
+    request = context.get("request")
+    if preload and request is not None:
+        request_preload(request, url)
+    return format_html('<script src="{}"></script>', url)
+
+
+@register.simple_tag(takes_context=True)
+def language_assets(context, lang_code=None, preload=False):
+    """
+    Render links to the fonts and stylesheets of the current language.
+
+    Assets are listed per language in I18N_NOPREFIX_LANGUAGE_ASSETS (see
+    django_i18n_noprefix.assets); other languages' assets are left out.
+
+    Args:
+        context: Template context (automatic)
+        lang_code: Language code (default: current language)
+        preload: Also send ``Link: rel=preload`` headers for preloaded
+            assets such as fonts (requires NoPrefixLocaleMiddleware and a
+            request in the context)
+
+    Returns:
+        <link> tags HTML
+
+    Example:
+        {% language_assets %}
+        {% language_assets preload=True %}
+    """
+    language = lang_code or translation.get_language() or settings.LANGUAGE_CODE
+    request = context.get("request")
+    if preload and request is not None:
+        for url, as_, crossorigin in get_preloads(language):
+            request_preload(request, url, as_, crossorigin)
+    return render_language_assets(language)
+
+
+@register.simple_tag
+def selector_stylesheet(framework="vanilla"):
+    """
+    Render a link to the selector stylesheet for a CSS framework.
+
+    Links the minified, content-hashed build written by the
+    build_selector_stylesheets command, whose .gz/.br siblings are served
+    by whitenoise or nginx; until it is built, the readable source.
+
+    Args:
+        framework: 'vanilla', 'tailwind' or 'bootstrap5'
+
+    Returns:
+        <link> tag HTML
+
+    Example:
+        {% selector_stylesheet 'bootstrap5' %}
+    """
+    return format_html('<link rel="stylesheet" href="{}">', stylesheet_url(framework))
+
+
+class I18nFragmentNode(template.Node):
+    def __init__(self, name, nodelist, tag):
+        self.name = name
+        self.nodelist = nodelist
+        self.tag = tag
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        tag = self.tag.resolve(context) if self.tag else "div"
+        html = format_html(
+            '<{} data-i18n-fragment="{}">{}</{}>',
+            tag,
+            name,
+            self.nodelist.render(context),
+            tag,
+        )
+        record_fragment(context.get("request"), name, html)
+        return html
+
+
+@register.tag
+def i18n_fragment(parser, token):
+    """
+    Mark a part of the page that can be re-rendered after a language switch.
+
+    The content is wrapped in an element with a ``data-i18n-fragment``
+    attribute. set_language_ajax can return the fragment re-rendered in the
+    new language for the client to swap in place (see fragments).
+
+    Example:
+        {% i18n_fragment "nav" %}...{% endi18n_fragment %}
+        {% i18n_fragment "menu" tag="ul" %}<li>...</li>{% endi18n_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) not in (2, 3) or (len(bits) == 3 and not bits[2].startswith("tag=")):
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name and an optional tag=\"element\""
+        )
+    name = parser.compile_filter(bits[1])
+    tag = parser.compile_filter(bits[2][len("tag=") :]) if len(bits) == 3 else None
+    nodelist = parser.parse(("endi18n_fragment",))
+    parser.delete_first_token()
+    return I18nFragmentNode(name, nodelist, tag)
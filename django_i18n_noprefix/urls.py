@@ -8,10 +8,22 @@ from . import views
 
 app_name = "django_i18n_noprefix"
 
+# Under ASGI, switch languages without leaving the event loop
+if views.use_async_views():
+    change_language = views.achange_language
+    set_language_ajax = views.aset_language_ajax
+else:
+    change_language = views.change_language
+    set_language_ajax = views.set_language_ajax
+
 urlpatterns = [
     # Language change URLs
+    path("set-language/<str:lang_code>/", change_language, name="change_language"),
     path(
-        "set-language/<str:lang_code>/", views.change_language, name="change_language"
+        "set-language-inline/<str:lang_code>/",
+        views.change_language_inline,
+        name="change_language_inline",
     ),
-    path("set-language-ajax/", views.set_language_ajax, name="set_language_ajax"),
+    path("set-language-ajax/", set_language_ajax, name="set_language_ajax"),
+    path("languages/<str:lang_code>/", views.language_list, name="language_list"),
 ]
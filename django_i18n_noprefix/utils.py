@@ -8,10 +8,19 @@ Most i18n functionality should use Django's built-in functions directly:
 - Use `translation.get_language_info()` for language names
 """
 
+import functools
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpRequest
+from django.urls import get_script_prefix, get_urlconf, reverse
 from django.utils import translation
 
+from .signals import language_changed
+
 
 def activate_language(request: HttpRequest, lang_code: str) -> bool:
     """
@@ -19,7 +28,9 @@ def activate_language(request: HttpRequest, lang_code: str) -> bool:
 
     This is a convenience function to use in views when you need to
     change the language programmatically. It combines Django's
-    translation.activate() with request attribute setting.
+    translation.activate() with request attribute setting, and sends
+    the language_changed signal when the language differs from the one
+    the request had.
 
     Args:
         request: The HTTP request object
@@ -33,18 +44,67 @@ def activate_language(request: HttpRequest, lang_code: str) -> bool:
         True
     """
     if is_valid_language(lang_code):
+        previous = getattr(request, "LANGUAGE_CODE", None)
         translation.activate(lang_code)
         request.LANGUAGE_CODE = lang_code
-        request._language_was_set = True  # Flag for middleware to save cookie
+        request._language_was_set = True  # Flag for middleware to persist it
 
-        # Save to session if available
-        if hasattr(request, "session"):
+        # NoPrefixLocaleMiddleware writes the preference stores once the
+        # response is ready; without it, save to the session here.
+        if not hasattr(request, "language_resolution") and hasattr(request, "session"):
             request.session["django_language"] = lang_code
 
+        if lang_code != previous:
+            language_changed.send(
+                sender=request.__class__,
+                request=request,
+                language=lang_code,
+                previous=previous,
+            )
+
         return True
     return False
 
 
+async def aactivate_language(request: HttpRequest, lang_code: str) -> bool:
+    """
+    Async version of activate_language() for async views.
+
+    The session fallback uses the session's async API (Django 5.0+), and
+    async language_changed receivers are awaited rather than run in a
+    thread.
+
+    Example:
+        >>> await aactivate_language(request, 'ko')
+        True
+    """
+    if not is_valid_language(lang_code):
+        return False
+
+    previous = getattr(request, "LANGUAGE_CODE", None)
+    translation.activate(lang_code)
+    request.LANGUAGE_CODE = lang_code
+    request._language_was_set = True
+
+    if not hasattr(request, "language_resolution") and hasattr(request, "session"):
+        session = request.session
+        if hasattr(session, "aset"):
+            await session.aset("django_language", lang_code)
+        else:
+            await sync_to_async(session.__setitem__)("django_language", lang_code)
+
+    if lang_code != previous:
+        kwargs = {"request": request, "language": lang_code, "previous": previous}
+        if hasattr(language_changed, "asend"):
+            await language_changed.asend(sender=request.__class__, **kwargs)
+        else:
+            await sync_to_async(language_changed.send)(
+                sender=request.__class__, **kwargs
+            )
+
+    return True
+
+
 def is_valid_language(lang_code: str) -> bool:
     """
     Check if a language code is valid (exists in LANGUAGES setting).
@@ -61,5 +121,108 @@ def is_valid_language(lang_code: str) -> bool:
         >>> is_valid_language('invalid')
         False
     """
-    available_languages = [lang[0] for lang in settings.LANGUAGES]
-    return lang_code in available_languages
+    return lang_code in get_language_codes()
+
+
+@functools.lru_cache(maxsize=None)
+def get_language_codes() -> FrozenSet[str]:
+    """
+    Return the configured language codes as a frozenset.
+
+    The set is built once per process and rebuilt when the LANGUAGES
+    setting changes, so membership checks on the request path do not
+    allocate a temporary list.
+    """
+    return frozenset(code for code, _name in settings.LANGUAGES)
+
+
+class LanguageMetadata(NamedTuple):
+    """Display data of a configured language."""
+
+    code: str
+    name: str  # Configured name, untranslated
+    name_local: str  # Name in the language itself
+    bidi: bool
+
+
+@functools.lru_cache(maxsize=None)
+def get_language_metadata() -> Dict[str, LanguageMetadata]:
+    """
+    Return the display data of every configured language, in LANGUAGES order.
+
+    Built once per process (and when LANGUAGES changes), so templates do not
+    call get_language_info() per language on every render. Languages
+    Django does not know use their configured name as native name.
+    """
+    metadata = {}
+    with translation.override(None):
+        for code, name in settings.LANGUAGES:
+            name = str(name)
+            try:
+                info = translation.get_language_info(code)
+            except KeyError:
+                info = {
+                    "name_local": name,
+                    "bidi": code.split("-")[0] in settings.LANGUAGES_BIDI,
+                }
+            metadata[code] = LanguageMetadata(
+                code, name, info["name_local"], info["bidi"]
+            )
+    return metadata
+
+
+_language_names: Dict[str, Dict[str, str]] = {}
+
+
+def get_language_names(language: str) -> Dict[str, str]:
+    """
+    Return the configured language names translated into ``language``.
+
+    The (usually lazy) names of LANGUAGES are evaluated the first time a
+    language asks for them, then reused until LANGUAGES changes.
+    """
+    names = _language_names.get(language)
+    if names is None:
+        with translation.override(language):
+            names = {code: str(name) for code, name in settings.LANGUAGES}
+        _language_names[language] = names
+    return names
+
+
+_switch_url_tables: Dict[Tuple[Optional[str], str], Dict[str, str]] = {}
+
+
+def get_switch_url_table() -> Dict[str, str]:
+    """
+    Return the change_language URL of every configured language.
+
+    reverse() walks the URL resolver on every call, so the table is built
+    once per URLconf and script prefix (both can vary per request) and
+    reused until LANGUAGES or ROOT_URLCONF changes.
+    """
+    key = (get_urlconf(), get_script_prefix())
+    table = _switch_url_tables.get(key)
+    if table is None:
+        table = {
+            code: reverse("django_i18n_noprefix:change_language", args=[code])
+            for code in get_language_codes()
+        }
+        _switch_url_tables[key] = table
+    return table
+
+
+def clear_switch_url_tables() -> None:
+    """Drop the switch URL tables, e.g. after editing URL patterns at runtime."""
+    _switch_url_tables.clear()
+
+
+@receiver(setting_changed)
+def _clear_language_caches(*, setting, **kwargs):
+    """Drop cached language data when LANGUAGES is overridden (e.g. in tests)."""
+    if setting == "LANGUAGES":
+        get_language_codes.cache_clear()
+    if setting in ("LANGUAGES", "LANGUAGES_BIDI"):
+        get_language_metadata.cache_clear()
+        _language_names.clear()
+    if setting in ("LANGUAGES", "ROOT_URLCONF"):
+        clear_switch_url_tables()
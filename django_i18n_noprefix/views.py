@@ -2,15 +2,43 @@
 Views for django-i18n-noprefix.
 """
 
+import copy
+import functools
 import json
+import logging
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.base import BaseHandler
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    QueryDict,
+)
 from django.shortcuts import redirect
+from django.urls import Resolver404, ResolverMatch, get_script_prefix, resolve
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+)
 from django.views.decorators.cache import never_cache
 from django.views.decorators.http import require_http_methods, require_POST
 
-from .utils import activate_language, is_valid_language
+from .fragments import start_capture, stop_capture
+from .selector import get_language_list
+from .utils import aactivate_language, activate_language, is_valid_language
+
+logger = logging.getLogger(__name__)
 
 
 @never_cache
@@ -48,41 +76,46 @@ def change_language(request: HttpRequest, lang_code: str) -> HttpResponse:
     # Redirect to the next URL
     response = redirect(next_url)
 
-    # Save language to cookie (session will be saved by activate_language)
-    response.set_cookie(
-        key=settings.LANGUAGE_COOKIE_NAME,
-        value=lang_code,
-        max_age=(
-            settings.LANGUAGE_COOKIE_AGE
-            if hasattr(settings, "LANGUAGE_COOKIE_AGE")
-            else 365 * 24 * 60 * 60
-        ),
-        path=(
-            settings.LANGUAGE_COOKIE_PATH
-            if hasattr(settings, "LANGUAGE_COOKIE_PATH")
-            else "/"
-        ),
-        domain=(
-            settings.LANGUAGE_COOKIE_DOMAIN
-            if hasattr(settings, "LANGUAGE_COOKIE_DOMAIN")
-            else None
-        ),
-        secure=(
-            settings.LANGUAGE_COOKIE_SECURE
-            if hasattr(settings, "LANGUAGE_COOKIE_SECURE")
-            else False
-        ),
-        httponly=(
-            settings.LANGUAGE_COOKIE_HTTPONLY
-            if hasattr(settings, "LANGUAGE_COOKIE_HTTPONLY")
-            else False
-        ),
-        samesite=(
-            settings.LANGUAGE_COOKIE_SAMESITE
-            if hasattr(settings, "LANGUAGE_COOKIE_SAMESITE")
-            else "Lax"
-        ),
-    )
+    # NoPrefixLocaleMiddleware persists the new language once, on the way
+    # out. Without it, save the cookie here (activate_language handles the
+    # session in that case).
+    if not hasattr(request, "language_resolution"):
+        set_language_cookie(response, lang_code)
+
+    return response
+
+
+@never_cache
+@require_http_methods(["GET", "HEAD"])
+def change_language_inline(request: HttpRequest, lang_code: str) -> HttpResponse:
+    """
+    Change the language and render the next page in the same response.
+
+    Instead of redirecting to the next URL like change_language, this view
+    resolves it and calls its view directly, saving a round trip. The
+    browser keeps showing the switch URL, so the response carries a
+    Content-Location header naming the page actually served. Only views
+    listed in I18N_NOPREFIX_INLINE_VIEWS are served this way; for any other
+    next URL (or when the next view raises Http404 or PermissionDenied) it
+    falls back to a redirect.
+
+    Example URLs:
+        /i18n/set-language-inline/ko/?next=/about/
+    """
+    if not is_valid_language(lang_code):
+        return redirect(get_next_url(request))
+
+    activate_language(request, lang_code)
+
+    next_url = get_next_url(request)
+    response = dispatch_internally(request, next_url)
+    if response is None:
+        response = redirect(next_url)
+    else:
+        response["Content-Location"] = next_url
+
+    if not hasattr(request, "language_resolution"):
+        set_language_cookie(response, lang_code)
 
     return response
 
@@ -101,27 +134,21 @@ def set_language_ajax(request: HttpRequest) -> JsonResponse:
     Returns:
         JsonResponse with success status and redirect URL
 
+    With a 'fragments' list, the response also carries the named
+    ``{% i18n_fragment %}`` blocks of the next page, rendered in the new
+    language, under 'fragments' (fragments the page did not render are
+    left out).
+
     Example:
         POST /i18n/set-language-ajax/
         Content-Type: application/json
-        {"language": "ko", "next": "/about/"}
+        {"language": "ko", "next": "/about/", "fragments": ["nav", "main"]}
     """
     try:
-        # Parse JSON data
-        data = json.loads(request.body)
-        lang_code = data.get("language")
-
-        if not lang_code:
-            return JsonResponse(
-                {"success": False, "error": "No language specified"}, status=400
-            )
-
-        # Validate language code
-        if not is_valid_language(lang_code):
-            return JsonResponse(
-                {"success": False, "error": f"Invalid language code: {lang_code}"},
-                status=400,
-            )
+        data, error = parse_language_payload(request)
+        if error is not None:
+            return error
+        lang_code = data["language"]
 
         # Activate the language
         activate_language(request, lang_code)
@@ -131,9 +158,14 @@ def set_language_ajax(request: HttpRequest) -> JsonResponse:
 
         # Return success response
         # The middleware will handle saving to session/cookie
-        return JsonResponse(
-            {"success": True, "language": lang_code, "redirect": next_url}
-        )
+        result = {"success": True, "language": lang_code, "redirect": next_url}
+
+        # Re-render only the requested fragments of the next page
+        fragments = data.get("fragments")
+        if fragments and is_safe_url(next_url, request):
+            result["fragments"] = render_fragments(request, next_url, fragments)
+
+        return JsonResponse(result)
 
     except json.JSONDecodeError:
         return JsonResponse(
@@ -143,6 +175,264 @@ def set_language_ajax(request: HttpRequest) -> JsonResponse:
         return JsonResponse({"success": False, "error": str(e)}, status=500)
 
 
+@require_http_methods(["GET", "HEAD"])
+def language_list(request: HttpRequest, lang_code: str) -> HttpResponse:
+    """
+    Return the configured languages as JSON, with names in ``lang_code``.
+
+    Used by the lazy language selector, which only renders the current
+    language and fetches the rest on interaction. The response carries an
+    ETag; requested with the matching ``?v=<etag>`` (as the selector does)
+    it is cacheable for a year, otherwise clients revalidate.
+
+    Example URLs:
+        /i18n/languages/ko/?v=3f1c9a0b2d4e5f60
+
+    Response:
+        {"language": "ko", "languages": [
+            {"code": "en", "name": "영어", "name_local": "English",
+             "url": "/i18n/set-language/en/"}, ...]}
+    """
+    if not is_valid_language(lang_code):
+        raise Http404("Unknown language")
+
+    body, etag = get_language_list(lang_code)
+    quoted_etag = f'"{etag}"'
+    response = get_conditional_response(request, etag=quoted_etag)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = quoted_etag
+    response["Content-Language"] = lang_code
+    if request.GET.get("v") == etag:
+        # Versioned URLs change whenever the list does
+        patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+async def achange_language(request: HttpRequest, lang_code: str) -> HttpResponse:
+    """
+    Async version of change_language, for ASGI deployments.
+
+    The session is written with its async API (Django 5.0+) and the view
+    never blocks the event loop. See use_async_views() for when the bundled
+    URLconf routes to it.
+    """
+    if request.method not in ("GET", "POST"):
+        return HttpResponseNotAllowed(["GET", "POST"])
+
+    if is_valid_language(lang_code):
+        await aactivate_language(request, lang_code)
+    response = redirect(get_next_url(request))
+    if is_valid_language(lang_code) and not hasattr(request, "language_resolution"):
+        set_language_cookie(response, lang_code)
+
+    add_never_cache_headers(response)
+    return response
+
+
+async def aset_language_ajax(request: HttpRequest) -> HttpResponse:
+    """Async version of set_language_ajax, for ASGI deployments."""
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    try:
+        data, error = parse_language_payload(request)
+        if error is None:
+            lang_code = data["language"]
+            await aactivate_language(request, lang_code)
+
+            next_url = data.get("next") or get_next_url(request)
+            result = {"success": True, "language": lang_code, "redirect": next_url}
+
+            # Rendering templates is synchronous
+            fragments = data.get("fragments")
+            if fragments and is_safe_url(next_url, request):
+                result["fragments"] = await sync_to_async(render_fragments)(
+                    request, next_url, fragments
+                )
+            response = JsonResponse(result)
+        else:
+            response = error
+
+    except json.JSONDecodeError:
+        response = JsonResponse(
+            {"success": False, "error": "Invalid JSON data"}, status=400
+        )
+    except Exception as e:
+        response = JsonResponse({"success": False, "error": str(e)}, status=500)
+
+    add_never_cache_headers(response)
+    return response
+
+
+def parse_language_payload(
+    request: HttpRequest,
+) -> Tuple[Dict, Optional[JsonResponse]]:
+    """
+    Parse the JSON body of an AJAX language switch.
+
+    Returns the data and, if the language is missing or invalid, the error
+    response to send instead. Raises json.JSONDecodeError for bad JSON.
+    """
+    data = json.loads(request.body)
+    lang_code = data.get("language")
+
+    if not lang_code:
+        return data, JsonResponse(
+            {"success": False, "error": "No language specified"}, status=400
+        )
+
+    # Validate language code
+    if not is_valid_language(lang_code):
+        return data, JsonResponse(
+            {"success": False, "error": f"Invalid language code: {lang_code}"},
+            status=400,
+        )
+
+    return data, None
+
+
+def use_async_views() -> bool:
+    """
+    Return True if the bundled URLconf should route to the async views.
+
+    Controlled by I18N_NOPREFIX_ASYNC_VIEWS (True/False). When unset, the
+    async views are used if the process runs Django's ASGI handler and not
+    the WSGI one, since under WSGI every async view costs a thread hop.
+    """
+    setting = getattr(settings, "I18N_NOPREFIX_ASYNC_VIEWS", None)
+    if setting is not None:
+        return bool(setting)
+    return (
+        "django.core.handlers.asgi" in sys.modules
+        and "django.core.handlers.wsgi" not in sys.modules
+    )
+
+
+_SWITCH_VIEWS = (
+    change_language,
+    change_language_inline,
+    set_language_ajax,
+    achange_language,
+    aset_language_ajax,
+)
+
+
+def is_inline_view(match: ResolverMatch) -> bool:
+    """
+    Return True if the resolved view may be rendered inside a language
+    switch request.
+
+    I18N_NOPREFIX_INLINE_VIEWS lists URL names (``"about"``,
+    ``"blog:post"``) or dotted view paths (``"pages.views.about"``). The
+    middleware chain only runs for the switch URL, so middleware that gates
+    access by path in ``__call__`` never sees the next page: list only views
+    that no such middleware protects.
+    """
+    allowed = getattr(settings, "I18N_NOPREFIX_INLINE_VIEWS", ())
+    return match.view_name in allowed or match._func_path in allowed
+
+
+def dispatch_internally(request: HttpRequest, url: str) -> Optional[HttpResponse]:
+    """
+    Call the view for ``url`` with a copy of ``request`` re-targeted at it,
+    as a GET.
+
+    The view middleware (``process_view``, e.g. LoginRequiredMiddleware)
+    runs first, as it would for a request to ``url``. Returns the (rendered)
+    response, or None if ``url`` is on another host, does not resolve, is a
+    language switch view or not an inline view (see is_inline_view()), a
+    view middleware answered instead of the view, or the view raised Http404
+    or PermissionDenied; callers then redirect, so the browser requests the
+    page through the full middleware chain.
+    """
+    parts = urlsplit(url)
+    if parts.netloc:
+        return None
+    # url is a full path; resolve() wants it without the script prefix
+    script_prefix = get_script_prefix()
+    path_info = parts.path
+    if path_info.startswith(script_prefix):
+        path_info = "/" + path_info[len(script_prefix) :]
+    try:
+        match = resolve(path_info, getattr(request, "urlconf", None))
+    except Resolver404:
+        return None
+    if match.func in _SWITCH_VIEWS or not is_inline_view(match):
+        return None
+
+    # Present a copy as if it had been made for the URL, so the middleware
+    # around the switch still sees the request it was given. The session,
+    # user and fragment capture are shared with the original.
+    page_request = copy.copy(request)
+    page_request.META = {**request.META, "REQUEST_METHOD": "GET"}
+    page_request.method = "GET"
+    page_request.path = parts.path
+    page_request.path_info = page_request.META["PATH_INFO"] = path_info
+    page_request.META["QUERY_STRING"] = parts.query
+    page_request.GET = QueryDict(parts.query)
+    page_request.resolver_match = match
+    try:
+        for process_view in get_view_middleware():
+            answer = process_view(page_request, match.func, match.args, match.kwargs)
+            if answer is not None:
+                return None
+        if iscoroutinefunction(match.func):
+            response = async_to_sync(match.func)(
+                page_request, *match.args, **match.kwargs
+            )
+        else:
+            response = match.func(page_request, *match.args, **match.kwargs)
+        if hasattr(response, "render") and callable(response.render):
+            response = response.render()
+    except (Http404, PermissionDenied):
+        return None
+    return response
+
+
+@functools.lru_cache(maxsize=None)
+def get_view_middleware() -> Tuple[Callable, ...]:
+    """
+    Return the ``process_view`` hooks of the MIDDLEWARE in order, from a
+    handler loaded once per process.
+    """
+    handler = BaseHandler()
+    handler.load_middleware()
+    return tuple(handler._view_middleware)
+
+
+@receiver(setting_changed)
+def _clear_view_middleware(*, setting, **kwargs):
+    if setting == "MIDDLEWARE":
+        get_view_middleware.cache_clear()
+
+
+def render_fragments(
+    request: HttpRequest, url: str, names: List[str]
+) -> Dict[str, str]:
+    """
+    Render the page at ``url`` and return its named i18n fragments.
+
+    Returns none unless the page is dispatched internally (see
+    dispatch_internally()) and its view succeeds. Other exceptions from the
+    view are logged rather than raised, so they never fail the language
+    switch or reach the client.
+    """
+    start_capture(request)
+    try:
+        response = dispatch_internally(request, url)
+    except Exception:
+        logger.exception("Rendering fragments of %s failed", url)
+        response = None
+    finally:
+        fragments = stop_capture(request, names)
+    if response is None or response.status_code != 200:
+        return {}
+    return fragments
+
+
 def get_next_url(request: HttpRequest, default: str = "/") -> str:
     """
     Get the next URL to redirect to after language change.
@@ -221,3 +511,41 @@ def is_safe_url(url: str, request: HttpRequest) -> bool:
         pass
 
     return False
+
+
+def set_language_cookie(response: HttpResponse, lang_code: str) -> None:
+    """Set the language cookie from Django's LANGUAGE_COOKIE_* settings."""
+    response.set_cookie(
+        key=settings.LANGUAGE_COOKIE_NAME,
+        value=lang_code,
+        max_age=(
+            settings.LANGUAGE_COOKIE_AGE
+            if hasattr(settings, "LANGUAGE_COOKIE_AGE")
+            else 365 * 24 * 60 * 60
+        ),
+        path=(
+            settings.LANGUAGE_COOKIE_PATH
+            if hasattr(settings, "LANGUAGE_COOKIE_PATH")
+            else "/"
+        ),
+        domain=(
+            settings.LANGUAGE_COOKIE_DOMAIN
+            if hasattr(settings, "LANGUAGE_COOKIE_DOMAIN")
+            else None
+        ),
+        secure=(
+            settings.LANGUAGE_COOKIE_SECURE
+            if hasattr(settings, "LANGUAGE_COOKIE_SECURE")
+            else False
+        ),
+        httponly=(
+            settings.LANGUAGE_COOKIE_HTTPONLY
+            if hasattr(settings, "LANGUAGE_COOKIE_HTTPONLY")
+            else False
+        ),
+        samesite=(
+            settings.LANGUAGE_COOKIE_SAMESITE
+            if hasattr(settings, "LANGUAGE_COOKIE_SAMESITE")
+            else "Lax"
+        ),
+    )
@@ -0,0 +1,197 @@
+"""
+Write-behind persistence for language preferences.
+
+With ``I18N_NOPREFIX_WRITE_BEHIND = True`` the middleware still updates the
+request, the language cookie and the session immediately, but the other
+durable writes (cache, user profile) are handed to a bounded in-process
+queue and performed by a background thread, off the request path.
+
+Pending writes are coalesced per user/session: if someone switches language
+twice before the worker gets to it, only the last choice is written. Stores
+consult the pending writes when reading, so later requests served by the
+same process see the new language right away. The queue is flushed when the
+process exits.
+
+Settings:
+    I18N_NOPREFIX_WRITE_BEHIND: enable write-behind (default: False)
+    I18N_NOPREFIX_WRITE_BEHIND_MAX_SIZE: pending writes before new ones are
+        written inline instead (default: 1000)
+"""
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    A bounded queue of coalesced preference writes drained by a worker thread.
+
+    Each write is identified by a key (e.g. ``"user:<pk>"``); submitting
+    a key that is already pending replaces the queued write. When the queue
+    is full, new keys are written inline so no choice is ever dropped.
+    """
+
+    def __init__(self, max_size: int = 1000, autostart: bool = True):
+        self.max_size = max_size
+        self.autostart = autostart
+        self._pending = OrderedDict()  # key -> (value, job)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+            "inline": 0,
+            "max_depth": 0,
+        }
+
+    def submit(self, key: str, value: str, job: Callable[[], None]) -> None:
+        """Queue ``job`` (which persists ``value``) under ``key``."""
+        with self._lock:
+            self._stats["submitted"] += 1
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+                self._pending[key] = (value, job)
+                return
+            if self._closed or len(self._pending) >= self.max_size:
+                self._stats["inline"] += 1
+                run_inline = True
+            else:
+                run_inline = False
+                self._pending[key] = (value, job)
+                depth = len(self._pending)
+                if depth > self._stats["max_depth"]:
+                    self._stats["max_depth"] = depth
+                self._changed.notify_all()
+                if self.autostart:
+                    self._ensure_worker()
+
+        if run_inline:
+            self._run(job)
+
+    def pending(self, key: str) -> Optional[str]:
+        """Return the value waiting to be written under ``key``, if any."""
+        entry = self._pending.get(key)
+        return entry[0] if entry is not None else None
+
+    def flush(self) -> None:
+        """
+        Write everything pending now, in the calling thread, and wait for a
+        write the worker has already started.
+        """
+        while True:
+            with self._lock:
+                if self._pending:
+                    _key, (_value, job) = self._pending.popitem(last=False)
+                    self._in_flight += 1
+                else:
+                    while self._in_flight:
+                        self._changed.wait()
+                    return
+            self._run(job, in_flight=True)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the worker thread."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        self.flush()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters and the current queue depth."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["depth"] = len(self._pending)
+            stats["in_flight"] = self._in_flight
+        return stats
+
+    def _ensure_worker(self) -> None:
+        # Called with the lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._work, name="i18n-noprefix-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._changed.wait()
+                if not self._pending:
+                    return
+                _key, (_value, job) = self._pending.popitem(last=False)
+                self._in_flight += 1
+            self._run(job, in_flight=True)
+            close_old_connections()
+
+    def _run(self, job: Callable[[], None], in_flight: bool = False) -> None:
+        try:
+            job()
+        except Exception:
+            logger.exception("Deferred language preference write failed")
+            outcome = "failed"
+        else:
+            outcome = "written"
+        with self._lock:
+            self._stats[outcome] += 1
+            if in_flight:
+                self._in_flight -= 1
+            self._changed.notify_all()
+
+
+_queue: Optional[WriteBehindQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> Optional[WriteBehindQueue]:
+    """Return the process-wide queue, or None when write-behind is disabled."""
+    global _queue
+    if not getattr(settings, "I18N_NOPREFIX_WRITE_BEHIND", False):
+        return None
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteBehindQueue(
+                max_size=getattr(settings, "I18N_NOPREFIX_WRITE_BEHIND_MAX_SIZE", 1000)
+            )
+        return _queue
+
+
+def flush_write_behind() -> None:
+    """Write all pending preferences now (e.g. before shutdown or in tests)."""
+    if _queue is not None:
+        _queue.flush()
+
+
+@atexit.register
+def _close_on_exit():
+    if _queue is not None:
+        _queue.close()
+
+
+@receiver(setting_changed)
+def _reset_queue(*, setting, **kwargs):
+    """Replace the queue when write-behind settings are overridden."""
+    global _queue
+    if setting in ("I18N_NOPREFIX_WRITE_BEHIND", "I18N_NOPREFIX_WRITE_BEHIND_MAX_SIZE"):
+        with _queue_lock:
+            queue, _queue = _queue, None
+        if queue is not None:
+            queue.close()
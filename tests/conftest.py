@@ -4,12 +4,16 @@ Pytest configuration for django-i18n-noprefix tests.
 
 import os
 import sys
+import time
 from pathlib import Path
 
 import django
 import pytest
 from django.conf import settings
 
+# (label, {name: seconds per call}) recorded by the time_calls fixture
+BENCHMARKS = []
+
 # Add project root to path
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
@@ -22,6 +26,18 @@ def pytest_configure(config):
         django.setup()
 
 
+def pytest_terminal_summary(terminalreporter):
+    """Report the timings of the benchmarks that ran (``-m slow``)."""
+    if not BENCHMARKS:
+        return
+    terminalreporter.section("benchmarks")
+    for label, timings in BENCHMARKS:
+        results = ", ".join(
+            f"{name} {seconds * 1e6:.0f} us" for name, seconds in timings.items()
+        )
+        terminalreporter.write_line(f"{label}: {results}")
+
+
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     """
@@ -141,3 +157,28 @@ def mock_response():
             return self._headers.get(key)
 
     return MockResponse()
+
+
+@pytest.fixture
+def time_calls(request):
+    """
+    Time callables for a benchmark (tests marked slow, deselected by default).
+
+    ``time_calls(reverse=f, table=g, iterations=20)`` warms each callable
+    up, then records its mean time per call under the test's name; the
+    timings are reported at the end of the run, not asserted.
+    """
+
+    def run(iterations=200, warmup=True, **funcs):
+        timings = {}
+        for name, func in funcs.items():
+            if warmup:
+                func()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            timings[name] = (time.perf_counter() - start) / iterations
+        BENCHMARKS.append((request.node.name, timings))
+        return timings
+
+    return run
@@ -0,0 +1,181 @@
+"""
+Allocation budget tests for NoPrefixLocaleMiddleware.
+
+Each middleware path gets a budget measured with ``tracemalloc``. The
+steady-state path (a returning visitor whose cookie matches the resolved
+language) must not allocate anything beyond Django's own lookup of the
+active language and the request's LanguageResolution, and must not leave
+anything behind.
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.resolution import LanguageResolution
+from django_i18n_noprefix.utils import is_valid_language
+
+# Budgets (in bytes) for paths that legitimately persist the language.
+# They cover the cookie morsel attached to the response plus its
+# formatted expiry date.
+COOKIE_WRITE_PEAK_BUDGET = 4096
+COOKIE_WRITE_RETAINED_BUDGET = 2048
+
+
+def measure(func, warmup=3):
+    """
+    Run ``func`` and return ``(peak, retained)`` bytes allocated by it.
+
+    ``peak`` is the largest transient allocation seen during the call and
+    ``retained`` is what is still alive once it returns.
+    """
+    for _ in range(warmup):
+        func()
+
+    # A full collection would also empty the interpreter's free lists, so
+    # collection is only paused, never forced, around the measured call.
+    # The trace function (e.g. coverage) is suspended because it allocates
+    # on every line it sees.
+    tracer = sys.gettrace()
+    sys.settrace(None)
+    gc.disable()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+        sys.settrace(tracer)
+    return peak - baseline, current - baseline
+
+
+@pytest.fixture
+def run_middleware(mock_request):
+    """Return a callable measuring one middleware call for a fresh request."""
+
+    def _run(setup_request, view=None):
+        response = HttpResponse()
+
+        def get_response(request):
+            if view is not None:
+                view(request)
+            return response
+
+        middleware = NoPrefixLocaleMiddleware(get_response)
+
+        def make_request():
+            request = mock_request("/")
+            setup_request(request)
+            return request
+
+        # Requests are built up front so only the middleware call is measured
+        requests = [make_request() for _ in range(4)]
+
+        def invoke():
+            response.cookies.clear()
+            middleware(requests.pop())
+
+        return measure(invoke)
+
+    return _run
+
+
+@pytest.fixture
+def steady_state_budget():
+    """
+    Bytes the steady-state path may use: Django's lookup of the active
+    language plus the LanguageResolution attached to the request.
+    """
+    translation.activate("ko")
+    active_language_peak, _ = measure(translation.get_language)
+    resolution_peak, _ = measure(
+        lambda: LanguageResolution("ko", "cookie", {}, {}, "", "django_language")
+    )
+    return active_language_peak + resolution_peak
+
+
+class TestSteadyStateAllocations:
+    """The returning-visitor path must be allocation-free."""
+
+    def test_cookie_visitor(self, run_middleware, steady_state_budget):
+        """A valid cookie matching the active language allocates nothing else."""
+
+        def setup(request):
+            request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ko"
+
+        translation.activate("ko")
+        peak, retained = run_middleware(setup)
+
+        assert retained == 0
+        assert peak <= steady_state_budget
+
+    def test_session_visitor(self, run_middleware, steady_state_budget):
+        """A session language with an existing cookie allocates nothing else."""
+
+        def setup(request):
+            request.session["django_language"] = "ja"
+            request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        translation.activate("ja")
+        peak, retained = run_middleware(setup)
+
+        assert retained == 0
+        assert peak <= steady_state_budget
+
+    def test_is_valid_language(self):
+        """Validating a language code does not build temporary lists."""
+        peak, retained = measure(lambda: is_valid_language("ko"))
+        assert peak == 0
+        assert retained == 0
+
+    def test_is_valid_language_method(self):
+        """The middleware's validation shares the allocation-free lookup."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        peak, retained = measure(lambda: middleware.is_valid_language("en"))
+        assert peak == 0
+        assert retained == 0
+
+
+class TestCookieWriteAllocations:
+    """Paths that set the language cookie stay within a fixed budget."""
+
+    def test_first_visit_default(self, run_middleware):
+        """A first visit without hints only pays for the cookie."""
+        peak, retained = run_middleware(lambda request: None)
+
+        assert peak <= COOKIE_WRITE_PEAK_BUDGET
+        assert retained <= COOKIE_WRITE_RETAINED_BUDGET
+
+    def test_first_visit_header(self, run_middleware):
+        """Accept-Language resolution stays within the same budget."""
+
+        def setup(request):
+            request.META["HTTP_ACCEPT_LANGUAGE"] = "ja"
+
+        peak, retained = run_middleware(setup)
+
+        assert peak <= COOKIE_WRITE_PEAK_BUDGET
+        assert retained <= COOKIE_WRITE_RETAINED_BUDGET
+
+    def test_explicit_switch(self, run_middleware):
+        """An explicit language switch stays within the same budget."""
+
+        def setup(request):
+            request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "en"
+
+        def view(request):
+            request.LANGUAGE_CODE = "ko"
+            request._language_was_set = True
+
+        peak, retained = run_middleware(setup, view=view)
+
+        assert peak <= COOKIE_WRITE_PEAK_BUDGET
+        assert retained <= COOKIE_WRITE_RETAINED_BUDGET
@@ -3,17 +3,38 @@ Tests for app configuration and system checks.
 """
 
 from django.apps import apps
-from django.core.checks import Error, Warning
+from django.conf.urls.i18n import i18n_patterns
+from django.core.checks import Error, Tags, Warning, registry
+from django.http import HttpResponse
 from django.test import override_settings
+from django.urls import include, path
 
+from django_i18n_noprefix import apps as apps_module
 from django_i18n_noprefix.apps import (
+    PERFORMANCE_TAG,
     I18nNoPrefixConfig,
+    check_cache_middleware,
+    check_compiled_messages,
+    check_i18n_patterns,
     check_language_configuration,
+    check_language_count,
     check_middleware_configuration,
+    check_session_backend,
+    check_template_loaders,
     check_url_configuration,
 )
 
 
+def view(request):
+    return HttpResponse()
+
+
+urlpatterns = [
+    path("plain/", include([path("page/", view)])),
+    *i18n_patterns(path("page/", view)),
+]
+
+
 class TestAppConfig:
     """Test the app configuration."""
 
@@ -141,6 +162,215 @@ class TestURLChecks:
             assert any(e.id == "django_i18n_noprefix.W006" for e in errors)
 
 
+class TestI18nPatternsCheck:
+    """Test the resolver walk for i18n_patterns."""
+
+    def test_no_i18n_patterns(self):
+        """Test that the test project's URLs pass."""
+        assert check_i18n_patterns(None) == []
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_i18n_patterns(self):
+        """Test that i18n_patterns are found among other patterns."""
+        errors = check_i18n_patterns(None)
+
+        assert [e.id for e in errors] == ["django_i18n_noprefix.W005"]
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_switch_urls_missing(self):
+        """Test that a URLconf without the package's URLs is reported."""
+        errors = check_url_configuration(None)
+
+        assert [e.id for e in errors] == ["django_i18n_noprefix.W006"]
+
+    def test_switch_urls_included(self):
+        """Test that the test project's URLs include the switch views."""
+        assert check_url_configuration(None) == []
+
+    @override_settings(ROOT_URLCONF="nonexistent.urls")
+    def test_unloadable_urlconf(self):
+        """Test that a broken ROOT_URLCONF is left to Django's checks."""
+        assert check_i18n_patterns(None) == []
+        assert check_url_configuration(None) == []
+
+    def test_source_not_read(self, monkeypatch):
+        """Test that no source file is opened."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("source file opened")
+
+        monkeypatch.setattr("builtins.open", fail)
+        with override_settings(ROOT_URLCONF=__name__):
+            assert check_i18n_patterns(None)
+
+
+class TestCheckCaching:
+    """Test memoization and tags of the checks."""
+
+    def test_walked_once_per_fingerprint(self, monkeypatch):
+        """Test that the URL walk is shared and reused."""
+        walks = []
+        walk = apps_module.walk_patterns
+        monkeypatch.setattr(
+            apps_module,
+            "walk_patterns",
+            lambda patterns: walks.append(patterns) or walk(patterns),
+        )
+        monkeypatch.setattr(apps_module, "_urlconf_info", {})
+        monkeypatch.setattr(apps_module, "_check_results", {})
+
+        for _ in range(2):
+            check_i18n_patterns(None)
+            check_url_configuration(None)
+
+        assert len(walks) == 1
+        with override_settings(ROOT_URLCONF=__name__):
+            check_i18n_patterns(None)
+        assert len(walks) == 2
+
+    def test_results_not_shared(self):
+        """Test that callers cannot alter the memoized messages."""
+        with override_settings(MIDDLEWARE=[]):
+            check_middleware_configuration(None).clear()
+
+            assert len(check_middleware_configuration(None)) == 1
+
+    def test_tags(self):
+        """Test that URL checks can be selected or skipped by tag."""
+        url_checks = [
+            check for check in registry.registry.get_checks() if Tags.urls in check.tags
+        ]
+
+        assert check_i18n_patterns in url_checks
+        assert check_url_configuration in url_checks
+        assert Tags.translation in check_language_configuration.tags
+        assert Tags.urls not in check_language_configuration.tags
+
+
+def ids(messages):
+    return [message.id for message in messages]
+
+
+class TestPerformanceChecks:
+    """Test the opt-in performance advisor checks."""
+
+    SESSION_FIRST = [
+        "django_i18n_noprefix.stores.SessionPreferenceStore",
+        "django_i18n_noprefix.stores.CookiePreferenceStore",
+    ]
+    COOKIE_FIRST = list(reversed(SESSION_FIRST))
+
+    def test_deploy_only(self):
+        """Test that the checks only run with --deploy by default."""
+        checks = registry.registry.get_checks(include_deployment_checks=False)
+
+        assert check_session_backend not in checks
+        assert check_session_backend in registry.registry.get_checks(
+            include_deployment_checks=True
+        )
+        assert PERFORMANCE_TAG in check_session_backend.tags
+
+    def test_db_sessions_read_first(self):
+        """Test W101 for database sessions read before the cookie."""
+        with override_settings(
+            SESSION_ENGINE="django.contrib.sessions.backends.db",
+            I18N_NOPREFIX_PREFERENCE_STORES=self.SESSION_FIRST,
+        ):
+            assert ids(check_session_backend(None)) == ["django_i18n_noprefix.W101"]
+
+        with override_settings(
+            SESSION_ENGINE="django.contrib.sessions.backends.db",
+            I18N_NOPREFIX_PREFERENCE_STORES=self.COOKIE_FIRST,
+        ):
+            assert check_session_backend(None) == []
+
+        with override_settings(
+            SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+            I18N_NOPREFIX_PREFERENCE_STORES=self.SESSION_FIRST,
+        ):
+            assert check_session_backend(None) == []
+
+    def test_cache_middleware_with_cookie(self, settings):
+        """Test W102 unless the cookie is deferred."""
+        settings.MIDDLEWARE = [
+            "django.middleware.cache.UpdateCacheMiddleware",
+            *settings.MIDDLEWARE,
+            "django.middleware.cache.FetchFromCacheMiddleware",
+        ]
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = self.COOKIE_FIRST
+
+        assert ids(check_cache_middleware(None)) == ["django_i18n_noprefix.W102"]
+
+        settings.I18N_NOPREFIX_DEFER_COOKIE = True
+
+        assert check_cache_middleware(None) == []
+
+    def test_no_cache_middleware(self):
+        """Test that W102 needs the cache middleware."""
+        assert check_cache_middleware(None) == []
+
+    def test_uncached_loaders(self, settings):
+        """Test W103 for explicit loaders without the cached loader."""
+        settings.TEMPLATES = [
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "OPTIONS": {
+                    "loaders": ["django.template.loaders.app_directories.Loader"]
+                },
+            }
+        ]
+
+        assert ids(check_template_loaders(None)) == ["django_i18n_noprefix.W103"]
+
+        settings.TEMPLATES[0]["OPTIONS"]["loaders"] = [
+            (
+                "django_i18n_noprefix.loaders.Loader",
+                ["django.template.loaders.app_directories.Loader"],
+            )
+        ]
+        settings.TEMPLATES = list(settings.TEMPLATES)
+
+        assert check_template_loaders(None) == []
+
+    def test_default_loaders(self):
+        """Test that Django's default (cached) loaders pass."""
+        assert check_template_loaders(None) == []
+
+    def test_missing_mo(self, settings, tmp_path):
+        """Test W104 for missing or outdated compiled catalogs."""
+        for locale in ("ko", "en"):
+            messages = tmp_path / locale / "LC_MESSAGES"
+            messages.mkdir(parents=True)
+            (messages / "django.po").write_text("")
+        (tmp_path / "en" / "LC_MESSAGES" / "django.mo").write_bytes(b"")
+        settings.LOCALE_PATHS = [tmp_path]
+
+        messages = check_compiled_messages(None)
+
+        assert ids(messages) == ["django_i18n_noprefix.W104"]
+        assert messages[0].msg.endswith(": ko")
+
+    def test_compiled(self, settings, tmp_path):
+        """Test that compiled or absent catalogs pass."""
+        messages = tmp_path / "ko" / "LC_MESSAGES"
+        messages.mkdir(parents=True)
+        (messages / "django.po").write_text("")
+        (messages / "django.mo").write_bytes(b"")
+        settings.LOCALE_PATHS = [tmp_path, tmp_path / "missing"]
+
+        assert check_compiled_messages(None) == []
+
+    def test_many_languages(self, settings):
+        """Test W105 for very large LANGUAGES."""
+        settings.LANGUAGES = [(f"x{index}", f"X{index}") for index in range(31)]
+
+        assert ids(check_language_count(None)) == ["django_i18n_noprefix.W105"]
+
+        settings.LANGUAGES = settings.LANGUAGES[:30]
+
+        assert check_language_count(None) == []
+
+
 class TestVersionInfo:
     """Test version information."""
 
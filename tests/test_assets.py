@@ -0,0 +1,103 @@
+"""
+Tests for per-language assets and the language_assets tag.
+"""
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.utils import translation
+
+from django_i18n_noprefix.assets import get_assets, render_language_assets
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+
+FONT_LINK = (
+    '<link rel="preload" href="/static/fonts/NotoSansKR.woff2" as="font" '
+    'type="font/woff2" crossorigin>'
+)
+CSS_LINK = '<link rel="stylesheet" href="/static/i18n_noprefix/css/lang/cjk.css">'
+
+
+@pytest.fixture(autouse=True)
+def manifest(settings):
+    settings.I18N_NOPREFIX_LANGUAGE_ASSETS = {
+        "ko": ["fonts/NotoSansKR.woff2", "i18n_noprefix/css/lang/cjk.css"],
+        "ja": [
+            {"path": "css/ja.css", "media": "screen"},
+            {"path": "fonts/jp.woff", "crossorigin": "use-credentials"},
+        ],
+        "zh": [{"path": "fonts/sc.css", "rel": "preload", "as": "style"}],
+    }
+
+
+def render(source, **context):
+    return Template("{% load i18n_noprefix %}" + source).render(Context(context))
+
+
+class TestLanguageAssetsTag:
+    """Test the language_assets template tag."""
+
+    def test_active_language_only(self):
+        """Test that only the active language's assets are linked."""
+        with translation.override("ko"):
+            html = render("{% language_assets %}")
+
+        assert html == f"{FONT_LINK}\n{CSS_LINK}"
+
+    def test_latin_page(self):
+        """Test that languages without assets get nothing."""
+        assert render("{% language_assets %}") == ""
+
+    def test_explicit_language(self):
+        """Test the lang_code argument and attribute overrides."""
+        html = render("{% language_assets 'ja' %}")
+
+        assert html == (
+            '<link rel="stylesheet" href="/static/css/ja.css" media="screen">\n'
+            '<link rel="preload" href="/static/fonts/jp.woff" as="font" '
+            'type="font/woff" crossorigin="use-credentials">'
+        )
+
+    def test_generic_language(self):
+        """Test that regional variants use the generic language's assets."""
+        assert get_assets("zh-hans") == [
+            {"rel": "preload", "href": "/static/fonts/sc.css", "as": "style"}
+        ]
+
+    def test_cached_per_language(self):
+        """Test that each language is rendered once."""
+        assert render_language_assets("ko") is render_language_assets("ko")
+
+    def test_cleared_on_settings_change(self, settings):
+        """Test that changing the manifest re-renders the links."""
+        render_language_assets("ko")
+
+        settings.I18N_NOPREFIX_LANGUAGE_ASSETS = {"ko": ["css/ko.css"]}
+
+        assert render_language_assets("ko") == (
+            '<link rel="stylesheet" href="/static/css/ko.css">'
+        )
+
+    def test_invalid_entry(self, settings):
+        """Test that malformed entries are a configuration error."""
+        settings.I18N_NOPREFIX_LANGUAGE_ASSETS = {"ko": [{"href": "x.css"}]}
+
+        with pytest.raises(ImproperlyConfigured):
+            render_language_assets("ko")
+
+    def test_preload_header(self, rf):
+        """Test that preload=True announces fonts in a Link header."""
+        template = Template(
+            "{% load i18n_noprefix %}{% language_assets preload=True %}"
+        )
+
+        def view(request):
+            return HttpResponse(template.render(Context({"request": request})))
+
+        korean = NoPrefixLocaleMiddleware(view)(rf.get("/", HTTP_ACCEPT_LANGUAGE="ko"))
+        english = NoPrefixLocaleMiddleware(view)(rf.get("/", HTTP_ACCEPT_LANGUAGE="en"))
+
+        assert korean["Link"] == (
+            "</static/fonts/NotoSansKR.woff2>; rel=preload; as=font; crossorigin"
+        )
+        assert "Link" not in english
@@ -0,0 +1,244 @@
+"""
+Tests for the async views, aactivate_language and the async middleware path.
+"""
+
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.test import AsyncClient
+from django.urls import include, path
+from django.utils import translation
+
+from django_i18n_noprefix import views
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.signals import language_changed
+from django_i18n_noprefix.utils import aactivate_language
+
+
+async def language_view(request):
+    return JsonResponse({"language": translation.get_language()})
+
+
+switch_patterns = (
+    [
+        path("set-language/<str:lang_code>/", views.achange_language, name="switch"),
+        path("set-language-ajax/", views.aset_language_ajax, name="ajax"),
+    ],
+    "async_switch",
+)
+
+urlpatterns = [
+    path("i18n/", include(switch_patterns)),
+    path("language/", language_view),
+]
+
+
+def run(coroutine_function, *args, **kwargs):
+    return async_to_sync(coroutine_function)(*args, **kwargs)
+
+
+class TestAactivateLanguage:
+    """Test aactivate_language."""
+
+    def test_valid_language(self, rf):
+        """Test that a valid language is activated and flagged for saving."""
+        request = rf.get("/")
+
+        assert run(aactivate_language, request, "ko") is True
+        assert request.LANGUAGE_CODE == "ko"
+        assert request._language_was_set is True
+
+    def test_invalid_language(self, rf):
+        """Test that an invalid language is rejected."""
+        request = rf.get("/")
+
+        assert run(aactivate_language, request, "xx") is False
+        assert not hasattr(request, "LANGUAGE_CODE")
+
+    def test_session_fallback(self, mock_request):
+        """Test that the session is written without the middleware."""
+        request = mock_request("/")
+
+        run(aactivate_language, request, "ja")
+
+        assert request.session["django_language"] == "ja"
+
+    def test_signal_sent(self, rf):
+        """Test that language_changed reaches sync and async receivers."""
+        received = []
+
+        def sync_handler(sender, **kwargs):
+            received.append(("sync", kwargs["language"], kwargs["previous"]))
+
+        async def async_handler(sender, **kwargs):
+            received.append(("async", kwargs["language"], kwargs["previous"]))
+
+        language_changed.connect(sync_handler)
+        language_changed.connect(async_handler)
+        try:
+            request = rf.get("/")
+            request.LANGUAGE_CODE = "en"
+            run(aactivate_language, request, "ko")
+        finally:
+            language_changed.disconnect(sync_handler)
+            language_changed.disconnect(async_handler)
+
+        assert sorted(received) == [("async", "ko", "en"), ("sync", "ko", "en")]
+
+
+@pytest.mark.urls(__name__)
+class TestAsyncViews:
+    """Test achange_language and aset_language_ajax through the ASGI stack."""
+
+    @pytest.fixture
+    def async_client(self):
+        return AsyncClient()
+
+    def test_change_language(self, async_client):
+        """Test that the switch persists and redirects."""
+        response = run(async_client.get, "/i18n/set-language/ko/?next=/language/")
+
+        assert response.status_code == 302
+        assert response.url == "/language/"
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+        assert "no-cache" in response["Cache-Control"]
+
+        cookie = response.cookies[settings.LANGUAGE_COOKIE_NAME].value
+        async_client.cookies[settings.LANGUAGE_COOKIE_NAME] = cookie
+        assert run(async_client.get, "/language/").json() == {"language": "ko"}
+
+    def test_change_language_invalid(self, async_client):
+        """Test that an invalid code redirects without switching."""
+        response = run(async_client.get, "/i18n/set-language/xx/?next=/language/")
+
+        assert response.status_code == 302
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "en"
+
+    def test_change_language_method_not_allowed(self, async_client):
+        """Test that only GET and POST are accepted."""
+        response = run(async_client.put, "/i18n/set-language/ko/")
+
+        assert response.status_code == 405
+
+    def test_ajax(self, async_client):
+        """Test the async AJAX endpoint."""
+        response = run(
+            async_client.post,
+            "/i18n/set-language-ajax/",
+            json.dumps({"language": "ja", "next": "/language/"}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "success": True,
+            "language": "ja",
+            "redirect": "/language/",
+        }
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+
+    def test_ajax_errors(self, async_client):
+        """Test that bad payloads get the same errors as the sync view."""
+        post = async_to_sync(async_client.post)
+
+        invalid = post(
+            "/i18n/set-language-ajax/",
+            json.dumps({"language": "xx"}),
+            content_type="application/json",
+        )
+        malformed = post(
+            "/i18n/set-language-ajax/", "{", content_type="application/json"
+        )
+        wrong_method = run(async_client.get, "/i18n/set-language-ajax/")
+
+        assert invalid.status_code == 400
+        assert "Invalid language code" in invalid.json()["error"]
+        assert malformed.status_code == 400
+        assert wrong_method.status_code == 405
+
+
+class TestAsyncMiddleware:
+    """Test NoPrefixLocaleMiddleware in an async middleware chain."""
+
+    def test_async_detection(self):
+        """Test that the middleware follows its get_response."""
+
+        async def async_view(request):
+            return HttpResponse()
+
+        assert iscoroutinefunction(NoPrefixLocaleMiddleware(async_view))
+        assert not iscoroutinefunction(
+            NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        )
+
+    def test_resolves_and_saves(self, mock_request):
+        """Test that the async path resolves and persists like the sync one."""
+
+        async def view(request):
+            await aactivate_language(request, "ja")
+            return HttpResponse(translation.get_language())
+
+        middleware = NoPrefixLocaleMiddleware(view)
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ko")
+
+        response = run(middleware, request)
+
+        assert response.content == b"ja"
+        assert request.language_resolution.source == "header"
+        assert request.session["django_language"] == "ja"
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+
+
+class TestUseAsyncViews:
+    """Test the choice between sync and async views."""
+
+    def test_setting(self, settings):
+        """Test that the setting overrides detection."""
+        settings.I18N_NOPREFIX_ASYNC_VIEWS = True
+        assert views.use_async_views() is True
+
+        settings.I18N_NOPREFIX_ASYNC_VIEWS = False
+        assert views.use_async_views() is False
+
+    def test_detection(self, monkeypatch):
+        """Test that ASGI-only processes get the async views."""
+        import sys
+
+        monkeypatch.setitem(sys.modules, "django.core.handlers.asgi", object())
+        monkeypatch.delitem(sys.modules, "django.core.handlers.wsgi", raising=False)
+        assert views.use_async_views() is True
+
+        monkeypatch.setitem(sys.modules, "django.core.handlers.wsgi", object())
+        assert views.use_async_views() is False
+
+
+@pytest.mark.slow
+@pytest.mark.urls(__name__)
+def test_concurrent_switches(time_calls):
+    """Benchmark hundreds of simultaneous language switches."""
+    languages = [code for code, name in settings.LANGUAGES]
+    count = 300
+
+    async def switch(i):
+        client = AsyncClient()
+        language = languages[i % len(languages)]
+        response = await client.get(f"/i18n/set-language/{language}/?next=/language/")
+        return language, response
+
+    async def main():
+        return await asyncio.gather(*(switch(i) for i in range(count)))
+
+    results = []
+    time_calls(
+        switches=lambda: results.extend(async_to_sync(main)()),
+        iterations=1,
+        warmup=False,
+    )
+
+    for language, response in results:
+        assert response.status_code == 302
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == language
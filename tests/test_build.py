@@ -0,0 +1,84 @@
+"""
+Tests for the shared helpers writing content-hashed build files.
+"""
+
+import json
+import os
+
+import pytest
+
+from django_i18n_noprefix import build
+from django_i18n_noprefix.build import write_hashed_file, write_manifest
+from django_i18n_noprefix.catalogs import build_catalogs
+
+
+class TestWriteHashedFile:
+    """Test writing content-hashed files."""
+
+    def test_interrupted_write_not_kept(self, tmp_path, monkeypatch):
+        """Test that a failed write leaves nothing under the final name."""
+        with monkeypatch.context() as patch:
+            patch.setattr(build.os, "replace", self.fail)
+            with pytest.raises(OSError):
+                write_hashed_file(str(tmp_path), "ko", ".js", b"catalog")
+
+        assert list(tmp_path.iterdir()) == []
+
+        filename = write_hashed_file(str(tmp_path), "ko", ".js", b"catalog")
+
+        assert (tmp_path / filename).read_bytes() == b"catalog"
+
+    def test_interrupted_catalog_build_rewritten(self, tmp_path, monkeypatch):
+        """Test that the next build writes catalogs an interrupted one missed."""
+        with monkeypatch.context() as patch:
+            patch.setattr(build.os, "replace", self.fail)
+            with pytest.raises(OSError):
+                build_catalogs(str(tmp_path), ["ko"])
+
+        manifest = build_catalogs(str(tmp_path), ["ko"])
+
+        assert b"django.gettext" in (tmp_path / manifest["ko"]).read_bytes()
+
+    def test_variants_written_with_file(self, tmp_path):
+        """Test that siblings are written only when the file is new."""
+        calls = []
+
+        def variants(content):
+            calls.append(content)
+            return {".gz": b"zipped"}
+
+        filename = write_hashed_file(str(tmp_path), "a", ".css", b"x", variants)
+        write_hashed_file(str(tmp_path), "a", ".css", b"x", variants)
+
+        assert calls == [b"x"]
+        assert (tmp_path / f"{filename}.gz").read_bytes() == b"zipped"
+
+    @staticmethod
+    def fail(src, dst):
+        os.remove(src)
+        raise OSError("Interrupted")
+
+
+class TestWriteManifest:
+    """Test writing the manifest."""
+
+    def test_replaces(self, tmp_path):
+        """Test that a manifest is replaced by default."""
+        path = str(tmp_path / "manifest.json")
+        write_manifest(path, {"en": "en.1.js"})
+
+        write_manifest(path, {"ko": "ko.1.js"})
+
+        assert json.loads((tmp_path / "manifest.json").read_text()) == {"ko": "ko.1.js"}
+
+    def test_merge(self, tmp_path):
+        """Test that merging keeps entries that were not rebuilt."""
+        path = str(tmp_path / "manifest.json")
+        write_manifest(path, {"en": "en.1.js", "ko": "ko.1.js"})
+
+        write_manifest(path, {"ko": "ko.2.js"}, merge=True)
+
+        assert json.loads((tmp_path / "manifest.json").read_text()) == {
+            "en": "en.1.js",
+            "ko": "ko.2.js",
+        }
@@ -0,0 +1,192 @@
+"""
+Tests for prebuilt JavaScript catalogs.
+"""
+
+import hashlib
+import json
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.utils import translation
+
+from django_i18n_noprefix.catalogs import (
+    build_catalogs,
+    catalog_url,
+    get_catalog_manifest,
+)
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+
+
+@pytest.fixture
+def catalog_root(settings, tmp_path):
+    """Configure a catalog directory and build the catalogs into it."""
+    settings.I18N_NOPREFIX_JS_CATALOG_ROOT = str(tmp_path)
+    build_catalogs(str(tmp_path), ["en", "ko", "ja"])
+    yield tmp_path
+    get_catalog_manifest.cache_clear()
+
+
+class TestBuildCatalogs:
+    """Test writing the catalog files."""
+
+    def test_one_hashed_file_per_language(self, tmp_path):
+        """Test that file names carry a hash of their content."""
+        manifest = build_catalogs(str(tmp_path), ["en", "ko"])
+
+        assert set(manifest) == {"en", "ko"}
+        for language, path in manifest.items():
+            content = (tmp_path / path).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            assert path == f"jsi18n/{language}.{digest}.js"
+            assert b"django.gettext" in content
+
+    def test_manifest_written(self, tmp_path):
+        """Test that the manifest maps languages to paths."""
+        manifest = build_catalogs(str(tmp_path), ["en"])
+
+        stored = json.loads((tmp_path / "jsi18n" / "catalogs.json").read_text())
+        assert stored == manifest
+
+    def test_rebuild_is_stable(self, tmp_path):
+        """Test that unchanged translations keep their file name."""
+        first = build_catalogs(str(tmp_path), ["ko"])
+        second = build_catalogs(str(tmp_path), ["ko"])
+
+        assert first == second
+
+    def test_languages_differ(self, tmp_path):
+        """Test that each language gets its own catalog."""
+        manifest = build_catalogs(str(tmp_path), ["en", "ko"])
+
+        assert manifest["en"] != manifest["ko"]
+
+
+class TestCatalogUrl:
+    """Test looking up the catalog for a language."""
+
+    def test_active_language(self, catalog_root):
+        """Test that the active language's catalog is returned."""
+        manifest = get_catalog_manifest()
+        with translation.override("ko"):
+            assert catalog_url() == f"/static/{manifest['ko']}"
+
+    def test_unknown_language_falls_back(self, catalog_root):
+        """Test the fallback to LANGUAGE_CODE's catalog."""
+        assert catalog_url("fr") == f"/static/{get_catalog_manifest()['en']}"
+
+    def test_missing_manifest(self, settings, tmp_path):
+        """Test that an unbuilt catalog directory is reported."""
+        settings.I18N_NOPREFIX_JS_CATALOG_ROOT = str(tmp_path)
+
+        with pytest.raises(ImproperlyConfigured, match="build_js_catalogs"):
+            catalog_url("en")
+
+    def test_not_configured(self):
+        """Test that the root setting is required."""
+        get_catalog_manifest.cache_clear()
+        with pytest.raises(ImproperlyConfigured, match="JS_CATALOG_ROOT"):
+            catalog_url("en")
+
+
+class TestJsCatalogTag:
+    """Test the js_catalog template tags."""
+
+    def test_script_tag(self, catalog_root):
+        """Test the script tag for the active language."""
+        template = Template("{% load i18n_noprefix %}{% js_catalog %}")
+        with translation.override("ja"):
+            result = template.render(Context({}))
+
+        path = get_catalog_manifest()["ja"]
+        assert result == f'<script src="/static/{path}"></script>'
+
+    def test_url_tag(self, catalog_root):
+        """Test js_catalog_url with an explicit language."""
+        template = Template("{% load i18n_noprefix %}{% js_catalog_url 'ko' %}")
+
+        assert template.render(Context({})) == (
+            f"/static/{get_catalog_manifest()['ko']}"
+        )
+
+    def test_preload_header(self, catalog_root, rf):
+        """Test that preload=True adds a Link header via the middleware."""
+        template = Template("{% load i18n_noprefix %}{% js_catalog preload=True %}")
+
+        def view(request):
+            return HttpResponse(template.render(Context({"request": request})))
+
+        response = NoPrefixLocaleMiddleware(view)(
+            rf.get("/", HTTP_ACCEPT_LANGUAGE="ko")
+        )
+
+        path = get_catalog_manifest()["ko"]
+        assert response["Link"] == f"</static/{path}>; rel=preload; as=script"
+
+    def test_preload_keeps_existing_link(self, catalog_root, rf):
+        """Test that an existing Link header is extended."""
+        template = Template("{% load i18n_noprefix %}{% js_catalog preload=True %}")
+
+        def view(request):
+            response = HttpResponse(template.render(Context({"request": request})))
+            response["Link"] = "</app.css>; rel=preload; as=style"
+            return response
+
+        response = NoPrefixLocaleMiddleware(view)(rf.get("/"))
+
+        assert response["Link"].startswith("</app.css>; rel=preload; as=style, </")
+
+    def test_no_preload_by_default(self, catalog_root, rf):
+        """Test that no header is sent without preload."""
+        template = Template("{% load i18n_noprefix %}{% js_catalog %}")
+
+        def view(request):
+            return HttpResponse(template.render(Context({"request": request})))
+
+        response = NoPrefixLocaleMiddleware(view)(rf.get("/"))
+
+        assert "Link" not in response
+
+
+class TestBuildJsCatalogsCommand:
+    """Test the build_js_catalogs management command."""
+
+    def test_builds_configured_languages(self, settings, tmp_path):
+        """Test that every language in LANGUAGES is built."""
+        settings.I18N_NOPREFIX_JS_CATALOG_ROOT = str(tmp_path)
+        out = StringIO()
+
+        call_command("build_js_catalogs", stdout=out)
+
+        manifest = json.loads((tmp_path / "jsi18n" / "catalogs.json").read_text())
+        assert set(manifest) == {"en", "ko", "ja"}
+        assert "Wrote 3 JavaScript catalogs" in out.getvalue()
+
+    def test_output_dir(self, tmp_path):
+        """Test --output-dir without the setting."""
+        call_command(
+            "build_js_catalogs", "--output-dir", str(tmp_path), stdout=StringIO()
+        )
+
+        assert (tmp_path / "jsi18n" / "catalogs.json").exists()
+
+    def test_requires_root(self):
+        """Test the error without a configured or given directory."""
+        with pytest.raises(CommandError, match="--output-dir"):
+            call_command("build_js_catalogs", stdout=StringIO())
+
+    def test_invalid_package(self, tmp_path):
+        """Test that unknown packages are reported."""
+        with pytest.raises(CommandError, match="nonexistent"):
+            call_command(
+                "build_js_catalogs",
+                "--output-dir",
+                str(tmp_path),
+                "--package",
+                "nonexistent",
+                stdout=StringIO(),
+            )
@@ -0,0 +1,170 @@
+"""
+Tests for management commands.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from django_i18n_noprefix.management.commands.migrate_language_preferences import (
+    Command,
+)
+
+
+def make_session(**data):
+    """Create a database session holding ``data`` and return its key."""
+    session = SessionStore()
+    session.update(data)
+    session.save()
+    return session.session_key
+
+
+def load(session_key):
+    return SessionStore(session_key=session_key).load()
+
+
+def migrate(*args):
+    out = StringIO()
+    call_command("migrate_language_preferences", *args, stdout=out)
+    return out.getvalue()
+
+
+class TestMigrateLanguagePreferences:
+    """Test the migrate_language_preferences command."""
+
+    def test_moves_legacy_key(self):
+        """Test that the legacy key is renamed to django_language."""
+        key = make_session(_language="ko", cart=[1, 2])
+
+        output = migrate()
+
+        assert load(key) == {"django_language": "ko", "cart": [1, 2]}
+        assert "Updated 1 of 1 sessions." in output
+
+    def test_existing_preference_wins(self):
+        """Test that django_language is kept and the legacy key dropped."""
+        key = make_session(_language="ko", django_language="ja")
+
+        migrate()
+
+        assert load(key) == {"django_language": "ja"}
+
+    def test_invalid_languages_removed(self):
+        """Test that languages no longer configured are dropped."""
+        legacy = make_session(_language="fr")
+        current = make_session(django_language="xx", other=1)
+
+        migrate()
+
+        assert load(legacy) == {}
+        assert load(current) == {"other": 1}
+
+    def test_unrelated_sessions_untouched(self):
+        """Test that sessions without language keys are not rewritten."""
+        key = make_session(django_language="en")
+        before = Session.objects.get(session_key=key).session_data
+
+        output = migrate()
+
+        assert Session.objects.get(session_key=key).session_data == before
+        assert "Updated 0 of 1 sessions." in output
+
+    def test_custom_legacy_keys(self):
+        """Test --legacy-key, which may be repeated."""
+        first = make_session(lang="ko")
+        second = make_session(site_language="ja")
+
+        migrate("--legacy-key", "lang", "--legacy-key", "site_language")
+
+        assert load(first) == {"django_language": "ko"}
+        assert load(second) == {"django_language": "ja"}
+
+    def test_dry_run(self):
+        """Test that --dry-run counts without writing."""
+        key = make_session(_language="ko")
+        make_session(django_language="en")
+
+        output = migrate("--dry-run")
+
+        assert load(key) == {"_language": "ko"}
+        assert "Dry run: 1 of 2 sessions would be updated." in output
+
+    def test_chunks_and_progress(self):
+        """Test that each chunk reports progress and the last key."""
+        keys = sorted(make_session(_language="ko") for _ in range(5))
+
+        output = migrate("--chunk-size", "2")
+
+        progress = [line for line in output.splitlines() if "sessions/s" in line]
+        assert len(progress) == 3
+        assert progress[0].startswith("Scanned 2 sessions, 2 updated")
+        assert progress[-1].endswith(f"last key {keys[-1]}")
+        assert all(load(key) == {"django_language": "ko"} for key in keys)
+
+    def test_resume(self):
+        """Test that --start-after skips sessions already processed."""
+        keys = sorted(make_session(_language="ko") for _ in range(3))
+
+        output = migrate("--start-after", keys[0])
+
+        assert load(keys[0]) == {"_language": "ko"}
+        assert load(keys[1]) == {"django_language": "ko"}
+        assert "Updated 2 of 2 sessions." in output
+
+    def test_expired_sessions_skipped(self):
+        """Test that expired sessions are skipped unless requested."""
+        key = make_session(_language="ko")
+        Session.objects.filter(session_key=key).update(
+            expire_date=timezone.now() - timedelta(days=1)
+        )
+
+        migrate()
+        assert Session.objects.get(session_key=key).get_decoded() == {"_language": "ko"}
+
+        migrate("--include-expired")
+        assert Session.objects.get(session_key=key).get_decoded() == {
+            "django_language": "ko"
+        }
+
+    def test_concurrent_change_not_reverted(self, monkeypatch):
+        """Test that sessions saved during the run are skipped, not reverted."""
+        key = make_session(_language="ko")
+        other = make_session(_language="ja")
+        migrate_session = Command.migrate
+
+        def log_in_meanwhile(command, data, legacy_keys):
+            if data.get("_language") == "ko":
+                session = SessionStore(session_key=key)
+                session["_auth_user_id"] = "1"
+                session.save()
+            return migrate_session(command, data, legacy_keys)
+
+        monkeypatch.setattr(Command, "migrate", log_in_meanwhile)
+
+        output = migrate()
+
+        assert load(key) == {"_language": "ko", "_auth_user_id": "1"}
+        assert load(other) == {"django_language": "ja"}
+        assert "Updated 1 of 2 sessions. Skipped 1 sessions" in output
+
+        monkeypatch.undo()
+        migrate()
+        assert load(key) == {"django_language": "ko", "_auth_user_id": "1"}
+
+    def test_requires_database_sessions(self, settings):
+        """Test that non-database session engines are rejected."""
+        settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+
+        with pytest.raises(CommandError, match="database"):
+            migrate()
+
+    def test_invalid_chunk_size(self):
+        """Test that --chunk-size must be positive."""
+        with pytest.raises(CommandError, match="chunk-size"):
+            migrate("--chunk-size", "0")
@@ -0,0 +1,92 @@
+"""
+Tests for the i18n_noprefix context processor.
+"""
+
+from django.template import RequestContext, Template
+from django.utils import translation
+
+from django_i18n_noprefix import context_processors
+from django_i18n_noprefix.context_processors import i18n_noprefix
+
+
+def render(source, request):
+    context = RequestContext(request, processors=[i18n_noprefix])
+    return Template(source).render(context)
+
+
+class TestContextProcessor:
+    """Test the lazy i18n_noprefix template variable."""
+
+    def test_languages(self, rf):
+        """Test the language list with switch URLs."""
+        with translation.override("ko"):
+            data = i18n_noprefix(rf.get("/about/"))["i18n_noprefix"]
+
+            assert data["language"] == "ko"
+            assert [lang["code"] for lang in data["languages"]] == ["ko", "en", "ja"]
+            assert data["languages"][1] == {
+                "code": "en",
+                "name": "English",
+                "name_local": "English",
+                "bidi": False,
+                "is_current": False,
+                "switch_url": "/i18n/set-language/en/?next=%2Fabout%2F",
+            }
+            assert data["current"]["name_local"] == "한국어"
+
+    def test_template(self, rf):
+        """Test using the variable from a template."""
+        html = render(
+            "{{ i18n_noprefix.current.name_local }}:"
+            "{% for lang in i18n_noprefix.languages %}"
+            "{% if not lang.is_current %}{{ lang.switch_url }} {% endif %}"
+            "{% endfor %}",
+            rf.get("/"),
+        )
+
+        assert html == (
+            "English:/i18n/set-language/ko/?next=%2F /i18n/set-language/ja/?next=%2F "
+        )
+
+    def test_lazy(self, rf, monkeypatch):
+        """Test that templates not using the variable do not build it."""
+        calls = []
+        build = context_processors.build_language_context
+        monkeypatch.setattr(
+            context_processors,
+            "build_language_context",
+            lambda *args: calls.append(args) or build(*args),
+        )
+        request = rf.get("/")
+
+        render("nothing", request)
+        assert calls == []
+
+        render("{{ i18n_noprefix.language }}", request)
+        assert len(calls) == 1
+
+    def test_memoized_per_request(self, rf):
+        """Test that contexts of one request share the data per language."""
+        request = rf.get("/")
+        first = context_processors.get_language_context(request)
+
+        assert context_processors.get_language_context(request) is first
+        with translation.override("ja"):
+            assert context_processors.get_language_context(request) is not first
+        assert context_processors.get_language_context(rf.get("/")) is not first
+
+    def test_unconfigured_language(self, rf):
+        """Test an active language outside LANGUAGES."""
+        with translation.override("de"):
+            data = context_processors.get_language_context(rf.get("/"))
+
+        assert data["current"]["code"] == "de"
+        assert not any(lang["is_current"] for lang in data["languages"])
+
+    def test_query_parameter_mode(self, rf, settings):
+        """Test that one-shot switch links are used when configured."""
+        settings.I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"
+
+        data = context_processors.get_language_context(rf.get("/about/?page=2"))
+
+        assert data["languages"][0]["switch_url"] == "/about/?page=2&set_lang=ko"
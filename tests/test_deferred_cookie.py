@@ -0,0 +1,165 @@
+"""
+Tests for the deferred language cookie mode (I18N_NOPREFIX_DEFER_COOKIE).
+"""
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.cache import (
+    FetchFromCacheMiddleware,
+    UpdateCacheMiddleware,
+)
+from django.test import override_settings
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty page cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class CountingView:
+    """View that records how often it actually runs."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        return HttpResponse(f"Hello in {request.LANGUAGE_CODE}")
+
+
+def build_stack(view):
+    """
+    Wrap a view in the documented middleware order: UpdateCacheMiddleware
+    first, FetchFromCacheMiddleware last, so cache keys see the language.
+    """
+    return UpdateCacheMiddleware(
+        SessionMiddleware(NoPrefixLocaleMiddleware(FetchFromCacheMiddleware(view)))
+    )
+
+
+class TestDeferredCookie:
+    """Test which responses persist the language in deferred mode."""
+
+    @pytest.fixture(autouse=True)
+    def defer_cookie(self, settings):
+        settings.I18N_NOPREFIX_DEFER_COOKIE = True
+
+    def test_header_language_not_persisted(self, mock_request):
+        """Test that an Accept-Language match sets no cookie."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ko")
+
+        response = middleware(request)
+
+        assert request.LANGUAGE_CODE == "ko"
+        assert not response.cookies
+        assert "django_language" not in request.session
+
+    def test_default_language_not_persisted(self, mock_request):
+        """Test that the default language sets no cookie."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+
+        response = middleware(request)
+
+        assert request.LANGUAGE_CODE == "en"
+        assert not response.cookies
+
+    def test_explicit_switch_persisted(self, mock_request):
+        """Test that an explicit switch still writes the cookie."""
+
+        def get_response(request):
+            request.LANGUAGE_CODE = "ja"
+            request._language_was_set = True
+            return HttpResponse()
+
+        middleware = NoPrefixLocaleMiddleware(get_response)
+        request = mock_request("/")
+
+        response = middleware(request)
+
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+        assert request.session["django_language"] == "ja"
+
+    def test_session_language_persisted(self, mock_request):
+        """Test that a stored session language still refreshes the cookie."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+        request.session["django_language"] = "ko"
+
+        response = middleware(request)
+
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+    def test_vary_headers(self, rf):
+        """Test that shared responses vary on everything selecting language."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+
+        response = middleware(rf.get("/"))
+
+        assert "Accept-Language" in response["Vary"]
+        assert "Cookie" in response["Vary"]
+
+
+class TestDeferredCookieCaching:
+    """Test that Django's cache middleware stores first-visit responses."""
+
+    @override_settings(I18N_NOPREFIX_DEFER_COOKIE=True)
+    def test_first_visit_response_is_cached(self, rf):
+        """Test that a second cookieless visitor is served from the cache."""
+        view = CountingView()
+        stack = build_stack(view)
+
+        first = stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+        second = stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+
+        assert view.calls == 1
+        assert not first.cookies
+        assert second.content == b"Hello in ko"
+
+    @override_settings(I18N_NOPREFIX_DEFER_COOKIE=True)
+    def test_cache_varies_by_accept_language(self, rf):
+        """Test that visitors with other languages get their own entry."""
+        view = CountingView()
+        stack = build_stack(view)
+
+        stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+        stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+        japanese = stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ja"))
+
+        assert view.calls == 2
+        assert japanese.content == b"Hello in ja"
+
+    @override_settings(I18N_NOPREFIX_DEFER_COOKIE=True)
+    def test_cookie_visitor_not_served_anonymous_copy(self, rf):
+        """Test that a visitor with a language cookie bypasses the entry."""
+        view = CountingView()
+        stack = build_stack(view)
+
+        stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+        request = rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko")
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+        request.META["HTTP_COOKIE"] = f"{settings.LANGUAGE_COOKIE_NAME}=ja"
+        response = stack(request)
+
+        assert view.calls == 2
+        assert response.content == b"Hello in ja"
+
+    def test_default_mode_is_not_cached(self, rf):
+        """Test that without deferral the language cookie blocks caching."""
+        view = CountingView()
+        stack = build_stack(view)
+
+        first = stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+        stack(rf.get("/landing/", HTTP_ACCEPT_LANGUAGE="ko"))
+
+        assert settings.LANGUAGE_COOKIE_NAME in first.cookies
+        assert view.calls == 2
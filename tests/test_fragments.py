@@ -0,0 +1,198 @@
+"""
+Tests for re-rendering template fragments after an AJAX language switch.
+"""
+
+import json
+
+import pytest
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.template import Context, Template, TemplateSyntaxError
+from django.urls import include, path
+from django.utils import translation
+
+PAGE = Template(
+    "{% load i18n_noprefix %}"
+    "<html><link rel='stylesheet' href='/big.css'>"
+    "{% i18n_fragment 'nav' %}nav:{{ LANG }}{% endi18n_fragment %}"
+    "<p>body</p>"
+    "{% i18n_fragment 'items' tag='ul' %}<li>{{ LANG }}</li>{% endi18n_fragment %}"
+    "</html>"
+)
+
+
+def page_view(request):
+    context = Context({"request": request, "LANG": translation.get_language()})
+    return HttpResponse(PAGE.render(context))
+
+
+def missing_view(request):
+    return HttpResponse(status=404)
+
+
+def staff_page_view(request):
+    return page_view(request)
+
+
+def not_found_view(request):
+    PAGE.render(Context({"request": request, "LANG": "ko"}))
+    raise Http404("Secret page name")
+
+
+def broken_view(request):
+    PAGE.render(Context({"request": request, "LANG": "ko"}))
+    raise ValueError("Secret database detail")
+
+
+class StaffGate:
+    """Middleware refusing /staff/ by path, without a process_view hook."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith("/staff/"):
+            return HttpResponseForbidden("Staff only")
+        return self.get_response(request)
+
+
+urlpatterns = [
+    path("page/", page_view),
+    path("staff/page/", staff_page_view),
+    path("missing/", missing_view),
+    path("not-found/", not_found_view),
+    path("broken/", broken_view),
+    path("i18n/", include("django_i18n_noprefix.urls")),
+]
+
+
+def switch(client, **data):
+    return client.post(
+        "/i18n/set-language-ajax/",
+        data=json.dumps(data),
+        content_type="application/json",
+    )
+
+
+class TestI18nFragmentTag:
+    """Test the i18n_fragment marker tag."""
+
+    def test_wraps_content(self):
+        """Test the default wrapper element."""
+        template = Template(
+            "{% load i18n_noprefix %}"
+            "{% i18n_fragment 'nav' %}<a>Home</a>{% endi18n_fragment %}"
+        )
+
+        result = template.render(Context({}))
+
+        assert result == '<div data-i18n-fragment="nav"><a>Home</a></div>'
+
+    def test_custom_element(self):
+        """Test tag= for fragments that must keep their parent valid."""
+        template = Template(
+            "{% load i18n_noprefix %}"
+            "{% i18n_fragment name tag='ul' %}<li>x</li>{% endi18n_fragment %}"
+        )
+
+        result = template.render(Context({"name": "menu"}))
+
+        assert result == '<ul data-i18n-fragment="menu"><li>x</li></ul>'
+
+    def test_invalid_arguments(self):
+        """Test that bad arguments are a template syntax error."""
+        with pytest.raises(TemplateSyntaxError):
+            Template(
+                "{% load i18n_noprefix %}"
+                "{% i18n_fragment 'nav' 'extra' %}{% endi18n_fragment %}"
+            )
+
+
+@pytest.mark.urls(__name__)
+class TestFragmentSwitch:
+    """Test set_language_ajax with requested fragments."""
+
+    @pytest.fixture(autouse=True)
+    def inline_views(self, settings):
+        settings.I18N_NOPREFIX_INLINE_VIEWS = [
+            f"{__name__}.page_view",
+            f"{__name__}.not_found_view",
+            f"{__name__}.broken_view",
+        ]
+
+    def test_returns_fragments_in_new_language(self, client):
+        """Test that only the named fragments come back, re-translated."""
+        response = switch(
+            client, language="ko", next="/page/", fragments=["nav", "items"]
+        )
+
+        data = response.json()
+        assert data["success"] is True
+        assert data["fragments"] == {
+            "nav": '<div data-i18n-fragment="nav">nav:ko</div>',
+            "items": '<ul data-i18n-fragment="items"><li>ko</li></ul>',
+        }
+        assert b"big.css" not in response.content
+
+    def test_only_requested_fragments(self, client):
+        """Test that unrequested and unknown fragments are left out."""
+        response = switch(client, language="ja", next="/page/", fragments=["nav", "x"])
+
+        assert list(response.json()["fragments"]) == ["nav"]
+
+    def test_language_persisted(self, client):
+        """Test that the switch is still saved by the middleware."""
+        switch(client, language="ja", next="/page/", fragments=["nav"])
+
+        assert client.session["django_language"] == "ja"
+
+    def test_without_fragments(self, client):
+        """Test that the plain response is unchanged."""
+        response = switch(client, language="ko", next="/page/")
+
+        assert response.json() == {
+            "success": True,
+            "language": "ko",
+            "redirect": "/page/",
+        }
+
+    def test_error_page_returns_no_fragments(self, client):
+        """Test that fragments are only taken from successful pages."""
+        response = switch(client, language="ko", next="/missing/", fragments=["nav"])
+
+        assert response.json()["fragments"] == {}
+
+    def test_unresolvable_next(self, client):
+        """Test that an unknown next URL yields no fragments."""
+        response = switch(client, language="ko", next="/nowhere/", fragments=["nav"])
+
+        assert response.json()["fragments"] == {}
+
+    def test_unsafe_next_not_rendered(self, client):
+        """Test that other hosts are never dispatched to."""
+        response = switch(
+            client,
+            language="ko",
+            next="https://evil.example.com/page/",
+            fragments=["nav"],
+        )
+
+        assert "fragments" not in response.json()
+
+    def test_path_gated_page_withheld(self, client, settings):
+        """Test that no fragments leak from pages a middleware refuses."""
+        settings.MIDDLEWARE = [*settings.MIDDLEWARE, f"{__name__}.StaffGate"]
+        assert client.get("/staff/page/").status_code == 403
+
+        response = switch(client, language="ko", next="/staff/page/", fragments=["nav"])
+
+        assert response.json()["fragments"] == {}
+
+    @pytest.mark.parametrize("next_url", ["/not-found/", "/broken/"])
+    def test_view_exception_returns_no_fragments(self, client, next_url):
+        """Test that exceptions from the page neither fail nor leak."""
+        response = switch(client, language="ko", next=next_url, fragments=["nav"])
+
+        assert response.status_code == 200
+        assert response.json()["fragments"] == {}
+        assert b"Secret" not in response.content
+        assert client.session["django_language"] == "ko"
@@ -0,0 +1,163 @@
+"""
+Tests for the Jinja2 extension and selector templates.
+"""
+
+import pytest
+from django.template import Context, Template
+from django.template.backends.jinja2 import Jinja2
+from django.utils import translation
+
+from django_i18n_noprefix.selector import clear_selector_cache, get_selector_cache
+
+jinja2 = pytest.importorskip("jinja2")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_selector_cache()
+    yield
+    clear_selector_cache()
+
+
+@pytest.fixture
+def backend():
+    return Jinja2(
+        {
+            "NAME": "jinja2",
+            "DIRS": [],
+            "APP_DIRS": True,
+            "OPTIONS": {"environment": "django_i18n_noprefix.jinja.environment"},
+        }
+    )
+
+
+def render(backend, source, request):
+    return backend.from_string(source).render(request=request)
+
+
+class TestJinjaHelpers:
+    """Test the environment globals and filter."""
+
+    def test_switch_language_url(self, backend, rf):
+        """Test that links match the Django template tag."""
+        request = rf.get("/about/")
+
+        html = render(
+            backend,
+            "{{ switch_language_url('ko') }}|{{ switch_language_url('ja', '/x/') }}",
+            request,
+        )
+
+        assert html == (
+            "/i18n/set-language/ko/?next=%2Fabout%2F|/i18n/set-language/ja/?next=%2Fx%2F"
+        )
+
+    def test_invalid_language(self, backend, rf):
+        """Test that invalid codes link nowhere."""
+        assert render(backend, "{{ switch_language_url('xx') }}", rf.get("/")) == "#"
+
+    def test_is_current_language(self, backend, rf):
+        """Test the function and filter forms."""
+        with translation.override("ko"):
+            html = render(
+                backend,
+                "{{ is_current_language('ko') }} {{ 'en'|is_current_language }}",
+                rf.get("/"),
+            )
+
+        assert html == "True False"
+
+
+class TestJinjaSelector:
+    """Test language_selector() and the Jinja2 selector templates."""
+
+    @pytest.mark.parametrize("style", ["dropdown", "list", "inline"])
+    def test_styles(self, backend, rf, style):
+        """Test that each style links every other language to its switch URL."""
+        html = render(
+            backend, "{{ language_selector('" + style + "') }}", rf.get("/about/")
+        )
+
+        assert f"i18n-noprefix-selector--{style}" in html
+        assert "/i18n/set-language/ko/?next=%2Fabout%2F" in html
+        assert "&lt;" not in html
+
+    def test_static_and_lazy(self, backend, rf):
+        """Test the page-independent styles."""
+        static = render(backend, "{{ language_selector('static') }}", rf.get("/a/"))
+        lazy = render(backend, "{{ language_selector('lazy') }}", rf.get("/a/"))
+
+        assert 'href="/i18n/set-language/ko/"' in static
+        assert "/static/i18n_noprefix/js/selector.js" in static
+        assert 'data-i18n-noprefix-languages="/i18n/languages/en/?v=' in lazy
+
+    def test_follows_active_language(self, backend, rf):
+        """Test that the active language is marked instead of linked."""
+        with translation.override("ko"):
+            html = render(backend, "{{ language_selector('list') }}", rf.get("/"))
+
+        assert "/i18n/set-language/ko/" not in html
+        assert "/i18n/set-language/en/" in html
+        assert 'aria-current="true"' in html
+
+    def test_cached_apart_from_django_templates(self, backend, rf):
+        """Test that Django and Jinja2 renderings do not share entries."""
+        django_html = Template(
+            "{% load i18n_noprefix %}{% language_selector 'list' %}"
+        ).render(Context({"request": rf.get("/")}))
+        jinja_html = render(backend, "{{ language_selector('list') }}", rf.get("/"))
+        render(backend, "{{ language_selector('list') }}", rf.get("/"))
+
+        assert django_html != jinja_html
+        stats = get_selector_cache().stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 1
+
+    def test_cached_per_environment(self, rf, tmp_path):
+        """Test that environments overriding the template differently do not mix."""
+        html = []
+        for name in ("first", "second"):
+            directory = tmp_path / name / "i18n_noprefix"
+            directory.mkdir(parents=True)
+            (directory / "language_selector_list.html").write_text(name)
+            env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(str(tmp_path / name)),
+                extensions=["django_i18n_noprefix.jinja.I18nNoPrefixExtension"],
+            )
+            html.append(
+                env.from_string("{{ language_selector('list') }}").render(
+                    request=rf.get("/")
+                )
+            )
+
+        assert html == ["first", "second"]
+
+    def test_own_environment(self, rf):
+        """Test the extension in an environment that cannot load the templates."""
+        env = jinja2.Environment(
+            extensions=["django_i18n_noprefix.jinja.I18nNoPrefixExtension"],
+            autoescape=True,
+        )
+
+        html = env.from_string("{{ language_selector('inline') }}").render(
+            request=rf.get("/")
+        )
+
+        assert "i18n-noprefix-selector--inline" in html
+        assert "&lt;nav" not in html
+
+
+@pytest.mark.slow
+def test_engine_benchmark(backend, rf, settings, time_calls):
+    """Benchmark uncached selector rendering under both engines."""
+    settings.I18N_NOPREFIX_SELECTOR_CACHE_SIZE = 0
+    django_template = Template("{% load i18n_noprefix %}{% language_selector 'list' %}")
+    jinja_template = backend.from_string("{{ language_selector('list') }}")
+
+    def django_render():
+        return django_template.render(Context({"request": rf.get("/about/")}))
+
+    def jinja_render():
+        return jinja_template.render(request=rf.get("/about/"))
+
+    time_calls(django=django_render, jinja2=jinja_render)
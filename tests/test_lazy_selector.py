@@ -0,0 +1,145 @@
+"""
+Tests for the language list endpoint and the lazy language selector.
+"""
+
+import gzip
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.template import Context, Template
+from django.test import AsyncClient
+from django.utils import translation
+
+from django_i18n_noprefix.selector import clear_selector_cache, get_language_list
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_selector_cache()
+    yield
+    clear_selector_cache()
+
+
+class TestLanguageListView:
+    """Test the language_list JSON endpoint."""
+
+    def test_languages(self, client):
+        """Test that every language is listed with its switch URL."""
+        response = client.get("/i18n/languages/en/")
+
+        assert response.status_code == 200
+        assert response["Content-Language"] == "en"
+        data = response.json()
+        assert data["language"] == "en"
+        assert data["languages"][0] == {
+            "code": "ko",
+            "name": "Korean",
+            "name_local": "한국어",
+            "url": "/i18n/set-language/ko/",
+        }
+        assert [item["code"] for item in data["languages"]] == ["ko", "en", "ja"]
+
+    def test_not_modified(self, client):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = client.get("/i18n/languages/ko/")["ETag"]
+
+        response = client.get("/i18n/languages/ko/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response["ETag"] == etag
+
+    def test_versioned_url_cached_long(self, client):
+        """Test that the versioned URL is immutable and others revalidate."""
+        body, etag = get_language_list("ko")
+
+        versioned = client.get(f"/i18n/languages/ko/?v={etag}")
+        stale = client.get("/i18n/languages/ko/?v=old")
+
+        assert "max-age=31536000" in versioned["Cache-Control"]
+        assert "immutable" in versioned["Cache-Control"]
+        assert "no-cache" in stale["Cache-Control"]
+        assert versioned.content == body
+
+    @pytest.mark.parametrize("defer_cookie", [False, True])
+    def test_versioned_url_shareable(self, client, settings, defer_cookie):
+        """Test that the middleware stack leaves the response cacheable."""
+        settings.I18N_NOPREFIX_DEFER_COOKIE = defer_cookie
+        etag = get_language_list("ko")[1]
+
+        first_visit = client.get(f"/i18n/languages/ko/?v={etag}")
+        client.get("/i18n/set-language/ja/")
+        returning = client.get(f"/i18n/languages/ko/?v={etag}")
+
+        assert settings.SESSION_COOKIE_NAME in client.cookies
+        for response in (first_visit, returning):
+            assert "immutable" in response["Cache-Control"]
+            assert not response.has_header("Vary")
+            assert not response.cookies
+        assert returning.json()["language"] == "ko"
+
+    def test_versioned_url_shareable_async(self):
+        """Test the same through the async middleware chain."""
+        etag = get_language_list("ko")[1]
+
+        response = async_to_sync(AsyncClient().get)(f"/i18n/languages/ko/?v={etag}")
+
+        assert "immutable" in response["Cache-Control"]
+        assert not response.has_header("Vary")
+        assert not response.cookies
+
+    def test_invalid_language(self, client):
+        """Test that unknown languages are not found."""
+        assert client.get("/i18n/languages/xx/").status_code == 404
+
+    def test_get_only(self, client):
+        """Test that the endpoint only answers GET and HEAD."""
+        assert client.post("/i18n/languages/en/").status_code == 405
+
+    def test_etag_follows_languages(self, settings):
+        """Test that changing LANGUAGES changes the version."""
+        before = get_language_list("en")[1]
+
+        settings.LANGUAGES = [("en", "English"), ("fr", "French")]
+
+        assert get_language_list("en")[1] != before
+
+
+class TestLazySelector:
+    """Test the lazy selector style."""
+
+    def render(self, request):
+        template = Template("{% load i18n_noprefix %}{% language_selector 'lazy' %}")
+        return template.render(Context({"request": request}))
+
+    def test_only_current_language(self, rf):
+        """Test that only the current language is rendered."""
+        with translation.override("ko"):
+            html = self.render(rf.get("/about/"))
+
+        etag = get_language_list("ko")[1]
+        assert f'data-i18n-noprefix-languages="/i18n/languages/ko/?v={etag}"' in html
+        assert "Korean" in html
+        assert "Japanese" not in html
+        assert "set-language" not in html
+
+    def test_same_markup_on_every_page(self, rf):
+        """Test that the lazy selector is page-independent."""
+        assert self.render(rf.get("/about/")) == self.render(rf.get("/contact/"))
+
+
+def test_page_weight(rf, settings):
+    """Compare selector page weight for 150 languages."""
+    settings.LANGUAGES = [(f"l{i:03d}", f"Language {i}") for i in range(150)]
+    request = rf.get("/products/42/")
+
+    sizes = {}
+    for style in ("dropdown", "lazy"):
+        template = Template(
+            "{% load i18n_noprefix %}{% language_selector '" + style + "' %}"
+        )
+        html = template.render(Context({"request": request})).encode()
+        sizes[style] = (len(html), len(gzip.compress(html)))
+
+    assert sizes["lazy"][0] * 20 < sizes["dropdown"][0]
+    assert sizes["lazy"][1] * 5 < sizes["dropdown"][1]
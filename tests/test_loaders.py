@@ -0,0 +1,201 @@
+"""
+Tests for the pre-translating template loader.
+"""
+
+from pathlib import Path
+
+import pytest
+from django.http import HttpResponse
+from django.template import Context, Engine
+from django.templatetags.i18n import BlockTranslateNode, TranslateNode
+from django.urls import include, path
+from django.utils import translation
+
+from django_i18n_noprefix.loaders import PretranslatedNode
+
+EXAMPLE_TEMPLATES = (
+    Path(__file__).resolve().parent.parent / "example_project" / "templates"
+)
+
+LIBRARIES = {
+    "i18n": "django.templatetags.i18n",
+    "static": "django.templatetags.static",
+    "i18n_noprefix": "django_i18n_noprefix.templatetags.i18n_noprefix",
+}
+
+TEMPLATES = {
+    "page.html": (
+        "{% load i18n %}"
+        '{% translate "January" %}|'
+        '{% translate "Yes" context "answer" %}|'
+        "{% blocktranslate %}Home{% endblocktranslate %}|"
+        '{% translate "Yes" as yes %}{{ yes }}|'
+        "{% translate word %}|"
+        '{% translate "Yes"|upper %}|'
+        "{% blocktranslate %}Hi {{ name }}{% endblocktranslate %}|"
+        '{% language "en" %}{% translate "January" %}{% endlanguage %}|'
+        '{% if show %}{% translate "Home" %}{% endif %}|'
+        '{% for i in items %}{% translate "Yes" %}{% endfor %}'
+    ),
+    "base.html": "{% load i18n %}<title>{% block title %}{% endblock %}</title>",
+    "child.html": (
+        '{% extends "base.html" %}{% load i18n %}'
+        '{% block title %}{% translate "Home" %}{% endblock %}'
+    ),
+}
+
+
+def make_engine(loader, templates=TEMPLATES):
+    return Engine(
+        loaders=[(loader, [("django.template.loaders.locmem.Loader", templates)])],
+        libraries=LIBRARIES,
+    )
+
+
+@pytest.fixture
+def engine():
+    return make_engine("django_i18n_noprefix.loaders.Loader")
+
+
+@pytest.fixture
+def plain_engine():
+    return make_engine("django.template.loaders.cached.Loader")
+
+
+def render(engine, name, **context):
+    context.setdefault("word", "Yes")
+    context.setdefault("name", "<b>")
+    context.setdefault("show", True)
+    context.setdefault("items", [1, 2])
+    return engine.get_template(name).render(Context(context))
+
+
+class TestLoader:
+    """Test the per-language template variants."""
+
+    @pytest.mark.parametrize("language", ["en", "ko"])
+    @pytest.mark.parametrize("name", ["page.html", "child.html"])
+    def test_output_unchanged(self, engine, plain_engine, language, name):
+        """Test that folded templates render like unfolded ones."""
+        with translation.override(language):
+            assert render(engine, name) == render(plain_engine, name)
+
+    def test_translated(self, engine):
+        """Test that each language gets its own translations."""
+        with translation.override("ko"):
+            korean = render(engine, "page.html")
+        english = render(engine, "page.html")
+
+        assert korean.startswith("1월|")
+        assert english.startswith("January|")
+        # The {% language %} block still renders in its own language
+        assert "|January|" in korean
+
+    def test_constant_nodes_folded(self, engine):
+        """Test that only context-independent translations are replaced."""
+        template = engine.get_template("page.html")
+
+        assert len(template.nodelist.get_nodes_by_type(PretranslatedNode)) == 6
+        # Variable, filtered, with placeholders and inside {% language %}
+        remaining = template.nodelist.get_nodes_by_type(TranslateNode)
+        remaining += template.nodelist.get_nodes_by_type(BlockTranslateNode)
+        assert len(remaining) == 4
+
+    def test_compiled_once_per_language(self, engine):
+        """Test that variants are cached per language."""
+        english = engine.get_template("page.html")
+        with translation.override("ko"):
+            korean = engine.get_template("page.html")
+            assert engine.get_template("page.html") is korean
+
+        assert engine.get_template("page.html") is english
+        assert korean is not english
+
+    def test_autoescape(self):
+        """Test that pre-translated text follows the autoescape setting."""
+        templates = {
+            "escape.html": (
+                "{% load i18n %}{% translate 'a & b' as text %}{{ text }}|"
+                "{% autoescape off %}{% translate 'a & b' as text %}"
+                "{{ text }}{% endautoescape %}|{% translate 'a & b' %}"
+            )
+        }
+        engine = make_engine("django_i18n_noprefix.loaders.Loader", templates)
+        plain_engine = make_engine("django.template.loaders.cached.Loader", templates)
+
+        assert render(engine, "escape.html") == render(plain_engine, "escape.html")
+
+    def test_default_loaders(self):
+        """Test that the loader wraps the filesystem and app loaders by default."""
+        engine = Engine(
+            loaders=["django_i18n_noprefix.loaders.Loader"], libraries=LIBRARIES
+        )
+
+        template = engine.get_template("i18n_noprefix/language_selector_list.html")
+
+        assert template.nodelist.get_nodes_by_type(PretranslatedNode)
+
+
+def demo_view(request):
+    return HttpResponse()
+
+
+urlpatterns = [
+    path(
+        "",
+        include(
+            (
+                [
+                    path("", demo_view, name="home"),
+                    path("about/", demo_view, name="about"),
+                    path("features/", demo_view, name="features"),
+                    path("settings/", demo_view, name="settings"),
+                    path("styles/bootstrap/", demo_view, name="style-bootstrap"),
+                    path("styles/tailwind/", demo_view, name="style-tailwind"),
+                    path("styles/vanilla/", demo_view, name="style-vanilla"),
+                ],
+                "demo",
+            )
+        ),
+    ),
+    path("i18n/", include("django_i18n_noprefix.urls")),
+]
+
+
+@pytest.mark.slow
+@pytest.mark.urls(__name__)
+def test_example_project_benchmark(rf, time_calls):
+    """Benchmark the example project's pages with and without folding."""
+    # home.html and settings.html use a tag the example project lacks
+    pages = ["about.html", "features.html"]
+    engines = {
+        name: Engine(
+            dirs=[EXAMPLE_TEMPLATES],
+            loaders=[
+                (
+                    loader,
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
+            ],
+            libraries=LIBRARIES,
+        )
+        for name, loader in (
+            ("cached", "django.template.loaders.cached.Loader"),
+            ("pretranslated", "django_i18n_noprefix.loaders.Loader"),
+        )
+    }
+
+    def render_pages(engine):
+        templates = [engine.get_template(page) for page in pages]
+
+        def render():
+            for template in templates:
+                template.render(Context({"request": rf.get("/")}))
+
+        return render
+
+    with translation.override("ko"):
+        time_calls(**{name: render_pages(engine) for name, engine in engines.items()})
@@ -0,0 +1,329 @@
+"""
+Tests for switching language without a redirect round trip.
+"""
+
+import json
+
+import django
+import pytest
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.template import Context, Template
+from django.urls import include, path, reverse
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.signals import language_changed
+from django_i18n_noprefix.views import change_language_inline, set_language_ajax
+
+SECRET = Template(
+    "{% load i18n_noprefix %}{% i18n_fragment 'main' %}Secret{% endi18n_fragment %}"
+)
+
+
+def secret_view(request):
+    return HttpResponse(SECRET.render(Context({"request": request})))
+
+
+def staff_view(request):
+    return HttpResponse("Staff only")
+
+
+def missing_view(request):
+    raise Http404("No such page")
+
+
+def denied_view(request):
+    raise PermissionDenied
+
+
+class StaffGate:
+    """Middleware refusing /staff/ by path, without a process_view hook."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith("/staff/"):
+            return HttpResponseForbidden("Staff only")
+        return self.get_response(request)
+
+
+def public_switch_view(request, lang_code):
+    return change_language_inline(request, lang_code)
+
+
+def public_ajax_view(request):
+    return set_language_ajax(request)
+
+
+public_switch_view.login_required = False
+public_ajax_view.login_required = False
+
+urlpatterns = [
+    path("secret/", secret_view),
+    path("staff/", staff_view, name="staff"),
+    path("missing/", missing_view, name="missing"),
+    path("denied/", denied_view, name="denied"),
+    path("switch/<str:lang_code>/", public_switch_view),
+    path("switch-ajax/", public_ajax_view),
+    path("accounts/login/", lambda request: HttpResponse("Login")),
+    path("i18n/", include("django_i18n_noprefix.urls")),
+]
+
+
+class TestQueryParameter:
+    """Test the one-shot ?set_lang= switch handled by the middleware."""
+
+    @pytest.fixture(autouse=True)
+    def query_parameter(self, settings):
+        settings.I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"
+
+    def test_page_served_in_new_language(self, client):
+        """Test that the page itself is served in the requested language."""
+        response = client.get("/api/data/?set_lang=ko")
+
+        assert response.status_code == 200
+        assert response.json()["language"] == "ko"
+
+    def test_choice_persisted(self, client):
+        """Test that the switch is saved like an explicit choice."""
+        response = client.get("/about/?set_lang=ja")
+
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+        assert client.session["django_language"] == "ja"
+        assert client.get("/api/data/").json()["language"] == "ja"
+
+    def test_resolution_source(self, mock_request):
+        """Test that the resolution reports the query parameter."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/?set_lang=ko", HTTP_ACCEPT_LANGUAGE="ja")
+
+        middleware(request)
+
+        assert request.language_resolution.code == "ko"
+        assert request.language_resolution.source == "query"
+        assert request.language_resolution.candidates[:2] == ["ko", "ja"]
+
+    def test_invalid_language_ignored(self, client):
+        """Test that unknown codes leave the detected language in place."""
+        response = client.get("/api/data/?set_lang=xx", HTTP_ACCEPT_LANGUAGE="ja")
+
+        assert response.json()["language"] == "ja"
+
+    def test_signal_sent(self, client):
+        """Test that the switch sends language_changed."""
+        received = []
+
+        def handler(sender, **kwargs):
+            received.append(kwargs["language"])
+
+        language_changed.connect(handler)
+        try:
+            client.get("/about/?set_lang=ko")
+        finally:
+            language_changed.disconnect(handler)
+
+        assert received == ["ko"]
+
+    def test_disabled_by_default(self, client, settings):
+        """Test that the parameter is ignored unless configured."""
+        del settings.I18N_NOPREFIX_QUERY_PARAMETER
+
+        response = client.get("/api/data/?set_lang=ko")
+
+        assert response.json()["language"] == "en"
+
+    def test_switch_language_url(self, rf):
+        """Test that switch links point at the page with the parameter."""
+        template = Template("{% load i18n_noprefix %}{% switch_language_url 'ko' %}")
+        request = rf.get("/products/1/?page=2&set_lang=ja")
+
+        result = template.render(Context({"request": request}))
+
+        assert result == "/products/1/?page=2&amp;set_lang=ko"
+
+    def test_switch_language_url_with_next(self):
+        """Test an explicit next URL in one-shot mode."""
+        template = Template(
+            "{% load i18n_noprefix %}{% switch_language_url 'ja' next_url='/about/' %}"
+        )
+
+        assert template.render(Context({})) == "/about/?set_lang=ja"
+
+
+class TestChangeLanguageInline:
+    """Test the view that dispatches to the next page internally."""
+
+    def url(self, lang_code, next_url=None):
+        url = reverse("django_i18n_noprefix:change_language_inline", args=[lang_code])
+        return f"{url}?next={next_url}" if next_url else url
+
+    @pytest.fixture(autouse=True)
+    def inline_views(self, settings):
+        settings.I18N_NOPREFIX_INLINE_VIEWS = ["about", "api-data", "product-detail"]
+
+    def test_renders_next_page(self, client):
+        """Test that the next page is served without a redirect."""
+        response = client.get(self.url("ko", "/api/data/"))
+
+        assert response.status_code == 200
+        assert response.json()["language"] == "ko"
+        assert response["Content-Location"] == "/api/data/"
+
+    def test_persists_language(self, client):
+        """Test that the switch is persisted by the middleware."""
+        response = client.get(self.url("ja", "/about/"))
+
+        assert response.content == b"About"
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+        assert client.session["django_language"] == "ja"
+
+    def test_passes_url_arguments(self, client):
+        """Test that captured URL arguments reach the next view."""
+        response = client.get(self.url("ko", "/products/7/"))
+
+        assert response.content == b"Product 7"
+
+    def test_unknown_path_redirects(self, client):
+        """Test the redirect fallback for paths that do not resolve."""
+        response = client.get(self.url("ko", "/missing/"))
+
+        assert response.status_code == 302
+        assert response.url == "/missing/"
+
+    def test_unlisted_view_redirects(self, client):
+        """Test that views missing from I18N_NOPREFIX_INLINE_VIEWS redirect."""
+        response = client.get(self.url("ko", "/contact/"))
+
+        assert response.status_code == 302
+        assert response.url == "/contact/"
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+    def test_dotted_view_path(self, client, settings):
+        """Test that views can also be listed by their dotted path."""
+        settings.I18N_NOPREFIX_INLINE_VIEWS = ["tests.test_project.urls.about_view"]
+
+        response = client.get(self.url("ko", "/about/"))
+
+        assert response.content == b"About"
+
+    def test_request_not_modified(self, rf):
+        """Test that the caller's request still describes the switch."""
+        request = rf.get(self.url("ko", "/about/"))
+        request.session = {}
+        path = request.path
+
+        change_language_inline(request, "ko")
+
+        assert request.path == request.path_info == path
+        assert request.GET["next"] == "/about/"
+        assert request.resolver_match is None
+
+    def test_switch_view_not_dispatched(self, client):
+        """Test that a next URL pointing at a switch view redirects."""
+        next_url = reverse("django_i18n_noprefix:change_language", args=["ja"])
+        response = client.get(self.url("ko", next_url))
+
+        assert response.status_code == 302
+
+    def test_invalid_language_redirects(self, client):
+        """Test that an invalid code redirects without switching."""
+        response = client.get(self.url("xx", "/about/"))
+
+        assert response.status_code == 302
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "en"
+
+    def test_post_not_allowed(self, client):
+        """Test that only safe methods are re-dispatched."""
+        response = client.post(self.url("ko", "/about/"))
+
+        assert response.status_code == 405
+
+
+@pytest.mark.urls(__name__)
+class TestInlineFallback:
+    """Test the redirect fallback for pages that cannot be served inline."""
+
+    @pytest.fixture(autouse=True)
+    def inline_views(self, settings):
+        settings.MIDDLEWARE = [*settings.MIDDLEWARE, f"{__name__}.StaffGate"]
+        settings.I18N_NOPREFIX_INLINE_VIEWS = ["missing", "denied"]
+
+    def test_path_gated_page_redirects(self, client):
+        """Test that pages refused by a middleware's __call__ are not inlined."""
+        assert client.get("/staff/").status_code == 403
+
+        response = client.get("/switch/ko/?next=/staff/")
+
+        assert response.status_code == 302
+        assert response.url == "/staff/"
+
+    @pytest.mark.parametrize("next_url", ["/missing/", "/denied/"])
+    def test_view_errors_redirect(self, client, next_url):
+        """Test that Http404 and PermissionDenied fall back to the redirect."""
+        response = client.get(f"/switch/ko/?next={next_url}")
+
+        assert response.status_code == 302
+        assert response.url == next_url
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+
+@pytest.mark.skipif(django.VERSION < (5, 1), reason="LoginRequiredMiddleware")
+@pytest.mark.urls(__name__)
+class TestViewMiddleware:
+    """Test that internally dispatched pages pass the view middleware."""
+
+    @pytest.fixture(autouse=True)
+    def login_required(self, settings):
+        settings.MIDDLEWARE = [
+            *settings.MIDDLEWARE,
+            "django.contrib.auth.middleware.LoginRequiredMiddleware",
+        ]
+        settings.I18N_NOPREFIX_INLINE_VIEWS = [f"{__name__}.secret_view"]
+
+    def test_protected_page_redirects(self, client):
+        """Test that a page needing login is not served inline."""
+        assert client.get("/secret/").status_code == 302
+
+        response = client.get("/switch/ko/?next=/secret/")
+
+        assert response.status_code == 302
+        assert response.url == "/secret/"
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+    def test_allowed_page_served(self, client, django_user_model):
+        """Test that pages the middleware lets through are still inlined."""
+        client.force_login(django_user_model.objects.create(username="reader"))
+
+        response = client.get("/switch/ko/?next=/secret/")
+
+        assert response.status_code == 200
+        assert b"Secret" in response.content
+
+    def test_protected_fragments_withheld(self, client):
+        """Test that the AJAX switch renders no fragments of a protected page."""
+        response = self.switch_ajax(client)
+
+        assert response.json()["success"] is True
+        assert response.json()["fragments"] == {}
+
+    def test_allowed_fragments_rendered(self, client, django_user_model):
+        """Test that fragments come back when the middleware allows the page."""
+        client.force_login(django_user_model.objects.create(username="reader"))
+
+        response = self.switch_ajax(client)
+
+        assert response.json()["fragments"] == {
+            "main": '<div data-i18n-fragment="main">Secret</div>'
+        }
+
+    @staticmethod
+    def switch_ajax(client):
+        return client.post(
+            "/switch-ajax/",
+            data=json.dumps(
+                {"language": "ko", "next": "/secret/", "fragments": ["main"]}
+            ),
+            content_type="application/json",
+        )
@@ -0,0 +1,328 @@
+"""
+Tests for rate limiting of the language switch endpoints.
+"""
+
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import AsyncClient
+
+from django_i18n_noprefix.ratelimit import (
+    CacheTokenBucketLimiter,
+    LanguageSwitchRateLimitMiddleware,
+    TokenBucketLimiter,
+    get_client_key,
+    get_rate_limiter,
+    get_session_client_key,
+    parse_rate,
+)
+
+
+class SessionTouchingView:
+    """Downstream handler recording whether the session was reached."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        return HttpResponse()
+
+
+class AsyncView(SessionTouchingView):
+    """Async downstream handler."""
+
+    def __init__(self):
+        super().__init__()
+        markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        return super().__call__(request)
+
+
+def forwarded_key(request):
+    """Key clients on a trusted proxy's header; leave others unlimited."""
+    return request.META.get("HTTP_X_REAL_IP")
+
+
+@pytest.fixture
+def rate_limited(settings):
+    """Allow two switches per minute."""
+    settings.I18N_NOPREFIX_RATE_LIMIT = "2/minute"
+    settings.MIDDLEWARE = [
+        "django_i18n_noprefix.ratelimit.LanguageSwitchRateLimitMiddleware",
+        *settings.MIDDLEWARE,
+    ]
+
+
+class TestParseRate:
+    """Test rate strings."""
+
+    def test_units(self):
+        """Test the supported periods."""
+        assert parse_rate("10/minute") == (10, 10 / 60)
+        assert parse_rate("5/s") == (5, 5.0)
+        assert parse_rate("100/hour") == (100, 100 / 3600)
+
+    @pytest.mark.parametrize("rate", ["10", "ten/minute", "10/week", "0/minute"])
+    def test_invalid(self, rate):
+        """Test that malformed rates are configuration errors."""
+        with pytest.raises(ImproperlyConfigured):
+            parse_rate(rate)
+
+
+class TestTokenBucketLimiter:
+    """Test the in-process limiter."""
+
+    def test_burst_then_limited(self):
+        """Test that a client gets ``burst`` requests, then none."""
+        limiter = TokenBucketLimiter(burst=3, rate=0.001)
+
+        assert [limiter.allow("a") for _ in range(4)] == [True, True, True, False]
+
+    def test_clients_independent(self):
+        """Test that buckets are per key."""
+        limiter = TokenBucketLimiter(burst=1, rate=0.001)
+
+        assert limiter.allow("a")
+        assert limiter.allow("b")
+        assert not limiter.allow("a")
+
+    def test_refill(self, monkeypatch):
+        """Test that tokens come back over time."""
+        now = [1000.0]
+        monkeypatch.setattr("time.monotonic", lambda: now[0])
+        limiter = TokenBucketLimiter(burst=1, rate=0.5)
+
+        assert limiter.allow("a")
+        assert not limiter.allow("a")
+        now[0] += 2
+        assert limiter.allow("a")
+
+    def test_max_keys(self):
+        """Test that the least recently used buckets are dropped."""
+        limiter = TokenBucketLimiter(burst=1, rate=0.001, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.allow(key)
+
+        assert limiter.stats()["keys"] == 2
+        assert limiter.allow("a")  # forgotten, so full again
+
+    def test_stats(self):
+        """Test allowed and limited counters."""
+        limiter = TokenBucketLimiter(burst=1, rate=0.001)
+        limiter.allow("a")
+        limiter.allow("a")
+
+        assert limiter.stats() == {"allowed": 1, "limited": 1, "keys": 1}
+
+    def test_retry_after(self):
+        """Test the Retry-After estimate."""
+        assert TokenBucketLimiter(burst=10, rate=10 / 60).retry_after() == 6
+
+
+class TestCacheTokenBucketLimiter:
+    """Test the cache-backed limiter."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_shared_between_instances(self):
+        """Test that two limiters (processes) share the buckets."""
+        first = CacheTokenBucketLimiter(burst=2, rate=0.001)
+        second = CacheTokenBucketLimiter(burst=2, rate=0.001)
+
+        assert first.allow("a")
+        assert second.allow("a")
+        assert not first.allow("a")
+        assert first.stats() == {"allowed": 1, "limited": 1}
+
+    def test_configured_by_setting(self, settings):
+        """Test I18N_NOPREFIX_RATE_LIMIT_CACHE."""
+        settings.I18N_NOPREFIX_RATE_LIMIT_CACHE = "default"
+
+        assert isinstance(get_rate_limiter(), CacheTokenBucketLimiter)
+
+
+class TestClientKey:
+    """Test how clients are identified."""
+
+    def test_ip_address(self, rf):
+        """Test that clients are keyed by IP address, whatever their cookies."""
+        first = rf.get("/", REMOTE_ADDR="10.0.0.1")
+        first.COOKIES[settings.SESSION_COOKIE_NAME] = "abc"
+        second = rf.get("/", REMOTE_ADDR="10.0.0.1")
+        second.COOKIES[settings.SESSION_COOKIE_NAME] = "def"
+
+        assert get_client_key(first) == get_client_key(second)
+        assert get_client_key(first) != get_client_key(
+            rf.get("/", REMOTE_ADDR="10.0.0.2")
+        )
+
+    def test_key_setting(self, settings, rf):
+        """Test that I18N_NOPREFIX_RATE_LIMIT_KEY replaces the key function."""
+        settings.I18N_NOPREFIX_RATE_LIMIT = "1/minute"
+        settings.I18N_NOPREFIX_RATE_LIMIT_KEY = f"{__name__}.forwarded_key"
+        middleware = LanguageSwitchRateLimitMiddleware(SessionTouchingView())
+
+        def switch(**headers):
+            request = rf.get(
+                "/i18n/set-language/ko/", REMOTE_ADDR="10.0.0.1", **headers
+            )
+            return middleware(request).status_code
+
+        assert switch(HTTP_X_REAL_IP="192.0.2.1") == 200
+        assert switch(HTTP_X_REAL_IP="192.0.2.2") == 200
+        assert switch(HTTP_X_REAL_IP="192.0.2.1") == 429
+        assert [switch(), switch()] == [200, 200]
+
+    def test_session_cookie(self, rf):
+        """Test the per-session key, which hides the session key."""
+        request = rf.get("/")
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = "abc"
+
+        assert "abc" not in get_session_client_key(request)
+        assert get_session_client_key(request) != get_client_key(request)
+        assert get_session_client_key(rf.get("/")) is None
+
+
+class TestRateLimitMiddleware:
+    """Test the middleware in front of the switch endpoints."""
+
+    @pytest.mark.usefixtures("rate_limited")
+    def test_change_language_limited(self, client):
+        """Test that the third switch within a minute gets 429."""
+        url = "/i18n/set-language/ko/"
+        statuses = [client.get(url).status_code for _ in range(3)]
+
+        assert statuses == [302, 302, 429]
+
+    @pytest.mark.usefixtures("rate_limited")
+    def test_rotating_session_cookies_limited(self, client):
+        """Test that a fresh random session cookie does not reset the limit."""
+        statuses = []
+        for index in range(10):
+            client.cookies[settings.SESSION_COOKIE_NAME] = f"random{index:024d}"
+            statuses.append(client.get("/i18n/set-language/ko/").status_code)
+
+        assert statuses == [302, 302] + [429] * 8
+
+    @pytest.mark.usefixtures("rate_limited")
+    def test_ajax_limited(self, client):
+        """Test that the AJAX endpoint shares the limit."""
+        client.get("/i18n/set-language/ko/")
+        body = json.dumps({"language": "ja"})
+        client.post("/i18n/set-language-ajax/", body, content_type="application/json")
+
+        response = client.post(
+            "/i18n/set-language-ajax/", body, content_type="application/json"
+        )
+
+        assert response.status_code == 429
+        assert response["Retry-After"] == "30"
+
+    @pytest.mark.usefixtures("rate_limited")
+    def test_other_pages_not_limited(self, client):
+        """Test that ordinary pages are never limited."""
+        statuses = {client.get("/about/").status_code for _ in range(5)}
+
+        assert statuses == {200}
+
+    def test_per_session_limit(self, settings, rf):
+        """Test the optional, tighter bucket per session cookie."""
+        settings.I18N_NOPREFIX_RATE_LIMIT_PER_SESSION = "1/minute"
+        middleware = LanguageSwitchRateLimitMiddleware(SessionTouchingView())
+
+        def switch(session_key):
+            request = rf.get("/i18n/set-language/ko/")
+            request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+            return middleware(request).status_code
+
+        assert switch("first") == 200
+        assert switch("first") == 429
+        assert switch("second") == 200
+
+    def test_rejected_before_session(self, settings, rf):
+        """Test that a rejected request never reaches later middleware."""
+        settings.I18N_NOPREFIX_RATE_LIMIT = "1/minute"
+        downstream = SessionTouchingView()
+        middleware = LanguageSwitchRateLimitMiddleware(downstream)
+
+        middleware(rf.get("/i18n/set-language/ko/"))
+        response = middleware(rf.get("/i18n/set-language/ko/"))
+
+        assert response.status_code == 429
+        assert downstream.calls == 1
+
+    def test_query_parameter_limited(self, settings, rf):
+        """Test that one-shot ?set_lang= switches are limited too."""
+        settings.I18N_NOPREFIX_RATE_LIMIT = "1/minute"
+        settings.I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"
+        middleware = LanguageSwitchRateLimitMiddleware(SessionTouchingView())
+
+        assert middleware(rf.get("/about/?set_lang=ko")).status_code == 200
+        assert middleware(rf.get("/about/?set_lang=ja")).status_code == 429
+        assert middleware(rf.get("/about/")).status_code == 200
+
+    def test_stats(self, settings, rf):
+        """Test that stats reflect middleware decisions."""
+        settings.I18N_NOPREFIX_RATE_LIMIT = "1/minute"
+        middleware = LanguageSwitchRateLimitMiddleware(SessionTouchingView())
+
+        middleware(rf.get("/i18n/set-language/ko/"))
+        middleware(rf.get("/i18n/set-language/ja/"))
+
+        stats = get_rate_limiter().stats()
+        assert stats["allowed"] == 1
+        assert stats["limited"] == 1
+
+
+class TestAsyncRateLimitMiddleware:
+    """Test the middleware in async middleware chains."""
+
+    def test_async_capable(self):
+        """Test that async chains get a coroutine middleware."""
+        middleware = LanguageSwitchRateLimitMiddleware(AsyncView())
+
+        assert iscoroutinefunction(middleware)
+        assert not iscoroutinefunction(
+            LanguageSwitchRateLimitMiddleware(SessionTouchingView())
+        )
+
+    def test_switch_limited(self, settings, rf):
+        """Test that switches are limited like in sync chains."""
+        settings.I18N_NOPREFIX_RATE_LIMIT = "1/minute"
+        downstream = AsyncView()
+        middleware = async_to_sync(LanguageSwitchRateLimitMiddleware(downstream))
+
+        statuses = [
+            middleware(rf.get(path)).status_code
+            for path in ("/i18n/set-language/ko/", "/i18n/set-language/ja/", "/")
+        ]
+
+        assert statuses == [200, 429, 200]
+        assert downstream.calls == 2
+
+    def test_other_requests_stay_on_event_loop(self, rf, monkeypatch):
+        """Test that only switch requests are handed to a thread."""
+        middleware = LanguageSwitchRateLimitMiddleware(AsyncView())
+        monkeypatch.setattr(middleware, "limit", None)
+
+        assert async_to_sync(middleware)(rf.get("/about/")).status_code == 200
+
+    @pytest.mark.usefixtures("rate_limited")
+    def test_asgi_stack(self):
+        """Test the middleware through the ASGI handler."""
+        get = async_to_sync(AsyncClient().get)
+
+        statuses = [get("/i18n/set-language/ko/").status_code for _ in range(3)]
+
+        assert statuses == [302, 302, 429]
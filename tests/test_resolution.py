@@ -0,0 +1,172 @@
+"""
+Tests for the language resolution attached to requests.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import override_settings
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.resolution import (
+    LanguageResolution,
+    accept_language_codes,
+)
+
+
+def resolve(request):
+    """Run the middleware and return the request's resolution."""
+    middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+    middleware(request)
+    return request.language_resolution
+
+
+class TestLanguageResolutionSource:
+    """Test that the winning language and its source are recorded."""
+
+    def test_session_source(self, mock_request):
+        """Test resolution from the session."""
+        request = mock_request("/")
+        request.session["django_language"] = "ko"
+
+        resolution = resolve(request)
+        assert resolution.code == "ko"
+        assert resolution.source == "session"
+        assert request.LANGUAGE_CODE == resolution.code
+
+    def test_cookie_source(self, mock_request):
+        """Test resolution from the cookie."""
+        request = mock_request("/")
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        resolution = resolve(request)
+        assert resolution.code == "ja"
+        assert resolution.source == "cookie"
+
+    def test_header_source(self, mock_request):
+        """Test resolution from the Accept-Language header."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ja,en;q=0.5")
+
+        resolution = resolve(request)
+        assert resolution.code == "ja"
+        assert resolution.source == "header"
+
+    def test_default_source(self, mock_request):
+        """Test fallback to LANGUAGE_CODE without any hints."""
+        request = mock_request("/")
+
+        resolution = resolve(request)
+        assert resolution.code == "en"
+        assert resolution.source == "default"
+
+    def test_unsupported_header_falls_back_to_default(self, mock_request):
+        """Test that an unsupported header is reported as the default."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="fr,de;q=0.8")
+
+        resolution = resolve(request)
+        assert resolution.code == "en"
+        assert resolution.source == "default"
+
+    def test_get_language_matches_resolution(self, mock_request):
+        """Test that get_language() returns the resolved code."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ko"
+
+        assert middleware.get_language(request) == "ko"
+        assert middleware.resolve_language(request).code == "ko"
+
+    def test_available_in_views(self, rf):
+        """Test that views can read the resolution."""
+        seen = {}
+
+        def view(request):
+            seen["resolution"] = request.language_resolution
+            return HttpResponse()
+
+        middleware = NoPrefixLocaleMiddleware(view)
+        request = rf.get("/", HTTP_ACCEPT_LANGUAGE="ko")
+        middleware(request)
+
+        assert seen["resolution"].code == "ko"
+        assert seen["resolution"].source == "header"
+
+
+class TestLanguageResolutionCandidates:
+    """Test the lazily ranked candidate list."""
+
+    def test_candidates_not_computed_until_accessed(self, mock_request):
+        """Test that resolving does not rank candidates."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ja,ko;q=0.8")
+
+        resolution = resolve(request)
+        assert resolution._candidates is None
+
+        assert resolution.candidates
+        assert resolution._candidates is not None
+
+    def test_candidates_ranked(self, mock_request):
+        """Test ranking by session, cookie, header and default."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ja;q=0.5,ko;q=0.9")
+        request.session["django_language"] = "ja"
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ko"
+
+        resolution = resolve(request)
+        assert resolution.candidates == ["ja", "ko", "en"]
+
+    def test_candidates_follow_header_quality(self, mock_request):
+        """Test that header languages are ordered by quality value."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="en;q=0.1,ja;q=0.5,ko")
+
+        resolution = resolve(request)
+        assert resolution.code == "ko"
+        assert resolution.candidates == ["ko", "ja", "en"]
+
+    def test_candidates_skip_invalid_codes(self, mock_request):
+        """Test that unknown stored values are left out."""
+        request = mock_request("/")
+        request.session["django_language"] = "xx"
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "invalid"
+
+        resolution = resolve(request)
+        assert resolution.candidates == ["en"]
+
+    def test_candidates_cached(self, mock_request):
+        """Test that the ranked list is computed once."""
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ja")
+
+        resolution = resolve(request)
+        assert resolution.candidates is resolution.candidates
+
+    def test_repr(self):
+        """Test the debugging representation."""
+        resolution = LanguageResolution("ko", "cookie", None, {}, "", "lang")
+        assert repr(resolution) == "<LanguageResolution code='ko' source='cookie'>"
+
+
+class TestAcceptLanguageCodes:
+    """Test Accept-Language parsing."""
+
+    def test_quality_order(self):
+        """Test that codes are yielded by descending quality."""
+        assert list(accept_language_codes("en;q=0.2,ja,ko;q=0.8")) == [
+            "ja",
+            "ko",
+            "en",
+        ]
+
+    def test_regional_variant(self):
+        """Test that regional variants map to configured languages."""
+        assert list(accept_language_codes("ko-KR")) == ["ko"]
+
+    def test_unsupported_and_wildcard(self):
+        """Test that unsupported codes are skipped and '*' stops parsing."""
+        assert list(accept_language_codes("fr,ja,*,ko")) == ["ja"]
+
+    def test_empty_header(self):
+        """Test that an empty header yields nothing."""
+        assert list(accept_language_codes("")) == []
+
+    @override_settings(LANGUAGES=[("en", "English")])
+    def test_respects_languages_setting(self):
+        """Test that only configured languages are yielded."""
+        assert list(accept_language_codes("ko,en;q=0.5")) == ["en"]
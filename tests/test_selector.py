@@ -0,0 +1,340 @@
+"""
+Tests for the rendered language selector cache.
+"""
+
+import pytest
+from django.template import Context, Engine, Template, TemplateSyntaxError
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from django_i18n_noprefix.selector import (
+    NEXT_PLACEHOLDER,
+    SelectorCache,
+    clear_selector_cache,
+    get_selector_cache,
+    render_selector,
+)
+from django_i18n_noprefix.templatetags.i18n_noprefix import (
+    render_static_selector,
+    switch_language_url,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_selector_cache()
+    yield
+    clear_selector_cache()
+
+
+class Renderer:
+    """Stand-in for the selector template, counting renders."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, switch_next):
+        self.calls.append(switch_next)
+        return f'<a href="/switch/?next={switch_next}">{translation.get_language()}</a>'
+
+
+class TestRenderSelector:
+    """Test the two cache tiers."""
+
+    def test_request_tier(self, rf):
+        """Test that a second selector on the same page is not re-rendered."""
+        render = Renderer()
+        request = rf.get("/")
+
+        first = render_selector(request, "list", "/next/", render)
+        second = render_selector(request, "list", "/next/", render)
+
+        assert first == second
+        assert len(render.calls) == 1
+        assert get_selector_cache().stats()["request_hits"] == 1
+
+    def test_process_tier(self, rf):
+        """Test that other requests reuse the rendering."""
+        render = Renderer()
+
+        render_selector(rf.get("/"), "list", "/next/", render)
+        render_selector(rf.get("/"), "list", "/next/", render)
+
+        assert len(render.calls) == 1
+        stats = get_selector_cache().stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_current_page_substituted(self, rf):
+        """Test that links back to the current page share one rendering."""
+        render = Renderer()
+
+        about = render_selector(rf.get("/about/"), "list", None, render)
+        contact = render_selector(rf.get("/contact/?x=1"), "list", None, render)
+
+        assert render.calls == [NEXT_PLACEHOLDER]
+        assert "next=%2Fabout%2F" in about
+        assert "next=%2Fcontact%2F" in contact
+
+    def test_keyed_by_language_and_style(self, rf):
+        """Test that each language and style is rendered separately."""
+        render = Renderer()
+        request = rf.get("/")
+
+        english = render_selector(request, "list", "/", render)
+        with translation.override("ko"):
+            korean = render_selector(request, "list", "/", render)
+        render_selector(request, "inline", "/", render)
+
+        assert len(render.calls) == 3
+        assert ">en<" in english
+        assert ">ko<" in korean
+
+    def test_query_parameter_mode(self, rf, settings):
+        """Test that one-shot links are keyed by the full page URL."""
+        settings.I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"
+        render = Renderer()
+
+        render_selector(rf.get("/about/?a=1"), "list", None, render)
+        render_selector(rf.get("/about/?a=2"), "list", None, render)
+
+        assert render.calls == ["/about/?a=1", "/about/?a=2"]
+
+    def test_without_request(self):
+        """Test that templates rendered without a request are cached too."""
+        render = Renderer()
+
+        render_selector(None, "list", None, render)
+        render_selector(None, "list", None, render)
+
+        assert render.calls == [None]
+
+    def test_cleared_on_settings_change(self, rf, settings):
+        """Test that changing LANGUAGES invalidates rendered selectors."""
+        render = Renderer()
+        render_selector(rf.get("/"), "list", "/", render)
+
+        settings.LANGUAGES = [("en", "English"), ("ko", "Korean")]
+        render_selector(rf.get("/"), "list", "/", render)
+
+        assert len(render.calls) == 2
+
+    def test_process_tier_disabled(self, rf, settings):
+        """Test that a cache size of 0 only keeps the request tier."""
+        settings.I18N_NOPREFIX_SELECTOR_CACHE_SIZE = 0
+        render = Renderer()
+
+        render_selector(rf.get("/"), "list", "/", render)
+        render_selector(rf.get("/"), "list", "/", render)
+
+        assert len(render.calls) == 2
+
+
+class TestSelectorCache:
+    """Test the process-wide LRU."""
+
+    def test_bounded(self):
+        """Test that the least recently used entries are evicted."""
+        cache = SelectorCache(max_size=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+        assert cache.stats()["size"] == 2
+
+
+class TestLanguageSelectorTag:
+    """Test that {% language_selector %} goes through the cache."""
+
+    def test_rendered_once_per_page(self, rf):
+        """Test that a page including the selector twice renders it once."""
+        template = Template(
+            "{% load i18n_noprefix %}"
+            "{% language_selector style='inline' %}"
+            "{% language_selector style='inline' %}"
+        )
+
+        html = template.render(Context({"request": rf.get("/")}))
+
+        stats = get_selector_cache().stats()
+        assert stats["misses"] == 1
+        assert stats["request_hits"] == 1
+        assert html.count("i18n-noprefix-selector--inline") == 2
+
+    def test_output_unchanged(self, rf):
+        """Test that cached output matches a fresh rendering."""
+        template = Template("{% load i18n_noprefix %}{% language_selector %}")
+
+        fresh = template.render(Context({"request": rf.get("/")}))
+        cached = template.render(Context({"request": rf.get("/")}))
+
+        assert cached == fresh
+        assert get_selector_cache().stats()["hits"] == 1
+
+
+class TestLanguageSelectorNode:
+    """Test the compiled {% language_selector %} node."""
+
+    def test_arguments(self, rf):
+        """Test positional and keyword arguments like the former simple tag."""
+        context = Context({"request": rf.get("/"), "target": "/next/"})
+
+        positional = Template(
+            "{% load i18n_noprefix %}{% language_selector 'inline' target %}"
+        ).render(context)
+        keyword = Template(
+            "{% load i18n_noprefix %}"
+            "{% language_selector next_url=target style='inline' %}"
+        ).render(context)
+
+        assert positional == keyword
+        assert "i18n-noprefix-selector--inline" in keyword
+        assert "next=%2Fnext%2F" in keyword
+
+    def test_as_variable(self, rf):
+        """Test storing the selector in a context variable."""
+        template = Template(
+            "{% load i18n_noprefix %}"
+            "{% language_selector 'list' as selector %}[{{ selector }}]"
+        )
+
+        html = template.render(Context({"request": rf.get("/")}))
+
+        assert html.startswith("[")
+        assert "i18n-noprefix-selector--list" in html
+        assert "&lt;nav" not in html
+
+    def test_invalid_argument(self):
+        """Test that unknown arguments fail at parse time."""
+        with pytest.raises(TemplateSyntaxError):
+            Template("{% load i18n_noprefix %}{% language_selector color='red' %}")
+
+    def test_cached_per_engine(self, rf, tmp_path):
+        """Test that engines overriding the template differently do not mix."""
+        engines = []
+        for name in ("first", "second"):
+            directory = tmp_path / name / "i18n_noprefix"
+            directory.mkdir(parents=True)
+            (directory / "language_selector_list.html").write_text(name)
+            engines.append(
+                Engine(
+                    dirs=[str(tmp_path / name)],
+                    libraries={
+                        "i18n_noprefix": "django_i18n_noprefix.templatetags.i18n_noprefix"
+                    },
+                )
+            )
+
+        html = [
+            engine.from_string(
+                "{% load i18n_noprefix %}{% language_selector 'list' %}"
+            ).render(Context({"request": rf.get("/")}))
+            for engine in engines
+        ]
+
+        assert html == ["first", "second"]
+
+    def test_template_compiled_once(self, rf, settings, monkeypatch):
+        """Test that the style template is loaded once, not per render."""
+        settings.I18N_NOPREFIX_SELECTOR_CACHE_SIZE = 0
+        loads = []
+        get_template = Engine.get_template
+
+        def counting_get_template(engine, name):
+            loads.append(name)
+            return get_template(engine, name)
+
+        monkeypatch.setattr(Engine, "get_template", counting_get_template)
+        template = Template("{% load i18n_noprefix %}{% language_selector 'list' %}")
+
+        for _ in range(3):
+            template.render(Context({"request": rf.get("/")}))
+
+        assert loads == ["i18n_noprefix/language_selector_list.html"]
+
+
+@pytest.mark.slow
+def test_node_rendering_benchmark(rf, settings, time_calls):
+    """Benchmark uncached selector rendering: node vs render_to_string."""
+    settings.I18N_NOPREFIX_SELECTOR_CACHE_SIZE = 0
+    template = Template("{% load i18n_noprefix %}{% language_selector 'list' %}")
+
+    def node():
+        return template.render(Context({"request": rf.get("/about/")}))
+
+    def render_to_string_tag():
+        # What the simple tag did: loader lookup and a RequestContext per call
+        request = rf.get("/about/")
+        languages = [
+            {
+                "code": code,
+                "name": name,
+                "is_current": code == translation.get_language(),
+                "switch_url": switch_language_url(
+                    {"request": request}, code, request.path
+                ),
+            }
+            for code, name in settings.LANGUAGES
+        ]
+        return render_to_string(
+            "i18n_noprefix/language_selector_list.html",
+            {"languages": languages, "style": "list"},
+            request=request,
+        )
+
+    time_calls(node=node, render_to_string=render_to_string_tag)
+
+
+class TestStaticSelector:
+    """Test the page-independent 'static' selector style."""
+
+    def render(self, request):
+        template = Template("{% load i18n_noprefix %}{% language_selector 'static' %}")
+        return template.render(Context({"request": request}))
+
+    def test_same_markup_on_every_page(self, rf):
+        """Test that the selector does not depend on the page."""
+        about = self.render(rf.get("/about/"))
+        contact = self.render(rf.get("/contact/?page=2"))
+
+        assert about == contact
+        assert "next=" not in about
+        assert 'href="/i18n/set-language/ko/"' in about
+        assert "i18n_noprefix/js/selector.js" in about
+
+    def test_per_language(self, rf):
+        """Test that each language gets its own markup."""
+        english = self.render(rf.get("/"))
+        with translation.override("ko"):
+            korean = self.render(rf.get("/"))
+
+        assert english != korean
+        assert 'href="/i18n/set-language/en/"' in korean
+
+    def test_query_parameter_mode(self, rf, settings):
+        """Test that static links use the switch view even in one-shot mode."""
+        settings.I18N_NOPREFIX_QUERY_PARAMETER = "set_lang"
+
+        html = self.render(rf.get("/about/"))
+
+        assert 'href="/i18n/set-language/ko/"' in html
+        assert "set_lang" not in html
+
+    def test_prerender(self, rf):
+        """Test that render_static_selector matches the tag's output."""
+        with translation.override("ja"):
+            expected = self.render(rf.get("/"))
+
+        assert render_static_selector("ja") == expected
+
+    def test_switch_returns_to_referrer(self, client):
+        """Test that a link without next returns to the referring page."""
+        response = client.get(
+            "/i18n/set-language/ko/", HTTP_REFERER="http://testserver/about/"
+        )
+
+        assert response.status_code == 302
+        assert response.url == "http://testserver/about/"
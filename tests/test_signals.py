@@ -0,0 +1,282 @@
+"""
+Tests for the language_changed signal and deferred receivers.
+"""
+
+import threading
+
+import pytest
+from django.contrib.sessions.backends.cache import SessionStore
+from django.http import HttpResponse
+from django.urls import path
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.signals import (
+    DeferredDispatcher,
+    LanguageChange,
+    deferred_receiver,
+    get_deferred_dispatcher,
+    language_changed,
+)
+from django_i18n_noprefix.utils import activate_language
+
+
+@pytest.fixture
+def received():
+    """Collect inline language_changed calls."""
+    calls = []
+
+    def handler(sender, **kwargs):
+        calls.append(kwargs)
+
+    language_changed.connect(handler)
+    yield calls
+    language_changed.disconnect(handler)
+
+
+@pytest.fixture
+def dispatcher():
+    """A dispatcher that is shut down after the test."""
+    dispatcher = DeferredDispatcher(max_workers=1)
+    yield dispatcher
+    dispatcher.shutdown()
+    language_changed.disconnect(dispatch_uid=f"deferred-{id(dispatcher)}")
+
+
+class TestLanguageChangedSignal:
+    """Test when activate_language sends language_changed."""
+
+    def test_sent_on_change(self, mock_request, received):
+        """Test that switching language sends the signal."""
+        request = mock_request("/")
+        request.LANGUAGE_CODE = "en"
+
+        activate_language(request, "ko")
+
+        assert len(received) == 1
+        assert received[0]["request"] is request
+        assert received[0]["language"] == "ko"
+        assert received[0]["previous"] == "en"
+
+    def test_not_sent_for_same_language(self, mock_request, received):
+        """Test that re-activating the current language sends nothing."""
+        request = mock_request("/")
+        request.LANGUAGE_CODE = "ko"
+
+        activate_language(request, "ko")
+
+        assert received == []
+
+    def test_not_sent_for_invalid_language(self, mock_request, received):
+        """Test that a rejected language sends nothing."""
+        activate_language(mock_request("/"), "invalid")
+
+        assert received == []
+
+    def test_previous_none_without_middleware(self, mock_request, received):
+        """Test that previous is None when the request had no language."""
+        activate_language(mock_request("/"), "ja")
+
+        assert received[0]["previous"] is None
+
+    def test_sent_through_middleware(self, mock_request, received):
+        """Test that the resolved language is reported as previous."""
+
+        def view(request):
+            activate_language(request, "ja")
+            return HttpResponse()
+
+        request = mock_request("/", HTTP_ACCEPT_LANGUAGE="ko")
+        NoPrefixLocaleMiddleware(view)(request)
+
+        assert received[0]["language"] == "ja"
+        assert received[0]["previous"] == "ko"
+
+
+class TestDeferredDispatcher:
+    """Test batched delivery off the request thread."""
+
+    def test_delivered_off_request_thread(self, mock_request, dispatcher):
+        """Test that receivers run in a worker thread."""
+        threads = []
+        batches = []
+
+        def receiver(changes):
+            threads.append(threading.current_thread())
+            batches.append(changes)
+
+        dispatcher.connect(receiver)
+        request = mock_request("/")
+        request.LANGUAGE_CODE = "en"
+        activate_language(request, "ko")
+
+        assert dispatcher.flush(timeout=5)
+        assert threads[0] is not threading.current_thread()
+        change = batches[0][0]
+        assert isinstance(change, LanguageChange)
+        assert change.language == "ko"
+        assert change.previous == "en"
+
+    def test_changes_batched_while_receiver_busy(self, mock_request, dispatcher):
+        """Test that changes arriving during a batch form the next batch."""
+        release = threading.Event()
+        batches = []
+
+        def receiver(changes):
+            release.wait(5)
+            batches.append([change.language for change in changes])
+
+        dispatcher.connect(receiver, batch_size=10)
+        for language in ("ko", "ja", "en", "ko"):
+            activate_language(mock_request("/"), language)
+        release.set()
+
+        assert dispatcher.flush(timeout=5)
+        delivered = [language for batch in batches for language in batch]
+        assert delivered == ["ko", "ja", "en", "ko"]
+        assert len(batches) < 4
+
+    def test_batch_size(self, mock_request, dispatcher):
+        """Test that batches never exceed batch_size."""
+        release = threading.Event()
+        sizes = []
+
+        def receiver(changes):
+            release.wait(5)
+            sizes.append(len(changes))
+
+        dispatcher.connect(receiver, batch_size=2)
+        for _ in range(5):
+            activate_language(mock_request("/"), "ko")
+        release.set()
+
+        assert dispatcher.flush(timeout=5)
+        assert sum(sizes) == 5
+        assert max(sizes) <= 2
+
+    def test_backpressure_delivers_inline(self, mock_request):
+        """Test that a receiver max_pending behind is called inline."""
+        dispatcher = DeferredDispatcher(max_workers=1, max_pending=1)
+        release = threading.Event()
+        calls = []
+
+        def receiver(changes):
+            if threading.current_thread() is not main_thread:
+                release.wait(5)
+            calls.append((threading.current_thread(), len(changes)))
+
+        main_thread = threading.current_thread()
+        dispatcher.connect(receiver)
+        try:
+            for _ in range(4):
+                activate_language(mock_request("/"), "ko")
+            inline = [call for call in calls if call[0] is main_thread]
+            assert len(inline) >= 1
+            stats = dispatcher.stats()[f"{__name__}.{receiver.__qualname__}"]
+            assert stats["inline"] == len(inline)
+            assert stats["max_pending"] == 1
+        finally:
+            release.set()
+            dispatcher.shutdown()
+            language_changed.disconnect(dispatch_uid=f"deferred-{id(dispatcher)}")
+
+    def test_stats(self, mock_request, dispatcher):
+        """Test delivery counters and queue metrics."""
+
+        def receiver(changes):
+            pass
+
+        dispatcher.connect(receiver)
+        activate_language(mock_request("/"), "ko")
+        activate_language(mock_request("/"), "ja")
+        dispatcher.flush(timeout=5)
+
+        stats = dispatcher.stats()[f"{__name__}.{receiver.__qualname__}"]
+        assert stats["delivered"] == 2
+        assert stats["pending"] == 0
+        assert stats["lag"] == 0.0
+        assert stats["failed"] == 0
+
+    def test_failing_receiver_counted(self, mock_request, dispatcher):
+        """Test that exceptions are logged and counted, not raised."""
+
+        def receiver(changes):
+            raise RuntimeError("CRM unavailable")
+
+        dispatcher.connect(receiver)
+        activate_language(mock_request("/"), "ko")
+        dispatcher.flush(timeout=5)
+
+        stats = dispatcher.stats()[f"{__name__}.{receiver.__qualname__}"]
+        assert stats["failed"] == 1
+
+    def test_disconnect(self, mock_request, dispatcher):
+        """Test that disconnected receivers get nothing more."""
+        batches = []
+        dispatcher.connect(batches.append)
+        dispatcher.disconnect(batches.append)
+
+        activate_language(mock_request("/"), "ko")
+        dispatcher.flush(timeout=5)
+
+        assert batches == []
+
+
+class TestDeferredReceiverDecorator:
+    """Test the deferred_receiver decorator."""
+
+    def test_registers_with_default_dispatcher(self, mock_request):
+        """Test that decorated functions receive batches."""
+        batches = []
+
+        @deferred_receiver(batch_size=10)
+        def receiver(changes):
+            batches.append(changes)
+
+        dispatcher = get_deferred_dispatcher()
+        try:
+            activate_language(mock_request("/"), "ja")
+            assert dispatcher.flush(timeout=5)
+            assert batches[0][0].language == "ja"
+        finally:
+            dispatcher.disconnect(receiver)
+
+
+@pytest.mark.urls(__name__)
+class TestDeferredAfterResponse:
+    """Test that changes made by a request are delivered after its response."""
+
+    def test_runs_after_response(self, client, settings):
+        """Test that receivers run once the preference has been saved."""
+        # Readable from the worker thread, unlike the test database
+        settings.SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+        seen = []
+
+        def receiver(changes):
+            session = SessionStore(session_key=changes[0].session_key)
+            seen.append((changes[0].language, session.get("django_language")))
+
+        dispatcher = get_deferred_dispatcher()
+        dispatcher.connect(receiver)
+        try:
+            client.get("/switch/ja/")
+            assert dispatcher.flush(timeout=5)
+            seen.clear()
+
+            response = client.get("/switch/ko/")
+
+            assert response.content == b"delivered during request: 1"
+            assert dispatcher.flush(timeout=5)
+            assert seen == [("ko", "ko")]
+        finally:
+            dispatcher.disconnect(receiver)
+
+
+def switch_view(request, lang_code):
+    activate_language(request, lang_code)
+    dispatcher = get_deferred_dispatcher()
+    dispatcher.flush(timeout=5)
+    delivered = sum(stats["delivered"] for stats in dispatcher.stats().values())
+    return HttpResponse(f"delivered during request: {delivered}")
+
+
+urlpatterns = [path("switch/<str:lang_code>/", switch_view)]
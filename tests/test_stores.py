@@ -0,0 +1,391 @@
+"""
+Tests for language preference stores and write elision.
+"""
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.stores import (
+    CachePreferenceStore,
+    CookiePreferenceStore,
+    SessionPreferenceStore,
+    UserPreferenceStore,
+    get_preference_stores,
+)
+from django_i18n_noprefix.views import change_language
+
+
+class WriteCountingMixin:
+    """Count backend writes made by a store."""
+
+    writes = 0
+
+    def write(self, request, response, language, explicit):
+        type(self).writes += 1
+        super().write(request, response, language, explicit)
+
+
+class CountingSessionStore(WriteCountingMixin, SessionPreferenceStore):
+    pass
+
+
+class CountingCookieStore(WriteCountingMixin, CookiePreferenceStore):
+    pass
+
+
+class CountingCacheStore(WriteCountingMixin, CachePreferenceStore):
+    pass
+
+
+class FakeUser:
+    """Authenticated user with a language field that counts saves."""
+
+    is_authenticated = True
+    pk = 42
+
+    def __init__(self, language=None):
+        self.language = language
+        self.saves = []
+
+    def save(self, update_fields=None):
+        self.saves.append(update_fields)
+
+
+@pytest.fixture
+def counting_stores(settings):
+    """Use write-counting session and cookie stores."""
+    settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+        "tests.test_stores.CountingSessionStore",
+        "tests.test_stores.CountingCookieStore",
+    ]
+    CountingSessionStore.writes = 0
+    CountingCookieStore.writes = 0
+    yield
+    CountingSessionStore.writes = 0
+    CountingCookieStore.writes = 0
+
+
+def switch_to(language):
+    """A view that explicitly switches to ``language``."""
+
+    def view(request):
+        request.LANGUAGE_CODE = language
+        request._language_was_set = True
+        return HttpResponse()
+
+    return view
+
+
+@pytest.mark.usefixtures("counting_stores")
+class TestWriteElision:
+    """Test that only real changes reach the backends."""
+
+    def test_first_visit_writes_each_store_once(self, mock_request):
+        """Test a first visit persists the detected language once per store."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+
+        middleware(mock_request("/"))
+
+        assert CountingSessionStore.writes == 1
+        assert CountingCookieStore.writes == 1
+
+    def test_unchanged_session_not_rewritten(self, mock_request):
+        """Test that a session already holding the language is left alone."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+        request.session["django_language"] = "ko"
+
+        response = middleware(request)
+
+        assert CountingSessionStore.writes == 0
+        assert CountingCookieStore.writes == 1
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+    def test_switch_to_current_language_writes_nothing(self, mock_request):
+        """Test that re-selecting the stored language costs no writes."""
+        middleware = NoPrefixLocaleMiddleware(switch_to("ja"))
+        request = mock_request("/")
+        request.session["django_language"] = "ja"
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        response = middleware(request)
+
+        assert CountingSessionStore.writes == 0
+        assert CountingCookieStore.writes == 0
+        assert not response.cookies
+
+    def test_switch_writes_changed_stores_once(self, mock_request):
+        """Test that a real switch writes each store exactly once."""
+        middleware = NoPrefixLocaleMiddleware(switch_to("ko"))
+        request = mock_request("/")
+        request.session["django_language"] = "ja"
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        middleware(request)
+
+        assert CountingSessionStore.writes == 1
+        assert CountingCookieStore.writes == 1
+        assert request.session["django_language"] == "ko"
+
+    def test_switch_with_partial_state(self, mock_request):
+        """Test that only the store holding a stale value is written."""
+        middleware = NoPrefixLocaleMiddleware(switch_to("ko"))
+        request = mock_request("/")
+        request.session["django_language"] = "ko"
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        middleware(request)
+
+        assert CountingSessionStore.writes == 0
+        assert CountingCookieStore.writes == 1
+
+    def test_returning_visitor_writes_nothing(self, mock_request):
+        """Test that the steady-state path does not touch the stores."""
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+        request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = "ja"
+
+        middleware(request)
+
+        assert CountingSessionStore.writes == 0
+        assert CountingCookieStore.writes == 0
+
+    def test_change_language_view_writes_cookie_once(self, client):
+        """Test that the view leaves persistence to the middleware."""
+        url = reverse("django_i18n_noprefix:change_language", args=["ko"])
+
+        response = client.get(url)
+
+        assert CountingCookieStore.writes == 1
+        assert CountingSessionStore.writes == 1
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+
+class TestSessionPreferenceStore:
+    """Test the session store against a real session backend."""
+
+    def test_unchanged_session_not_modified(self, mock_request):
+        """Test that an unchanged language does not mark the session dirty."""
+        session = SessionStore()
+        session["django_language"] = "ko"
+        session.save()
+
+        request = mock_request("/")
+        request.session = SessionStore(session_key=session.session_key)
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+
+        middleware(request)
+
+        assert request.LANGUAGE_CODE == "ko"
+        assert request.session.modified is False
+
+    def test_detected_language_does_not_create_session(self, mock_request):
+        """Test that a detected language never creates a session."""
+        request = mock_request("/")
+        request.session = SessionStore()
+        store = SessionPreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=False)
+
+        assert store.read(request) is None
+        assert request.session.modified is False
+
+    def test_explicit_language_creates_session(self, mock_request):
+        """Test that an explicit choice is stored even in a new session."""
+        request = mock_request("/")
+        request.session = SessionStore()
+        store = SessionPreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=True)
+
+        assert store.read(request) == "ko"
+        assert request.session.modified is True
+
+    def test_no_session(self, rf):
+        """Test that requests without sessions are ignored."""
+        request = rf.get("/")
+        store = SessionPreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=True)
+
+        assert store.read(request) is None
+
+
+class TestCachePreferenceStore:
+    """Test the Django cache store."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_keyed_by_session(self, mock_request):
+        """Test storing a language for an anonymous session."""
+        request = mock_request("/")
+        request.session = SessionStore()
+        request.session.save()
+        store = CachePreferenceStore()
+
+        store.write(request, HttpResponse(), "ja", explicit=True)
+
+        key = f"i18n_noprefix:language:session:{request.session.session_key}"
+        assert cache.get(key) == "ja"
+        assert store.read(request) == "ja"
+
+    def test_keyed_by_user(self, mock_request):
+        """Test that authenticated users are keyed by primary key."""
+        request = mock_request("/")
+        request.user = FakeUser()
+        store = CachePreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=True)
+
+        assert cache.get("i18n_noprefix:language:user:42") == "ko"
+
+    def test_no_identity(self, rf):
+        """Test that visitors without user or session are skipped."""
+        request = rf.get("/")
+        store = CachePreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=True)
+
+        assert store.read(request) is None
+
+    def test_read_once_per_request(self, mock_request, monkeypatch):
+        """Test that the read value is remembered for the request."""
+        request = mock_request("/")
+        request.user = FakeUser()
+        cache.set("i18n_noprefix:language:user:42", "ja")
+        store = CachePreferenceStore()
+        reads = []
+        original_get = store.cache.get
+        monkeypatch.setattr(
+            store.cache, "get", lambda key: reads.append(key) or original_get(key)
+        )
+
+        assert store.read(request) == "ja"
+        assert store.read(request) == "ja"
+        assert len(reads) == 1
+
+    def test_middleware_uses_cache_store(self, settings, mock_request):
+        """Test detection and elided writes through the middleware."""
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+            "tests.test_stores.CountingCacheStore"
+        ]
+        CountingCacheStore.writes = 0
+        cache.set("i18n_noprefix:language:user:42", "ja")
+        middleware = NoPrefixLocaleMiddleware(lambda request: HttpResponse())
+        request = mock_request("/")
+        request.user = FakeUser()
+
+        middleware(request)
+
+        assert request.language_resolution.source == "cache"
+        assert request.LANGUAGE_CODE == "ja"
+        assert CountingCacheStore.writes == 0
+
+
+class TestUserPreferenceStore:
+    """Test the user model store."""
+
+    def test_read(self, mock_request):
+        """Test reading the language field."""
+        request = mock_request("/")
+        request.user = FakeUser(language="ja")
+
+        assert UserPreferenceStore().read(request) == "ja"
+
+    def test_explicit_write_saves_field_only(self, mock_request):
+        """Test that explicit choices save just the language field."""
+        request = mock_request("/")
+        request.user = FakeUser(language="ja")
+
+        UserPreferenceStore().write(request, HttpResponse(), "ko", explicit=True)
+
+        assert request.user.language == "ko"
+        assert request.user.saves == [["language"]]
+
+    def test_detected_language_not_saved(self, mock_request):
+        """Test that detected languages do not touch the profile."""
+        request = mock_request("/")
+        request.user = FakeUser()
+
+        UserPreferenceStore().write(request, HttpResponse(), "ko", explicit=False)
+
+        assert request.user.saves == []
+
+    def test_anonymous_user(self, mock_request):
+        """Test that anonymous users are ignored."""
+        from django.contrib.auth.models import AnonymousUser
+
+        request = mock_request("/")
+        request.user = AnonymousUser()
+        store = UserPreferenceStore()
+
+        store.write(request, HttpResponse(), "ko", explicit=True)
+
+        assert store.read(request) is None
+
+    def test_custom_field(self, settings, mock_request):
+        """Test I18N_NOPREFIX_USER_LANGUAGE_FIELD."""
+        settings.I18N_NOPREFIX_USER_LANGUAGE_FIELD = "locale"
+        request = mock_request("/")
+        request.user = FakeUser()
+        request.user.locale = "ja"
+
+        assert UserPreferenceStore().read(request) == "ja"
+
+    def test_switch_through_middleware(self, settings, mock_request):
+        """Test that a switch saves the user once and the cookie once."""
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+            "django_i18n_noprefix.stores.UserPreferenceStore",
+            "django_i18n_noprefix.stores.CookiePreferenceStore",
+        ]
+        middleware = NoPrefixLocaleMiddleware(switch_to("ko"))
+        request = mock_request("/")
+        request.user = FakeUser(language="ja")
+
+        response = middleware(request)
+
+        assert request.language_resolution.source == "user"
+        assert request.user.saves == [["language"]]
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+
+
+class TestGetPreferenceStores:
+    """Test store configuration."""
+
+    def test_default_stores(self):
+        """Test that session and cookie are the defaults, in that order."""
+        stores = get_preference_stores()
+        assert [type(store) for store in stores] == [
+            SessionPreferenceStore,
+            CookiePreferenceStore,
+        ]
+
+    def test_configured_stores(self, settings):
+        """Test loading stores from dotted paths."""
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+            "django_i18n_noprefix.stores.CachePreferenceStore"
+        ]
+        stores = get_preference_stores()
+        assert [type(store) for store in stores] == [CachePreferenceStore]
+
+
+class TestWithoutMiddleware:
+    """Test persistence when NoPrefixLocaleMiddleware is not installed."""
+
+    def test_view_sets_cookie_and_session(self, mock_request):
+        """Test that change_language persists by itself without middleware."""
+        request = mock_request("/")
+
+        response = change_language(request, "ja")
+
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ja"
+        assert request.session["django_language"] == "ja"
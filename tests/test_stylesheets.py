@@ -0,0 +1,167 @@
+"""
+Tests for the minified, precompressed selector stylesheets.
+"""
+
+import gzip
+import json
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.template import Context, Template
+
+from django_i18n_noprefix.stylesheets import (
+    SOURCE_DIR,
+    build_stylesheets,
+    get_stylesheet_manifest,
+    minify_css,
+    stylesheet_url,
+)
+
+
+@pytest.fixture
+def stylesheet_root(settings, tmp_path):
+    """Configure a stylesheet directory and build into it."""
+    settings.I18N_NOPREFIX_STYLESHEET_ROOT = str(tmp_path)
+    build_stylesheets(str(tmp_path))
+    yield tmp_path
+    get_stylesheet_manifest.cache_clear()
+    stylesheet_url.cache_clear()
+
+
+class TestMinifyCss:
+    """Test the CSS minifier."""
+
+    def test_minify(self):
+        """Test that comments and whitespace are removed."""
+        css = """
+        /* Theme */
+        .a > .b ,  .c :focus {
+            color : red;
+            margin: calc(1px + 2px);
+        }
+        """
+
+        assert minify_css(css) == ".a>.b,.c :focus{color :red;margin:calc(1px + 2px)}"
+
+    def test_strings_untouched(self):
+        """Test that string literals keep their whitespace."""
+        css = '.a::after { content: "a ,  b { }"; }'
+
+        assert minify_css(css) == '.a::after{content:"a ,  b { }"}'
+
+    def test_shipped_stylesheets(self):
+        """Test that the shipped stylesheets keep their rules."""
+        with open(f"{SOURCE_DIR}/vanilla.css", encoding="utf-8") as fh:
+            source = fh.read()
+
+        minified = minify_css(source)
+
+        rules = re.sub(r"/\*.*?\*/", "", source, flags=re.DOTALL).count("{")
+        assert minified.count("{") == minified.count("}") == rules
+        assert len(minified) < len(source) * 0.8
+
+
+class TestBuildStylesheets:
+    """Test writing the stylesheet files."""
+
+    def test_files(self, stylesheet_root):
+        """Test the hashed stylesheet, its gzip sibling and the manifest."""
+        directory = stylesheet_root / "i18n_noprefix" / "css" / "dist"
+        manifest = json.loads((directory / "stylesheets.json").read_text())
+
+        assert set(manifest) == {"vanilla", "tailwind", "bootstrap5"}
+        built = stylesheet_root / manifest["vanilla"]
+        assert built.name.startswith("vanilla.") and built.name.endswith(".min.css")
+        assert gzip.decompress((directory / f"{built.name}.gz").read_bytes()) == (
+            built.read_bytes()
+        )
+
+    def test_reproducible(self, tmp_path):
+        """Test that rebuilding unchanged sources gives the same files."""
+        first = build_stylesheets(str(tmp_path / "a"), ["tailwind"])
+        second = build_stylesheets(str(tmp_path / "b"), ["tailwind"])
+
+        assert first == second
+        path = first["tailwind"] + ".gz"
+        assert (tmp_path / "a" / path).read_bytes() == (
+            tmp_path / "b" / path
+        ).read_bytes()
+
+    def test_partial_build_keeps_manifest(self, stylesheet_root):
+        """Test that building one style keeps the others in the manifest."""
+        build_stylesheets(str(stylesheet_root), ["vanilla"])
+
+        assert set(get_stylesheet_manifest()) == {"vanilla", "tailwind", "bootstrap5"}
+
+    def test_brotli(self, tmp_path):
+        """Test the brotli sibling when brotli is installed."""
+        brotli = pytest.importorskip("brotli")
+
+        path = tmp_path / build_stylesheets(str(tmp_path), ["vanilla"])["vanilla"]
+
+        assert brotli.decompress((tmp_path / f"{path}.br").read_bytes()) == (
+            path.read_bytes()
+        )
+
+    def test_unknown_style(self, tmp_path):
+        """Test that unknown styles are rejected."""
+        with pytest.raises(ValueError, match="foundation"):
+            build_stylesheets(str(tmp_path), ["foundation"])
+
+
+class TestSelectorStylesheetTag:
+    """Test the selector_stylesheet template tag."""
+
+    def render(self, source):
+        return Template("{% load i18n_noprefix %}" + source).render(Context({}))
+
+    def test_built(self, stylesheet_root):
+        """Test that the built stylesheet is linked."""
+        html = self.render("{% selector_stylesheet 'bootstrap5' %}")
+
+        path = get_stylesheet_manifest()["bootstrap5"]
+        assert html == f'<link rel="stylesheet" href="/static/{path}">'
+
+    def test_not_built(self):
+        """Test that the readable source is linked before a build."""
+        assert self.render("{% selector_stylesheet %}") == (
+            '<link rel="stylesheet" href="/static/i18n_noprefix/css/vanilla.css">'
+        )
+
+
+class TestBuildSelectorStylesheetsCommand:
+    """Test the build_selector_stylesheets management command."""
+
+    def test_builds_all(self, settings, tmp_path):
+        """Test that every stylesheet is built and reported."""
+        settings.I18N_NOPREFIX_STYLESHEET_ROOT = str(tmp_path)
+        out = StringIO()
+
+        call_command("build_selector_stylesheets", stdout=out)
+
+        assert "vanilla: i18n_noprefix/css/dist/vanilla." in out.getvalue()
+        assert "gz " in out.getvalue()
+        assert "Wrote 3 stylesheets" in out.getvalue()
+
+    def test_style(self, tmp_path):
+        """Test building a single style into --output-dir."""
+        out = StringIO()
+
+        call_command(
+            "build_selector_stylesheets",
+            "--output-dir",
+            str(tmp_path),
+            "--style",
+            "tailwind",
+            stdout=out,
+        )
+
+        assert "Wrote 1 stylesheets" in out.getvalue()
+
+    def test_requires_root(self):
+        """Test the error without a configured or given directory."""
+        with pytest.raises(CommandError, match="--output-dir"):
+            call_command("build_selector_stylesheets", stdout=StringIO())
@@ -0,0 +1,110 @@
+"""
+Tests for the precomputed switch URL table.
+"""
+
+import pytest
+from django.template import Context, Template
+from django.urls import include, path, reverse, set_script_prefix, set_urlconf
+
+from django_i18n_noprefix import utils
+from django_i18n_noprefix.selector import clear_selector_cache
+from django_i18n_noprefix.templatetags.i18n_noprefix import (
+    join_switch_url,
+    switch_language_url,
+)
+from django_i18n_noprefix.utils import get_switch_url_table
+
+urlpatterns = [path("lang/", include("django_i18n_noprefix.urls"))]
+
+
+class TestSwitchUrlTable:
+    """Test get_switch_url_table()."""
+
+    def test_matches_reverse(self, settings):
+        """Test that the table holds the reversed URL of every language."""
+        table = get_switch_url_table()
+
+        assert set(table) == {code for code, name in settings.LANGUAGES}
+        assert table["ko"] == reverse(
+            "django_i18n_noprefix:change_language", args=["ko"]
+        )
+
+    def test_built_once(self, monkeypatch):
+        """Test that links are joined without reversing again."""
+        get_switch_url_table()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("reverse() called")
+
+        monkeypatch.setattr(utils, "reverse", fail)
+
+        assert switch_language_url({}, "ja", "/about/") == (
+            "/i18n/set-language/ja/?next=%2Fabout%2F"
+        )
+
+    def test_keyed_by_script_prefix(self):
+        """Test that each script prefix gets its own table."""
+        default = get_switch_url_table()
+        set_script_prefix("/app/")
+        try:
+            prefixed = get_switch_url_table()
+        finally:
+            set_script_prefix("/")
+
+        assert default["ko"] == "/i18n/set-language/ko/"
+        assert prefixed["ko"] == "/app/i18n/set-language/ko/"
+
+    def test_keyed_by_urlconf(self):
+        """Test that a per-request URLconf gets its own table."""
+        set_urlconf(__name__)
+        try:
+            table = get_switch_url_table()
+        finally:
+            set_urlconf(None)
+
+        assert table["ko"] == "/lang/set-language/ko/"
+        assert get_switch_url_table()["ko"] == "/i18n/set-language/ko/"
+
+    def test_cleared_on_languages_change(self, settings):
+        """Test that the table follows LANGUAGES."""
+        get_switch_url_table()
+
+        settings.LANGUAGES = [("en", "English"), ("fr", "French")]
+
+        assert set(get_switch_url_table()) == {"en", "fr"}
+
+
+class TestLanguageSelectorLinks:
+    """Test the links rendered by {% language_selector %}."""
+
+    def test_links_to_switch_view(self, rf):
+        """Test that each language links to its switch URL and the page."""
+        clear_selector_cache()
+        template = Template("{% load i18n_noprefix %}{% language_selector 'list' %}")
+
+        html = template.render(Context({"request": rf.get("/about/")}))
+
+        assert 'href="/i18n/set-language/ko/?next=%2Fabout%2F"' in html
+        assert 'href="/i18n/set-language/ja/?next=%2Fabout%2F"' in html
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("count", [5, 50, 500])
+def test_switch_url_benchmark(settings, time_calls, count):
+    """Benchmark switch links per render for many languages."""
+    settings.LANGUAGES = [(f"l{i}", f"Language {i}") for i in range(count)]
+    codes = [code for code, name in settings.LANGUAGES]
+
+    def reversed_links():
+        return [
+            reverse("django_i18n_noprefix:change_language", args=[code]) + "?next=%2F"
+            for code in codes
+        ]
+
+    def table_links():
+        table = get_switch_url_table()
+        return [join_switch_url(code, "/", None, table, None) for code in codes]
+
+    assert table_links() == reversed_links()
+
+    time_calls(reverse=reversed_links, table=table_links, iterations=20)
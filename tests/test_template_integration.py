@@ -102,10 +102,12 @@ class TemplateIntegrationTest(TestCase):
         self.assertIn("selected", rendered)
         self.assertIn('data-current-language="en"', rendered)
 
-        # Check no language prefixes in URLs
-        self.assertNotIn("/en/", rendered)
-        self.assertNotIn("/ko/", rendered)
-        self.assertNotIn("/ja/", rendered)
+        # Check no language prefixes in URLs (the switch links carry the
+        # code in the switch view's own path)
+        self.assertIn('data-url="/i18n/set-language/ko/?next=%2F"', rendered)
+        self.assertNotIn('="/en/', rendered)
+        self.assertNotIn('="/ko/', rendered)
+        self.assertNotIn('="/ja/', rendered)
 
     def test_language_selector_styles(self):
         """Test different language selector styles."""
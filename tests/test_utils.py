@@ -3,8 +3,15 @@ Tests for utility functions.
 """
 
 from django.utils import translation
+from django.utils.translation import gettext_lazy
 
-from django_i18n_noprefix.utils import activate_language, is_valid_language
+from django_i18n_noprefix.utils import (
+    LanguageMetadata,
+    activate_language,
+    get_language_metadata,
+    get_language_names,
+    is_valid_language,
+)
 
 
 class TestActivateLanguage:
@@ -58,3 +65,55 @@ class TestIsValidLanguage:
         assert is_valid_language("KO") is False  # Should be lowercase
         assert is_valid_language("EN") is False
         assert is_valid_language("Ko") is False
+
+
+class TestLanguageMetadata:
+    """Test the precomputed language metadata tables."""
+
+    def test_metadata(self):
+        """Test the configured, native and bidi data of each language."""
+        metadata = get_language_metadata()
+
+        assert list(metadata) == ["ko", "en", "ja"]
+        assert metadata["ko"] == LanguageMetadata("ko", "Korean", "한국어", False)
+        assert metadata["ja"].name_local == "日本語"
+
+    def test_unknown_language(self, settings):
+        """Test languages Django has no info about."""
+        settings.LANGUAGES = [("en", "English"), ("ar-xx", "Arabic (Test)")]
+
+        metadata = get_language_metadata()["ar-xx"]
+
+        assert metadata.name_local == "العربيّة"
+        assert metadata.bidi is True
+
+        settings.LANGUAGES = [("tlh", "Klingon")]
+
+        assert get_language_metadata()["tlh"] == LanguageMetadata(
+            "tlh", "Klingon", "Klingon", False
+        )
+
+    def test_built_once(self):
+        """Test that the tables are memoized."""
+        assert get_language_metadata() is get_language_metadata()
+        assert get_language_names("ko") is get_language_names("ko")
+
+    def test_translated_names(self, settings):
+        """Test that lazy names are evaluated once per language."""
+        settings.LANGUAGES = [("en", gettext_lazy("English")), ("ko", "Korean")]
+
+        english = get_language_names("en")
+        korean = get_language_names("ko")
+
+        assert english == {"en": "English", "ko": "Korean"}
+        assert korean["en"] == "영어"
+        assert get_language_metadata()["en"].name == "English"
+
+    def test_rebuilt_on_settings_change(self, settings):
+        """Test that overriding LANGUAGES rebuilds the tables."""
+        get_language_names("en")
+
+        settings.LANGUAGES = [("en", "English"), ("fr", "French")]
+
+        assert list(get_language_metadata()) == ["en", "fr"]
+        assert list(get_language_names("en")) == ["en", "fr"]
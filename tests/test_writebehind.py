@@ -0,0 +1,266 @@
+"""
+Tests for write-behind persistence of language preferences.
+"""
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client
+
+from django_i18n_noprefix import writebehind
+from django_i18n_noprefix.middleware import NoPrefixLocaleMiddleware
+from django_i18n_noprefix.stores import UserPreferenceStore
+from django_i18n_noprefix.writebehind import (
+    WriteBehindQueue,
+    flush_write_behind,
+    get_write_behind_queue,
+)
+
+CACHE_KEY = "i18n_noprefix:language:session:writebehind"
+
+
+def switch_to(language):
+    """A view that explicitly switches to ``language``."""
+
+    def view(request):
+        request.LANGUAGE_CODE = language
+        request._language_was_set = True
+        return HttpResponse()
+
+    return view
+
+
+class TestWriteBehindQueue:
+    """Test the queue itself, without a worker thread."""
+
+    def test_submit_defers_job(self):
+        """Test that submitted jobs run on flush, not on submit."""
+        queue = WriteBehindQueue(autostart=False)
+        written = []
+
+        queue.submit("session:a", "ko", lambda: written.append("ko"))
+
+        assert written == []
+        assert queue.pending("session:a") == "ko"
+        queue.flush()
+        assert written == ["ko"]
+        assert queue.pending("session:a") is None
+
+    def test_coalesces_same_key(self):
+        """Test that only the latest write for a key is performed."""
+        queue = WriteBehindQueue(autostart=False)
+        written = []
+
+        queue.submit("session:a", "ko", lambda: written.append("ko"))
+        queue.submit("session:a", "ja", lambda: written.append("ja"))
+        queue.flush()
+
+        assert written == ["ja"]
+        assert queue.stats()["coalesced"] == 1
+
+    def test_full_queue_writes_inline(self):
+        """Test that writes beyond max_size are performed immediately."""
+        queue = WriteBehindQueue(max_size=1, autostart=False)
+        written = []
+
+        queue.submit("session:a", "ko", lambda: written.append("a"))
+        queue.submit("session:b", "ko", lambda: written.append("b"))
+
+        assert written == ["b"]
+        stats = queue.stats()
+        assert stats["inline"] == 1
+        assert stats["depth"] == 1
+
+    def test_stats(self):
+        """Test depth and counters."""
+        queue = WriteBehindQueue(autostart=False)
+        queue.submit("session:a", "ko", lambda: None)
+        queue.submit("session:b", "ja", lambda: None)
+
+        assert queue.stats()["depth"] == 2
+        assert queue.stats()["max_depth"] == 2
+
+        queue.flush()
+        stats = queue.stats()
+        assert stats["depth"] == 0
+        assert stats["submitted"] == 2
+        assert stats["written"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_failed_job_counted(self):
+        """Test that a failing job is logged and counted, not raised."""
+        queue = WriteBehindQueue(autostart=False)
+
+        def fail():
+            raise RuntimeError("database unavailable")
+
+        queue.submit("session:a", "ko", fail)
+        queue.flush()
+
+        assert queue.stats()["failed"] == 1
+
+    def test_worker_thread_drains_queue(self):
+        """Test that the worker performs writes and close() waits for them."""
+        queue = WriteBehindQueue()
+        written = []
+
+        for index in range(10):
+            queue.submit(f"session:{index}", "ko", lambda i=index: written.append(i))
+        queue.close()
+
+        assert sorted(written) == list(range(10))
+        assert queue.stats()["depth"] == 0
+
+    def test_closed_queue_writes_inline(self):
+        """Test that writes after close() are not lost."""
+        queue = WriteBehindQueue(autostart=False)
+        queue.close()
+        written = []
+
+        queue.submit("session:a", "ko", lambda: written.append("ko"))
+
+        assert written == ["ko"]
+
+
+class TestGetWriteBehindQueue:
+    """Test the process-wide queue."""
+
+    def test_disabled_by_default(self):
+        """Test that write-behind is off unless configured."""
+        assert get_write_behind_queue() is None
+
+    def test_enabled(self, settings):
+        """Test that the queue is shared and sized from settings."""
+        settings.I18N_NOPREFIX_WRITE_BEHIND = True
+        settings.I18N_NOPREFIX_WRITE_BEHIND_MAX_SIZE = 5
+
+        queue = get_write_behind_queue()
+
+        assert queue is get_write_behind_queue()
+        assert queue.max_size == 5
+
+
+class TestMiddlewareWriteBehind:
+    """Test the middleware with write-behind enabled."""
+
+    @pytest.fixture(autouse=True)
+    def write_behind(self, settings):
+        settings.I18N_NOPREFIX_WRITE_BEHIND = True
+        queue = get_write_behind_queue()
+        # Keep writes in the test thread so they see the test database
+        queue.autostart = False
+        yield queue
+        queue.flush()
+
+    @pytest.fixture
+    def stored_session(self):
+        session = SessionStore()
+        session["django_language"] = "ja"
+        session.save()
+        return session
+
+    def test_session_written_inline(self, mock_request, stored_session):
+        """Test that the session is updated on the request, not queued."""
+        middleware = NoPrefixLocaleMiddleware(switch_to("ko"))
+        request = mock_request("/")
+        request.session = SessionStore(session_key=stored_session.session_key)
+
+        response = middleware(request)
+
+        assert response.cookies[settings.LANGUAGE_COOKIE_NAME].value == "ko"
+        assert request.session["django_language"] == "ko"
+        assert request.session.modified is True
+        assert get_write_behind_queue().stats()["submitted"] == 0
+
+    def test_next_request_in_another_process(self, client, monkeypatch):
+        """Test that a process without the pending writes sees the switch."""
+        client.get("/i18n/set-language/ja/")
+        client.get("/i18n/set-language/ko/")
+
+        # Another worker process has its own, empty queue
+        monkeypatch.setattr(writebehind, "_queue", WriteBehindQueue(autostart=False))
+        other = Client()
+        other.cookies = client.cookies
+
+        assert other.get("/api/data/").json()["language"] == "ko"
+
+    def test_signed_cookie_sessions(self, client, settings):
+        """Test that switching with cookie-based sessions is not undone."""
+        settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+        client.get("/i18n/set-language/ja/")
+
+        client.get("/i18n/set-language/ko/")
+        flush_write_behind()
+
+        assert client.session["django_language"] == "ko"
+        assert client.get("/api/data/").json()["language"] == "ko"
+
+    def test_pending_write_is_read_back(self, mock_request, cache_store):
+        """Test that the next request sees the queued language."""
+        NoPrefixLocaleMiddleware(switch_to("ko"))(self.request_for(mock_request))
+
+        request = self.request_for(mock_request)
+        NoPrefixLocaleMiddleware(lambda request: HttpResponse())(request)
+
+        assert request.LANGUAGE_CODE == "ko"
+        assert request.language_resolution.source == "cache"
+        assert cache.get(CACHE_KEY) == "ja"
+
+    def test_repeated_switches_coalesce(self, mock_request, cache_store, write_behind):
+        """Test that several switches produce a single cache write."""
+        for language in ("ko", "en", "ko"):
+            NoPrefixLocaleMiddleware(switch_to(language))(
+                self.request_for(mock_request)
+            )
+
+        assert write_behind.stats()["depth"] == 1
+        write_behind.flush()
+        assert write_behind.stats()["written"] == 1
+        assert cache.get(CACHE_KEY) == "ko"
+
+    def test_user_write_deferred(self, mock_request, django_user_model, settings):
+        """Test that the profile update is queued and request.user updated."""
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+            "django_i18n_noprefix.stores.UserPreferenceStore",
+            "django_i18n_noprefix.stores.CookiePreferenceStore",
+        ]
+        settings.I18N_NOPREFIX_USER_LANGUAGE_FIELD = "first_name"
+        user = django_user_model.objects.create(username="writer", first_name="ja")
+        middleware = NoPrefixLocaleMiddleware(switch_to("ko"))
+        request = mock_request("/")
+        request.user = user
+
+        middleware(request)
+
+        assert request.user.first_name == "ko"
+        assert django_user_model.objects.get(pk=user.pk).first_name == "ja"
+        flush_write_behind()
+        assert django_user_model.objects.get(pk=user.pk).first_name == "ko"
+
+    def test_detected_language_not_queued_for_user(self, mock_request):
+        """Test that the user store only queues explicit choices."""
+        request = mock_request("/")
+        request.user = type("User", (), {"is_authenticated": True, "pk": 1})()
+
+        store = UserPreferenceStore()
+
+        assert store.deferred_key(request) == "user:1"
+        assert store.deferred_write(request, "ko", explicit=False) is None
+
+    @pytest.fixture
+    def cache_store(self, settings):
+        settings.I18N_NOPREFIX_PREFERENCE_STORES = [
+            "django_i18n_noprefix.stores.CachePreferenceStore",
+            "django_i18n_noprefix.stores.CookiePreferenceStore",
+        ]
+        cache.set(CACHE_KEY, "ja")
+        yield
+        cache.delete(CACHE_KEY)
+
+    @staticmethod
+    def request_for(mock_request):
+        request = mock_request("/")
+        request.session = SessionStore(session_key="writebehind")
+        return request